@@ -0,0 +1 @@
+"""Benchmarks of the sanitizers, using realistic generated payloads."""
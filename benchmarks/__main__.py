@@ -0,0 +1,100 @@
+"""Command line interface for running the benchmarks."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from .runner import Result, load, measure, regressions, save
+from .scenarios import SCENARIOS
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Creates the parser of the command line arguments.
+
+    Returns:
+        The argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Measure the performance of the sanitizers."
+    )
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        action="append",
+        default=[],
+        help="run only the scenarios containing this text in their name; can be repeated",
+    )
+    parser.add_argument("-l", "--list", action="store_true", help="list the scenarios and exit")
+    parser.add_argument(
+        "-n",
+        "--count",
+        type=int,
+        default=1000,
+        help="payloads per round (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-r", "--rounds", type=int, default=5, help="number of rounds (default: %(default)s)"
+    )
+    parser.add_argument("--save", type=Path, help="save the results to a JSON file")
+    parser.add_argument("--compare", type=Path, help="compare with results saved earlier")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative loss of throughput failing the comparison (default: %(default)s)",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Runs the benchmarks.
+
+    Args:
+        argv: Command line arguments; `sys.argv` is used if omitted.
+
+    Returns:
+        The exit code; `1` if any scenario regressed compared to the baseline.
+    """
+    arguments = build_parser().parse_args(argv)
+    scenarios = [
+        scenario
+        for scenario in SCENARIOS
+        if not arguments.scenario or any(text in scenario.name for text in arguments.scenario)
+    ]
+    if arguments.list:
+        for scenario in scenarios:
+            print(f"{scenario.name:20} {scenario.description}")
+        return 0
+    baseline = load(arguments.compare) if arguments.compare is not None else {}
+    print(
+        f"{'scenario':20} {'items/s':>12} {'p50 µs':>10} {'p90 µs':>10} {'p99 µs':>10}"
+        f" {'alloc KiB':>10} {'change':>8}"
+    )
+    results: dict[str, Result] = {}
+    for scenario in scenarios:
+        result = results[scenario.name] = measure(scenario, arguments.count, arguments.rounds)
+        change = (
+            f"{result.throughput / baseline[scenario.name].throughput - 1:+8.1%}"
+            if scenario.name in baseline
+            else ""
+        )
+        print(
+            f"{scenario.name:20} {result.throughput:12,.0f} {result.p50:10.1f}"
+            f" {result.p90:10.1f} {result.p99:10.1f} {result.allocated / 1024:10.1f} {change}",
+            flush=True,
+        )
+    if arguments.save is not None:
+        save(results, arguments.save)
+    regressed = regressions(results, baseline, arguments.threshold)
+    for name, change in regressed.items():
+        print(f"regression: {name} throughput changed by {change:.1%}", file=sys.stderr)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+"""Generators of realistic, reproducible payloads for the benchmarks."""
+
+from __future__ import annotations
+
+import json
+from random import Random
+from typing import Any
+
+WORDS = (
+    "request user account session order payment invoice started finished failed retry "
+    "timeout cache database query response service upstream client server token value"
+).split()
+MESSAGES = (
+    "request started",
+    "request finished",
+    "user logged in",
+    "payment processed",
+    "cache miss",
+    "upstream timeout",
+)
+LEVELS = ("debug", "info", "info", "info", "warning", "error")
+SENSITIVE_KEYS = frozenset({"password", "email", "token", "authorization", "card_number"})
+# probability of a word in free text being an email address
+EMAIL_RATE = 0.001
+# JSON Schema of the events created by `structlog_event`
+STRUCTLOG_EVENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "event": {"type": "string"},
+        "level": {"type": "string"},
+        "timestamp": {"type": "string"},
+        "logger": {"type": "string"},
+        "request_id": {"type": "string"},
+        "method": {"type": "string"},
+        "path": {"type": "string"},
+        "status": {"type": "integer"},
+        "duration_ms": {"type": "number"},
+        "user": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "email": {"type": "string"},
+                "roles": {"type": "array", "items": {"type": "string"}},
+            },
+        },
+        "token": {"type": "string"},
+        "cached": {"type": "boolean"},
+        "error": {"type": ["string", "null"]},
+    },
+}
+
+
+def structlog_event(rng: Random, index: int) -> dict[str, Any]:
+    """
+    Creates a typical log event, as passed to the Structlog processors.
+
+    Args:
+        rng: Source of randomness.
+        index: Sequential number of the event, making its values unique.
+
+    Returns:
+        The log event.
+    """
+    return {
+        "event": rng.choice(MESSAGES),
+        "level": rng.choice(LEVELS),
+        "timestamp": f"2024-05-01T12:{index // 60 % 60:02d}:{index % 60:02d}.{index:06d}Z",
+        "logger": "app.http",
+        "request_id": f"{rng.getrandbits(128):032x}",
+        "method": rng.choice(("GET", "POST", "PUT")),
+        "path": f"/api/v1/users/{index}/orders",
+        "status": rng.choice((200, 201, 204, 400, 404, 500)),
+        "duration_ms": round(rng.random() * 250, 3),
+        "user": {"id": index, "email": f"user{index}@example.com", "roles": ["user"]},
+        "token": f"{rng.getrandbits(160):040x}",
+        "cached": rng.getrandbits(1) == 1,
+        "error": None,
+    }
+
+
+def nested_payload(rng: Random, depth: int = 8, breadth: int = 2) -> dict[str, Any]:
+    """
+    Creates a deeply nested API payload, with lists of objects at each level.
+
+    Args:
+        rng: Source of randomness.
+        depth: Number of nesting levels.
+        breadth: Number of child objects at each level.
+
+    Returns:
+        The payload.
+    """
+    node: dict[str, Any] = {"id": rng.getrandbits(32), "name": rng.choice(WORDS)}
+    for level in range(depth):
+        node = {
+            "id": rng.getrandbits(32),
+            "type": rng.choice(WORDS),
+            "attributes": {
+                "created": f"2024-05-{level + 1:02d}",
+                "email": f"{rng.choice(WORDS)}@example.com",
+                "score": rng.random(),
+            },
+            "children": [node] * breadth,
+        }
+    return {"data": node, "meta": {"page": 1, "total": breadth**depth}}
+
+
+def wide_dict(rng: Random, width: int = 1000) -> dict[str, Any]:
+    """
+    Creates a flat dict with many keys, a few of them sensitive.
+
+    Args:
+        rng: Source of randomness.
+        width: Number of keys.
+
+    Returns:
+        The dict.
+    """
+    sensitive = sorted(SENSITIVE_KEYS)
+    return {
+        (
+            sensitive[index % len(sensitive)] if index % 100 == 0 else f"field_{index}"
+        ): rng.choice((rng.random(), rng.getrandbits(16), rng.choice(WORDS)))
+        for index in range(width)
+    }
+
+
+def free_text(rng: Random, size: int = 64 * 1024) -> str:
+    """
+    Creates a large free text, with a few sensitive values scattered in it.
+
+    Args:
+        rng: Source of randomness.
+        size: Approximate length of the text.
+
+    Returns:
+        The text.
+    """
+    words: list[str] = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        if rng.random() < EMAIL_RATE:
+            word = f"{word}@example.com"
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def embedded_json_event(rng: Random, index: int) -> dict[str, Any]:
+    """
+    Creates a log event containing JSON documents serialized into strings.
+
+    Args:
+        rng: Source of randomness.
+        index: Sequential number of the event, making its values unique.
+
+    Returns:
+        The log event.
+    """
+    event = structlog_event(rng, index)
+    event["body"] = json.dumps(nested_payload(rng, depth=3, breadth=2))
+    event["headers"] = json.dumps(
+        {"authorization": f"Bearer {rng.getrandbits(128):032x}", "accept": "application/json"}
+    )
+    return event
+
+
+def sensitive_patterns(count: int = 50) -> list[str]:
+    """
+    Creates many patterns of sensitive text, as used by larger configurations.
+
+    Args:
+        count: Number of patterns.
+
+    Returns:
+        The regular expression patterns.
+    """
+    common = [
+        r"[\w.+-]+@[\w-]+\.[\w.]+",
+        r"\b\d{4}[ -]?\d{4}[ -]?\d{4}[ -]?\d{4}\b",
+        r"Bearer [\w.-]+",
+        r"'Authentication':",
+        r"AKIA[0-9A-Z]{16}",
+    ]
+    return common + [f"secret_{index}=\\w+" for index in range(count - len(common))]
+
+
+def result_set(rng: Random, rows: int = 200) -> list[dict[str, Any]]:
+    """
+    Creates rows of a database query result, with repeated values in some columns.
+
+    Args:
+        rng: Source of randomness.
+        rows: Number of rows.
+
+    Returns:
+        The rows.
+    """
+    customers = [f"customer{index}@example.com" for index in range(rows // 10 or 1)]
+    return [
+        {
+            "id": index,
+            "email": rng.choice(customers),
+            "status": rng.choice(("pending", "paid", "shipped", "cancelled")),
+            "total": round(rng.random() * 500, 2),
+            "note": " ".join(rng.choices(WORDS, k=6)),
+            "created": f"2024-05-{index % 28 + 1:02d}",
+        }
+        for index in range(rows)
+    ]
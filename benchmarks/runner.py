@@ -0,0 +1,145 @@
+"""Measurement of the benchmark scenarios, and comparison with saved results."""
+
+from __future__ import annotations
+
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .scenarios import Scenario
+
+# maximum number of payloads traced for allocations, as tracing is slow
+ALLOCATION_SAMPLE = 100
+
+
+@dataclass(frozen=True)
+class Result:
+    """
+    Measurements of a single scenario.
+
+    Args:
+        throughput: Payloads processed per second, in the fastest round.
+        p50: Median latency of a single payload, in microseconds.
+        p90: 90th percentile of the latency, in microseconds.
+        p99: 99th percentile of the latency, in microseconds.
+        allocated: Average peak of memory allocated while processing a payload, in bytes.
+    """
+
+    throughput: float
+    p50: float
+    p90: float
+    p99: float
+    allocated: float
+
+
+def measure(scenario: Scenario, count: int = 1000, rounds: int = 5) -> Result:
+    """
+    Runs a scenario and measures its performance.
+
+    Args:
+        scenario: The scenario to run.
+        count: Number of payloads processed in each round, divided by the cost of the
+               scenario.
+        rounds: Number of timed rounds.
+
+    Returns:
+        The measurements.
+    """
+    count = max(count // scenario.cost, 1)
+    process = scenario.build()
+    items = scenario.payloads(count)
+    for item in items[:10]:
+        process(item)
+    best = float("inf")
+    latencies: list[int] = []
+    clock = time.perf_counter_ns
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = clock()
+            for item in items:
+                process(item)
+            best = min(best, clock() - start)
+            for item in items:
+                start = clock()
+                process(item)
+                latencies.append(clock() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return Result(
+        throughput=count / best * 1e9,
+        p50=percentiles[49] / 1e3,
+        p90=percentiles[89] / 1e3,
+        p99=percentiles[98] / 1e3,
+        allocated=_allocated(process, items[:ALLOCATION_SAMPLE]),
+    )
+
+
+def _allocated(process: Any, items: list[Any]) -> float:
+    peaks = []
+    tracemalloc.start()
+    try:
+        for item in items:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            process(item)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks)
+
+
+def save(results: dict[str, Result], path: Path) -> None:
+    """
+    Saves the results, to be used as a baseline later.
+
+    Args:
+        results: Results of the scenarios, by their names.
+        path: The JSON file to write.
+    """
+    data = {name: asdict(result) for name, result in results.items()}
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def load(path: Path) -> dict[str, Result]:
+    """
+    Loads saved results.
+
+    Args:
+        path: The JSON file written by `save`.
+
+    Returns:
+        Results of the scenarios, by their names.
+    """
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {name: Result(**values) for name, values in data.items()}
+
+
+def regressions(
+    results: dict[str, Result], baseline: dict[str, Result], threshold: float
+) -> dict[str, float]:
+    """
+    Finds the scenarios which became slower than in the baseline.
+
+    Args:
+        results: Current results of the scenarios.
+        baseline: Saved results of the scenarios.
+        threshold: Relative decrease of throughput considered a regression, e.g. `0.1`.
+
+    Returns:
+        The relative change of throughput of the regressed scenarios, by their names.
+    """
+    changes = {
+        name: result.throughput / baseline[name].throughput - 1
+        for name, result in results.items()
+        if name in baseline
+    }
+    return {name: change for name, change in changes.items() if change < -threshold}
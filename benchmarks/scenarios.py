@@ -0,0 +1,246 @@
+"""Benchmarked workloads: a sanitizer configuration and the payloads it processes."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from random import Random
+from typing import Any
+
+from sanitary import Sanitizer, StructlogSanitizer
+from sanitary.detectors import DETECTORS
+from sanitary.matching import PatternMatcher
+
+from . import payloads
+
+SEED = 1234
+ROOT = Path(__file__).parent.parent
+SPEC_PATH = Path(tempfile.gettempdir()) / "sanitary-benchmark.spec"
+
+_FIRST_SANITIZE = "sanitizer.sanitize({'user': {'email': 'jane@example.com'}, 'note': 'ok'})"
+_BUILD_SANITIZER = """
+from benchmarks.payloads import SENSITIVE_KEYS, sensitive_patterns
+from sanitary import Sanitizer
+sanitizer = Sanitizer(keys=SENSITIVE_KEYS, patterns=sensitive_patterns(50))
+"""
+_LOAD_SANITIZER = f"""
+from sanitary import Sanitizer
+from sanitary.spec import SanitizerSpec
+sanitizer = Sanitizer.from_spec(SanitizerSpec.load({str(SPEC_PATH)!r}))
+"""
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A benchmarked workload.
+
+    Args:
+        name: Unique name of the scenario.
+        description: Short description of the workload.
+        build: Creates the callable processing a single payload.
+        payloads: Creates the given number of payloads.
+        cost: Relative cost of processing a payload; the number of payloads
+              processed in each round is divided by it.
+    """
+
+    name: str
+    description: str
+    build: Callable[[], Callable[[Any], Any]]
+    payloads: Callable[[int], list[Any]]
+    cost: int = 1
+
+
+def _events(generate: Callable[[Random, int], Any]) -> Callable[[int], list[Any]]:
+    def create(count: int) -> list[Any]:
+        rng = Random(SEED)  # noqa: S311
+        return [generate(rng, index) for index in range(count)]
+
+    return create
+
+
+def _repeated(
+    generate: Callable[[Random], Any], distinct: int = 8
+) -> Callable[[int], list[Any]]:
+    # large payloads are expensive to generate, so a few of them are reused
+    def create(count: int) -> list[Any]:
+        rng = Random(SEED)  # noqa: S311
+        pool = [generate(rng) for _ in range(min(count, distinct))]
+        return [pool[index % len(pool)] for index in range(count)]
+
+    return create
+
+
+def _structlog() -> Callable[[Any], Any]:
+    processor = StructlogSanitizer(keys=payloads.SENSITIVE_KEYS)
+    return lambda event: processor(None, "info", event)
+
+
+def _sanitizer(**options: Any) -> Callable[[], Callable[[Any], Any]]:
+    return lambda: Sanitizer(keys=payloads.SENSITIVE_KEYS, **options).sanitize
+
+
+def _text_values(count: int) -> list[list[str]]:
+    events = _events(payloads.structlog_event)(count)
+    return [[value for value in event.values() if isinstance(value, str)] for event in events]
+
+
+def _pattern_matcher() -> Callable[[Any], Any]:
+    matcher = PatternMatcher(map(re.compile, payloads.sensitive_patterns(50)))
+    return lambda values: [matcher.search(value) for value in values]
+
+
+def _pattern_loop() -> Callable[[Any], Any]:
+    # the plain loop of searches, which the matcher must outperform
+    patterns = [re.compile(pattern) for pattern in payloads.sensitive_patterns(50)]
+
+    def search(value: str) -> re.Pattern[str] | None:
+        for pattern in patterns:
+            if pattern.search(value) is not None:
+                return pattern
+        return None
+
+    return lambda values: [search(value) for value in values]
+
+
+def _startup(snippet: str, prepare: Callable[[], Any] | None = None) -> Callable[[], Any]:
+    # each payload is a run of a new interpreter, including its own start
+    def build() -> Callable[[Any], Any]:
+        if prepare is not None:
+            prepare()
+        command = [sys.executable, "-c", snippet]
+        return lambda _: subprocess.run(command, check=True, cwd=ROOT)  # noqa: S603
+
+    return build
+
+
+def _save_spec() -> None:
+    sanitizer = Sanitizer(
+        keys=payloads.SENSITIVE_KEYS, patterns=payloads.sensitive_patterns(50)
+    )
+    sanitizer.spec.dump(SPEC_PATH)
+
+
+def _hash_scenario(algorithm: str) -> Scenario:
+    return Scenario(
+        name=f"hash-{algorithm}",
+        description=f"structlog events with sensitive values replaced by {algorithm} hashes",
+        build=_sanitizer(replacement=getattr(hashlib, algorithm)),
+        payloads=_events(payloads.structlog_event),
+    )
+
+
+SCENARIOS: tuple[Scenario, ...] = (
+    Scenario(
+        name="structlog-event",
+        description="typical log events processed by StructlogSanitizer",
+        build=_structlog,
+        payloads=_events(payloads.structlog_event),
+    ),
+    Scenario(
+        name="schema-event",
+        description="typical log events sanitized by a function generated from their schema",
+        build=lambda: Sanitizer(keys=payloads.SENSITIVE_KEYS).compile_schema(
+            payloads.STRUCTLOG_EVENT_SCHEMA
+        ),
+        payloads=_events(payloads.structlog_event),
+    ),
+    Scenario(
+        name="nested-payload",
+        description="deeply nested API payloads with lists of objects",
+        build=_sanitizer(),
+        payloads=_repeated(payloads.nested_payload),
+        cost=50,
+    ),
+    Scenario(
+        name="wide-dict",
+        description="flat dicts with a thousand keys",
+        build=_sanitizer(),
+        payloads=_repeated(payloads.wide_dict),
+        cost=20,
+    ),
+    Scenario(
+        name="free-text",
+        description="64 KiB texts searched for sensitive patterns",
+        build=_sanitizer(patterns=payloads.sensitive_patterns(5)),
+        payloads=_repeated(payloads.free_text),
+        cost=20,
+    ),
+    Scenario(
+        name="detectors",
+        description="64 KiB texts searched by all the built-in detectors of sensitive text",
+        build=_sanitizer(detectors=sorted(DETECTORS)),
+        payloads=_repeated(payloads.free_text),
+        cost=20,
+    ),
+    Scenario(
+        name="embedded-json",
+        description="log events with JSON documents embedded in text values",
+        build=_sanitizer(),
+        payloads=_events(payloads.embedded_json_event),
+        cost=5,
+    ),
+    Scenario(
+        name="many-patterns",
+        description="structlog events searched for fifty sensitive patterns",
+        build=_sanitizer(patterns=payloads.sensitive_patterns(50)),
+        payloads=_events(payloads.structlog_event),
+        cost=5,
+    ),
+    Scenario(
+        name="pattern-matcher",
+        description="text values of structlog events searched by the matcher of fifty patterns",
+        build=_pattern_matcher,
+        payloads=_text_values,
+    ),
+    Scenario(
+        name="pattern-loop",
+        description="the same values searched by a loop over the patterns, as the baseline",
+        build=_pattern_loop,
+        payloads=_text_values,
+    ),
+    Scenario(
+        name="text-cache",
+        description="structlog events searched for fifty patterns, with cached text values",
+        build=_sanitizer(patterns=payloads.sensitive_patterns(50), text_cache_size=256),
+        payloads=_events(payloads.structlog_event),
+        cost=5,
+    ),
+    Scenario(
+        name="result-set",
+        description="query results of 200 rows with hashed sensitive columns, by columns",
+        build=lambda: (
+            Sanitizer(keys=payloads.SENSITIVE_KEYS, replacement=hashlib.sha256).sanitize_batch
+        ),
+        payloads=_repeated(payloads.result_set),
+        cost=50,
+    ),
+    Scenario(
+        name="startup-python",
+        description="start of the interpreter alone, as the baseline of the startup scenarios",
+        build=_startup("pass"),
+        payloads=lambda count: [None] * count,
+        cost=200,
+    ),
+    Scenario(
+        name="startup-import",
+        description="start, import, creating a sanitizer with 50 patterns, first sanitizing",
+        build=_startup(_BUILD_SANITIZER + _FIRST_SANITIZE),
+        payloads=lambda count: [None] * count,
+        cost=200,
+    ),
+    Scenario(
+        name="startup-spec",
+        description="start, import, loading a saved compiled sanitizer, first sanitizing",
+        build=_startup(_LOAD_SANITIZER + _FIRST_SANITIZE, prepare=_save_spec),
+        payloads=lambda count: [None] * count,
+        cost=200,
+    ),
+    *(_hash_scenario(algorithm) for algorithm in sorted(hashlib.algorithms_guaranteed)),
+)
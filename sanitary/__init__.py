@@ -6,20 +6,96 @@
 
 from __future__ import annotations
 
-import hashlib
-import json
+import os
 import re
-from collections import ChainMap
-from collections.abc import Iterable
-from decimal import Decimal
-from functools import singledispatchmethod
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from functools import lru_cache, partial
+from itertools import repeat
 from re import Pattern
-from typing import TYPE_CHECKING, Any, AnyStr, cast
+from time import perf_counter
+from types import NoneType
+from typing import TYPE_CHECKING, Any, AnyStr, BinaryIO, TypeVar, cast
 
 if TYPE_CHECKING:
+    from decimal import Decimal
+    from functools import _CacheInfo, _lru_cache_wrapper
+
     from structlog.types import EventDict, WrappedLogger
 
-from .hashing import HASHLIB_FUNCTIONS, HashObjectProtocol, ReplacementType
+    from .spec import SanitizerSpec
+
+from .context import MISSING, ContextCache
+from .copying import CopyMode
+from .dispatch import DispatchTable, Handler, handler_names, handles
+from .embedded_json import (
+    EmbeddedJSON,
+    JSONDecoder,
+    JSONEncoder,
+    dumps,
+    encode,
+    loads,
+    looks_like_json,
+)
+from .hashing import (
+    Buffer,
+    BufferReplacer,
+    KeyedHash,
+    ReplacementType,
+    TextReplacer,
+    buffer_replacer,
+    text_replacer,
+)
+from .keys import KeyMatcher, KeyState
+from .matching import CompiledPatterns, PatternMatcher, Redaction
+from .plans import FieldPlan, field_plan, is_named_tuple
+from .stats import Recorder, RecordingMatcher, SanitizerStats, StatsCallback
+from .traversal import (
+    Frame,
+    LimitAction,
+    MappingFrame,
+    RecordFrame,
+    SequenceFrame,
+    ValueFrame,
+    is_frame,
+)
+
+_Sanitizer = TypeVar("_Sanitizer", bound="Sanitizer")
+
+# attributes whose changes might change the sanitized values, discarding the caches
+_CONFIGURATION = frozenset(
+    {
+        "keys",
+        "patterns",
+        "detectors",
+        "replacement",
+        "message",
+        "redaction",
+        "text_cache_max_length",
+        "embedded_json",
+        "json_decoder",
+        "json_encoder",
+        "reserialize_json",
+        "copy_mode",
+        "max_depth",
+        "max_nodes",
+        "max_string_length",
+        "limit_action",
+        "limit_marker",
+    }
+)
+
+# values missing from some of the records of a batch
+_ABSENT: Any = object()
+
+
+class _Decoded(Exception):  # noqa: N818
+    """Carries decoded embedded JSON out of the text cache, which doesn't store it."""
+
+    def __init__(self, frame: Frame):
+        super().__init__()
+        self.frame = frame
 
 
 class Sanitizer:
@@ -27,29 +103,470 @@ class Sanitizer:
     Base class for sensitive data sanitizers.
 
     Args:
-        keys: Collection of keys to sanitize. Will be normalized to lowercase.
+        keys: Collection of keys to sanitize, matched case-insensitively; each can be
+              a key name, a glob pattern like `*_token`, a dot-separated path like
+              `headers.authorization`, or a regular expression prefixed by `re:`.
         patterns: Collection of regular expression patterns; will be compiled using
-                  `re.compile`.
+                  `re.compile`. Can also be a mapping of the patterns to their own
+                  replacements of the matching text, used instead of `replacement`
+                  when `redaction` is `"spans"`.
+        detectors: Names of the built-in detectors of common sensitive text, such as
+                   `"credit_card"` or `"email"`, which validate their matches, e.g.
+                   using checksums; they are searched for along with the patterns.
+                   See `sanitary.detectors.DETECTORS` for all of them.
         replacement: A string or callable to be used to replace the value. A callable must
                      either accept and return a `str` value, or accept a `bytes` object
                      and return an object compatible with the `hashlib` function.
         message: The text to replace the matching string patterns.
+        redaction: How to handle text values matching the patterns: `"message"`
+                   replaces the whole value with `message`, while `"spans"` replaces
+                   only the matching parts of the value with their replacements.
+        replacement_cache_size: Maximum number of replacements computed by a callable
+                                `replacement` to remember, so that repeated values
+                                aren't replaced (e.g. hashed) again; set to `0` to
+                                disable caching.
+        text_cache_size: Maximum number of sanitized text values to remember, so that
+                         repeated values aren't searched for the patterns again; set
+                         to `0` to disable caching.
+        text_cache_max_length: Maximum length of text values remembered by the cache.
+        embedded_json: How to handle text values containing JSON documents: `"off"` never
+                       decodes them, `"auto"` decodes only values that look like a JSON
+                       object or array, and `"always"` attempts to decode every value.
+        json_decoder: Callable used to decode embedded JSON, e.g. `orjson.loads`.
+        json_encoder: Callable used to re-serialize sanitized embedded JSON; may return
+                      either `str` or `bytes`, e.g. `orjson.dumps`.
+        reserialize_json: Whether sanitized embedded JSON should be serialized back into
+                          a string, instead of being returned as the decoded structure.
+        copy_mode: How to produce sanitized containers: `"always"` copies all of them,
+                   `"on_write"` returns unchanged containers as they are and copies only
+                   those with changed content, and `"in_place"` modifies dicts and lists
+                   in place, as well as the binary buffers when redacting spans.
+        max_depth: Maximum nesting level of containers, including embedded JSON documents.
+        max_nodes: Maximum number of values sanitized in a single call.
+        max_string_length: Maximum length of sanitized text values.
+        limit_action: How to handle values over the above limits: `"marker"` replaces
+                      them with `limit_marker`, while `"truncate"` truncates the texts
+                      and omits the containers and values over the limits.
+        limit_marker: The text replacing values over the limits.
+        collect_stats: Whether to collect the statistics of sanitizing, available from
+                       the `stats` property; without it, sanitizing isn't slowed down
+                       by any instrumentation.
+        stats_callback: Callable receiving the statistics of each sanitized data item,
+                        e.g. for exporting them as metrics; implies `collect_stats`.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         *,
-        keys: Iterable[str] = (),
-        patterns: Iterable[Pattern[AnyStr]] = (),
+        keys: Iterable[str] | KeyMatcher = (),
+        patterns: Iterable[Pattern[AnyStr]]
+        | Mapping[Pattern[AnyStr], ReplacementType]
+        | CompiledPatterns = (),
+        detectors: Iterable[str] = (),
         replacement: ReplacementType = "********",
         message: str = "#### WARNING: Message replaced due to sensitive information.",
+        redaction: Redaction | str = Redaction.MESSAGE,
+        replacement_cache_size: int = 1024,
+        text_cache_size: int = 0,
+        text_cache_max_length: int = 256,
+        embedded_json: EmbeddedJSON | str = EmbeddedJSON.AUTO,
+        json_decoder: JSONDecoder = loads,
+        json_encoder: JSONEncoder = dumps,
+        reserialize_json: bool = False,
+        copy_mode: CopyMode | str = CopyMode.ALWAYS,
+        max_depth: int | None = None,
+        max_nodes: int | None = None,
+        max_string_length: int | None = None,
+        limit_action: LimitAction | str = LimitAction.MARKER,
+        limit_marker: str = "#### WARNING: Value omitted due to exceeded limits.",
+        collect_stats: bool = False,
+        stats_callback: StatsCallback | None = None,
     ):
-        self.replacement: ReplacementType = replacement
-        self.keys: set = set(map(str.lower, keys))
-        self.patterns: set[Pattern[AnyStr]] = set(map(re.compile, patterns))  # type: ignore
+        self._text_cache: _lru_cache_wrapper[Any] | None = None
+        self.stats_callback: StatsCallback | None = stats_callback
+        self._recorder: Recorder | None = None
+        self._stats: SanitizerStats | None = None
+        if collect_stats or stats_callback is not None:
+            self._recorder = Recorder()
+            self._stats = SanitizerStats()
+            self._stats_lock = threading.Lock()
+        self.replacement_cache_size: int = replacement_cache_size
+        self.text_cache_size: int = text_cache_size
+        self.text_cache_max_length: int = text_cache_max_length
+        self.replacement = replacement
+        self.keys = keys
+        self.patterns = (
+            patterns
+            if isinstance(patterns, CompiledPatterns)
+            else CompiledPatterns(patterns, detectors)
+        )
         self.message: str = message
+        self.redaction: Redaction = Redaction(redaction)
+        self.embedded_json: EmbeddedJSON = EmbeddedJSON(embedded_json)
+        self.json_decoder = json_decoder
+        self.json_encoder: JSONEncoder = json_encoder
+        self.reserialize_json: bool = reserialize_json
+        self.copy_mode: CopyMode = CopyMode(copy_mode)
+        self.max_depth: int | None = max_depth
+        self.max_nodes: int | None = max_nodes
+        self.max_string_length: int | None = max_string_length
+        self.limit_action: LimitAction = LimitAction(limit_action)
+        self.limit_marker: str = limit_marker
+        self._dispatch = DispatchTable(
+            {
+                data_type: getattr(self, name)
+                for data_type, name in handler_names(type(self)).items()
+            },
+            default=self._sanitize_object,
+            wrap=self._specialize,
+        )
+        self._handlers = self._dispatch.handlers
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == "text_cache_size":
+            text_cache = lru_cache(value)(self._scan_cacheable_str) if value > 0 else None
+            super().__setattr__("_text_cache", text_cache)
+        elif name in _CONFIGURATION and self._text_cache is not None:
+            self._text_cache.cache_clear()
+
+    def __reduce__(self):
+        return type(self).from_spec, (self.spec,)
+
+    def __copy__(self: _Sanitizer) -> _Sanitizer:
+        # the copy shares the compiled configuration, but has caches of its own, so
+        # that it can be used by another thread without contending for them
+        clone = object.__new__(type(self))
+        vars(clone).update(vars(self))
+        clone.text_cache_size = self.text_cache_size
+        clone.replacement = self.replacement
+        clone.patterns = self._compiled_patterns
+        # the handlers are methods bound to the sanitizer, using its caches
+        clone._dispatch = DispatchTable(
+            {
+                data_type: (
+                    getattr(clone, handler.__name__)
+                    if getattr(handler, "__self__", None) is self
+                    else handler
+                )
+                for data_type, handler in self._dispatch.registered.items()
+            },
+            default=clone._sanitize_object,
+            wrap=clone._specialize,
+        )
+        clone._handlers = clone._dispatch.handlers
+        return clone
+
+    @classmethod
+    def from_spec(cls: type[_Sanitizer], spec: SanitizerSpec) -> _Sanitizer:
+        """
+        Creates a sanitizer from a compiled configuration, without recompiling it.
+
+        Args:
+            spec: The compiled configuration, e.g. loaded using `SanitizerSpec.load`.
+
+        Returns:
+            The sanitizer.
+        """
+        return cls(keys=spec.keys, patterns=spec.patterns, **dict(spec.options))
+
+    @property
+    def spec(self) -> SanitizerSpec:
+        """The compiled configuration, for creating sanitizers using `from_spec`."""
+        from .spec import SanitizerSpec
+
+        options = self.config
+        del options["keys"], options["patterns"], options["detectors"]
+        return SanitizerSpec(self._keys, self._compiled_patterns, tuple(options.items()))
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Arguments for creating a new sanitizer with the same configuration."""
+        return {
+            "keys": set(self._keys.rules),
+            "patterns": (
+                dict(self._pattern_replacements)
+                if self._pattern_replacements
+                else list(self._matcher.patterns)
+            ),
+            "detectors": set(self.detectors),
+            "replacement": self.replacement,
+            "message": self.message,
+            "redaction": self.redaction,
+            "replacement_cache_size": self.replacement_cache_size,
+            "text_cache_size": self.text_cache_size,
+            "text_cache_max_length": self.text_cache_max_length,
+            "embedded_json": self.embedded_json,
+            "json_decoder": self.json_decoder,
+            "json_encoder": self.json_encoder,
+            "reserialize_json": self.reserialize_json,
+            "copy_mode": self.copy_mode,
+            "max_depth": self.max_depth,
+            "max_nodes": self.max_nodes,
+            "max_string_length": self.max_string_length,
+            "limit_action": self.limit_action,
+            "limit_marker": self.limit_marker,
+            "collect_stats": self._recorder is not None,
+            "stats_callback": self.stats_callback,
+        }
+
+    @property
+    def keys(self) -> frozenset[str]:
+        """Rules matching the sensitive keys."""
+        return self._keys.rules
+
+    @keys.setter
+    def keys(self, keys: Iterable[str] | KeyMatcher):
+        self._keys = keys if isinstance(keys, KeyMatcher) else KeyMatcher(keys)
+
+    @property
+    def patterns(self) -> frozenset[Pattern[AnyStr]]:
+        """Compiled patterns of sensitive text values."""
+        return frozenset(self._matcher.patterns)
+
+    @patterns.setter
+    def patterns(
+        self,
+        patterns: Iterable[Pattern[AnyStr]]
+        | Mapping[Pattern[AnyStr], ReplacementType]
+        | CompiledPatterns,
+    ):
+        if not isinstance(patterns, CompiledPatterns):
+            patterns = CompiledPatterns(patterns, self.detectors)
+        self._compiled_patterns = patterns
+        self._matcher: PatternMatcher | RecordingMatcher = patterns.text
+        self._binary_matcher: PatternMatcher | RecordingMatcher = patterns.binary
+        if self._recorder is not None:
+            self._matcher = RecordingMatcher(self._matcher, self._recorder)
+            self._binary_matcher = RecordingMatcher(self._binary_matcher, self._recorder)
+        self._pattern_replacements: dict[Pattern[Any], ReplacementType] = {
+            pattern: replacement
+            for pattern, replacement in patterns.replacements.items()
+            if replacement is not None
+        }
+        self._replace_span_text: dict[Pattern[Any], TextReplacer] = {
+            pattern: self._cached(text_replacer(replacement))
+            for pattern, replacement in self._pattern_replacements.items()
+            if callable(replacement)
+        }
+        self._replace_span_buffer: dict[Pattern[Any], BufferReplacer] = {
+            pattern: buffer_replacer(replacement)
+            for pattern, replacement in self._pattern_replacements.items()
+            if callable(replacement)
+        }
+
+    @property
+    def detectors(self) -> frozenset[str]:
+        """Names of the enabled built-in detectors of sensitive text."""
+        return self._compiled_patterns.detectors
+
+    @detectors.setter
+    def detectors(self, detectors: Iterable[str]):
+        self.patterns = CompiledPatterns(self._compiled_patterns.replacements, detectors)
+
+    @property
+    def json_decoder(self) -> JSONDecoder:
+        """Callable used to decode embedded JSON."""
+        return self._json_decoder
+
+    @json_decoder.setter
+    def json_decoder(self, json_decoder: JSONDecoder):
+        self._json_decoder = json_decoder
+        self._decode_json = (
+            json_decoder if self._recorder is None else self._recorder.decoder(json_decoder)
+        )
+
+    @property
+    def stats(self) -> SanitizerStats | None:
+        """Statistics of all sanitizing so far, or `None` if they are not collected."""
+        return self._stats
+
+    def reset_stats(self) -> None:
+        """Discards the statistics collected so far."""
+        if self._stats is not None:
+            with self._stats_lock:
+                self._stats = SanitizerStats()
+
+    @property
+    def replacement(self) -> ReplacementType:
+        """The replacement of sensitive values."""
+        return self._replacement
+
+    @replacement.setter
+    def replacement(self, replacement: ReplacementType):
+        self._replacement = replacement
+        self._replace_text: TextReplacer | None = None
+        self._replace_buffer: BufferReplacer | None = None
+        if callable(replacement):
+            self._replace_text = self._cached(text_replacer(replacement))
+            # binary data is hashed directly, as a cache lookup would read it all anyway
+            self._replace_buffer = buffer_replacer(replacement)
+
+    def replacement_cache_info(self) -> _CacheInfo | None:
+        """
+        Reports the statistics of the replacement cache.
+
+        Returns:
+            Numbers of cache hits and misses, maximum and current size of the cache,
+            or `None` if the replacements are not cached.
+        """
+        cache_info = getattr(self._replace_text, "cache_info", None)
+        return cache_info() if cache_info is not None else None
+
+    def text_cache_info(self) -> _CacheInfo | None:
+        """
+        Reports the statistics of the cache of sanitized text values.
+
+        Returns:
+            Numbers of cache hits and misses, maximum and current size of the cache,
+            or `None` if the text values are not cached.
+        """
+        return self._text_cache.cache_info() if self._text_cache is not None else None
+
+    def register(self, data_type: type, handler: Handler | None = None) -> Any:
+        """
+        Registers a custom handler for values of the given type and its subclasses.
+
+        Can also be used as a decorator, by omitting the handler.
+
+        Args:
+            data_type: The type of values.
+            handler: Callable accepting the value and returning its sanitized form.
+
+        Returns:
+            The handler, or a decorator registering it if the handler is omitted.
+        """
+        if handler is None:
+            return partial(self.register, data_type)
+        self._dispatch.register(data_type, handler)
+        return handler
+
+    def sanitize_many(
+        self, items: Iterable[Any], *, workers: int | None = None, chunk_size: int = 1000
+    ) -> Iterator[Any]:
+        """
+        Sanitizes many independent items in parallel, using a pool of processes.
+
+        See `sanitary.parallel.sanitize_many` for details.
+
+        Args:
+            items: The items to sanitize.
+            workers: Number of worker processes; defaults to the number of CPUs.
+            chunk_size: Number of items sent to a worker process at once.
+
+        Returns:
+            Iterator over the sanitized items, in the original order.
+        """
+        from .parallel import sanitize_many
+
+        return sanitize_many(self, items, workers=workers, chunk_size=chunk_size)
+
+    def sanitize_threaded(
+        self, data: Any, *, workers: int | None = None, threshold: int = 10_000
+    ) -> Any:
+        """
+        Sanitizes a single large document, splitting its large containers across threads.
+
+        See `sanitary.parallel.sanitize_threaded` for details.
+
+        Args:
+            data: The document to sanitize.
+            workers: Number of threads; by default, threads are only used on
+                     free-threaded builds of Python.
+            threshold: Minimum number of items of a list or dict to split it.
+
+        Returns:
+            The sanitized document.
+        """
+        from .parallel import sanitize_threaded
+
+        return sanitize_threaded(self, data, workers=workers, threshold=threshold)
+
+    def redact_file(
+        self,
+        source: str | os.PathLike[str] | BinaryIO,
+        target: BinaryIO,
+        *,
+        chunk_size: int = 1024 * 1024,
+        max_match_length: int = 4096,
+    ) -> None:
+        """
+        Replaces the spans of a plain text file matching the patterns, in constant memory.
+
+        See `sanitary.streaming.redact_file` for details.
+
+        Args:
+            source: Path of the file to redact, or a binary stream to read it from.
+            target: Binary stream to write the redacted text to.
+            chunk_size: Number of bytes to scan at once.
+            max_match_length: Maximum length of a match of the patterns without one.
+        """
+        from .streaming import redact_file
+
+        redact_file(
+            self, source, target, chunk_size=chunk_size, max_match_length=max_match_length
+        )
+
+    def sanitize_batch(
+        self, batch: Iterable[Mapping[Any, Any]] | Mapping[Any, Iterable[Any]]
+    ) -> Any:
+        """
+        Sanitizes many records with the same keys, e.g. rows of a result set, by columns.
+
+        Instead of deciding for each value whether its key is sensitive and how to
+        handle it, the decision is made once for each column; the values of each
+        column are then replaced, hashed or matched against the patterns together,
+        and repeated values are replaced or matched only once. The result is the
+        same as sanitizing each record separately, unless the statistics are
+        collected or `max_nodes` is set, in which case the records actually are
+        sanitized separately.
+
+        Args:
+            batch: A collection of mappings, or a mapping of columns of values.
+
+        Returns:
+            List of the sanitized records, or a dict of the sanitized columns as lists,
+            depending on the form of the batch.
+        """
+        if isinstance(batch, Mapping):
+            if self._recorder is not None or self.max_nodes is not None:
+                return {key: self.sanitize(list(column)) for key, column in batch.items()}
+            return {
+                key: self._sanitize_column(key, list(column)) for key, column in batch.items()
+            }
+        records = list(batch)
+        for record in records:
+            if not isinstance(record, Mapping):
+                raise TypeError(f"Records must be mappings, not {type(record).__name__}")  # noqa: TRY003
+        if self._recorder is not None or self.max_nodes is not None:
+            return [self.sanitize(record) for record in records]
+        columns = {}
+        for record in records:
+            for key in record:
+                if key not in columns:
+                    columns[key] = self._sanitize_column(
+                        key, [row.get(key, _ABSENT) for row in records]
+                    )
+        return [
+            self._rebuild_record(record, index, columns) for index, record in enumerate(records)
+        ]
+
+    def compile_schema(self, schema: Mapping[str, Any] | Any) -> Callable[[Any], Any]:
+        """
+        Generates a sanitizing function specialized for data of a known shape.
+
+        See `sanitary.schema.compile_schema` for details.
+
+        Args:
+            schema: JSON Schema of the data, or its type, e.g. a `TypedDict` or a dataclass.
+
+        Returns:
+            Function sanitizing the data like `sanitize`.
+        """
+        from .schema import compile_schema
+
+        return compile_schema(self, schema)
 
-    @singledispatchmethod
     def sanitize(self, data: Any) -> Any:
         """
         Sanitize data by masking potentially sensitive information.
@@ -63,66 +580,411 @@ class Sanitizer:
         Returns:
             The sanitized form of data.
         """
+        if self._recorder is not None and self._recorder.stats is None:
+            return self._sanitize_recorded(data)
+        handler = self._handlers.get(type(data))
+        if handler is None:
+            handler = self._dispatch.resolve(type(data))
+        cleaned = handler(data)
+        if not is_frame(cleaned):
+            return cleaned
+        if self.max_depth is not None and self.max_depth < 1:
+            return self._exceed_depth(cleaned)
+        return self._walk(cleaned, data)
+
+    def _sanitize_recorded(self, data: Any) -> Any:
+        recorder = cast(Recorder, self._recorder)
+        stats = recorder.stats = SanitizerStats()
+        stats.calls = 1
+        cache_hits = self._cache_hits()
+        start = perf_counter()
         try:
-            data = vars(data)
+            return self.sanitize(data)
+        finally:
+            stats.total_time = perf_counter() - start
+            stats.cache_hits = self._cache_hits() - cache_hits
+            recorder.stats = None
+            with self._stats_lock:
+                cast(SanitizerStats, self._stats).update(stats)
+            if self.stats_callback is not None:
+                self.stats_callback(stats)
+
+    def _cache_hits(self) -> int:
+        cache_infos = (
+            getattr(replace_text, "cache_info", None)
+            for replace_text in (
+                self._replace_text,
+                *self._replace_span_text.values(),
+                self._text_cache,
+            )
+        )
+        return sum(cache_info().hits for cache_info in cache_infos if cache_info is not None)
+
+    def _sanitize_column(self, key: Any, values: list[Any]) -> list[Any]:
+        """Sanitizes the values of a key in many records, deciding how only once."""
+        rule, key_state = self._keys.decide(self._keys.root, key)
+        if rule is not None:
+            if self._replace_text is None:
+                return [value if value is _ABSENT else self._replacement for value in values]
+            return self._replace_column(values)
+        handlers, resolve = self._handlers, self._dispatch.resolve
+        sanitize_str = self._sanitize_str
+        scan = (
+            bool(self._matcher)
+            or self.embedded_json is not EmbeddedJSON.OFF
+            or self.max_string_length is not None
+        )
+        # the values are nested within the records
+        depth = 2
+        exceeds_depth = self.max_depth is not None and self.max_depth < depth
+        texts: dict[str, Any] = {}
+        cleaned = []
+        for value in values:
+            if type(value) is str:
+                if scan:
+                    result = texts.get(value, _ABSENT)
+                    if result is _ABSENT:
+                        result = sanitize_str(value)
+                        if type(result) is str:
+                            texts[value] = result
+                else:
+                    result = value
+            elif value is _ABSENT:
+                result = value
+            else:
+                result = (handlers.get(type(value)) or resolve(type(value)))(value)
+            if is_frame(result):
+                result = (
+                    self._exceed_depth(result)
+                    if exceeds_depth
+                    else self._walk(result, value, key_state, depth)
+                )
+            cleaned.append(result)
+        return cleaned
+
+    def _replace_column(self, values: list[Any]) -> list[Any]:
+        """Replaces the values of a sensitive key, computing each distinct replacement once."""
+        replacements: dict[tuple[type, Any], Any] = {}
+        cleaned = []
+        for value in values:
+            if value is _ABSENT:
+                cleaned.append(value)
+                continue
+            try:
+                result = replacements[type(value), value]
+            except KeyError:
+                result = replacements[type(value), value] = self._replace(value)
+            except TypeError:
+                # unhashable values can't be deduplicated
+                result = self._replace(value)
+            cleaned.append(result)
+        return cleaned
+
+    def _rebuild_record(self, record: Mapping, index: int, columns: dict[Any, list]) -> Any:
+        """Puts the sanitized values of a record together, following the copy mode."""
+        if self.copy_mode is CopyMode.ALWAYS or not isinstance(record, dict):
+            return {key: columns[key][index] for key in record}
+        changed = [
+            (key, columns[key][index])
+            for key, value in record.items()
+            if columns[key][index] is not value
+        ]
+        if not changed:
+            return record
+        if self.copy_mode is CopyMode.ON_WRITE:
+            record = record.copy()
+        record.update(changed)
+        return record
+
+    def _sanitize_nested(self, value: Any, key_state: KeyState, depth: int) -> Any:
+        """Sanitizes a value at the given position and nesting level of its container."""
+        cleaned = (self._handlers.get(type(value)) or self._dispatch.resolve(type(value)))(
+            value
+        )
+        if not is_frame(cleaned):
+            return cleaned
+        if self.max_depth is not None and self.max_depth < depth:
+            return self._exceed_depth(cleaned)
+        return self._walk(cleaned, value, key_state, depth)
+
+    def _walk(
+        self, root: Frame, data: Any, key_state: KeyState | None = None, depth: int = 1
+    ) -> Any:
+        """Traverses the nested containers using an explicit stack instead of recursion."""
+        handlers, resolve = self._handlers, self._dispatch.resolve
+        decide = self._keys.decide
+        max_depth = sys.maxsize if self.max_depth is None else self.max_depth
+        max_nodes = sys.maxsize if self.max_nodes is None else self.max_nodes
+        truncate = self.limit_action is LimitAction.TRUNCATE
+        nodes = 1
+        root.depth = depth
+        root.key_state = self._keys.root if key_state is None else key_state
+        root.original = data
+        stack = [root]
+        # identities of the containers on the stack, to detect cyclic references
+        active = {id(data)}
+        track, untrack = active.add, active.discard
+        frame = root
+        while True:
+            child = None
+            truncated = False
+            for key, value in frame.items:
+                if nodes >= max_nodes:
+                    if truncate:
+                        truncated = True
+                        break
+                    frame.set(key, value, self.limit_marker)
+                    continue
+                nodes += 1
+                rule, key_state = (
+                    decide(frame.key_state, key) if frame.keyed else (None, frame.key_state)
+                )
+                if rule is not None:
+                    frame.set(key, value, self._replace_key(rule, value))
+                    continue
+                cleaned = (handlers.get(type(value)) or resolve(type(value)))(value)
+                if is_frame(cleaned):
+                    if frame.depth >= max_depth or id(value) in active:
+                        cleaned = self._exceed_limits(cleaned, value, active)
+                    else:
+                        cleaned.depth = frame.depth + 1
+                        cleaned.key_state = key_state
+                        cleaned.key = key
+                        cleaned.original = value
+                        child = cleaned
+                        break
+                frame.set(key, value, cleaned)
+            if child is not None:
+                stack.append(child)
+                track(id(child.original))
+                frame = child
+                continue
+            untrack(id(stack.pop().original))
+            cleaned = frame.finish(truncated)
+            if not stack:
+                return cleaned
+            stack[-1].set(frame.key, frame.original, cleaned)
+            frame = stack[-1]
+
+    def _exceed_limits(self, frame: Frame, value: Any, active: set[int]) -> Any:
+        """Handles a container nested too deep, or containing itself."""
+        if id(value) in active:
+            return self.limit_marker
+        return self._exceed_depth(frame)
+
+    def _exceed_depth(self, frame: Frame) -> Any:
+        if self.limit_action is LimitAction.TRUNCATE:
+            return frame.finish(truncated=True)
+        return self.limit_marker
+
+    def _specialize(self, data_type: type, handler: Handler) -> Handler:
+        """Adapts the handler resolved for a type, once for each type."""
+        if handler == self._sanitize_object or (
+            handler == self._sanitize_sequence and is_named_tuple(data_type)
+        ):
+            plan = field_plan(data_type)
+            if plan is not None:
+                handler = partial(self._sanitize_record, plan)
+            elif _is_decimal(data_type):
+                handler = self._sanitize_decimal
+        if self._recorder is not None:
+            handler = self._recorder.handler(data_type, handler)
+        return handler
+
+    def _sanitize_record(self, plan: FieldPlan, data: Any):
+        return RecordFrame(data, plan.items(data), plan.rebuild, self.copy_mode)
+
+    def _sanitize_object(self, data: Any):
+        try:
+            attributes = vars(data)
         except TypeError:
-            data = str(data)
-        return self.sanitize(data)
+            return self._sanitize_str(str(data))
+        if type(attributes) is not dict or isinstance(data, type):
+            # namespaces of classes, e.g. of enums, refer back to their instances
+            return self._sanitize_str(str(data))
+        # never modify or expose the attributes of the original object
+        return MappingFrame(attributes, CopyMode.ALWAYS)
 
-    @sanitize.register(float)
-    @sanitize.register(int)
-    def _sanitize_number(self, data):
+    @handles(int, float, bool, NoneType)
+    def _sanitize_scalar(self, data):
         return data
 
-    @sanitize.register
     def _sanitize_decimal(self, data: Decimal):
         return float(data)
 
-    @sanitize.register
+    @handles(str)
     def _sanitize_str(self, data: str):
+        text_cache = self._text_cache
+        if (
+            text_cache is None
+            or len(data) > self.text_cache_max_length
+            # decoded JSON is sanitized depending on the position of the text, so it
+            # isn't cached
+            or (self.embedded_json is not EmbeddedJSON.OFF and looks_like_json(data))
+        ):
+            return self._scan_str(data)
         try:
-            data = json.loads(data)
-        except json.JSONDecodeError:
-            for sensitive_pattern in self.patterns:
-                if sensitive_pattern.search(data):  # type: ignore
-                    return self.message
+            return text_cache(data)
+        except _Decoded as decoded:
+            # other JSON values, decoded if `embedded_json` is "always"
+            return decoded.frame
+
+    def _scan_cacheable_str(self, data: str) -> Any:
+        cleaned = self._scan_str(data)
+        if is_frame(cleaned):
+            # raised, so that the cache doesn't store it
+            raise _Decoded(cleaned)
+        return cleaned
+
+    def _scan_str(self, data: str):
+        if self.max_string_length is not None and len(data) > self.max_string_length:
+            if self.limit_action is LimitAction.MARKER:
+                return self.limit_marker
+            data = data[: self.max_string_length]
+        if self.embedded_json is EmbeddedJSON.ALWAYS or (
+            self.embedded_json is EmbeddedJSON.AUTO and looks_like_json(data)
+        ):
+            try:
+                decoded = self._decode_json(data)
+            except ValueError:
+                pass
+            else:
+                convert = partial(encode, encoder=self.json_encoder)
+                return ValueFrame(
+                    decoded, convert if self.reserialize_json else None, self.limit_marker
+                )
+        if self.redaction is Redaction.SPANS:
+            return self._matcher.sub(self._replace_span, data)
+        if self._matcher.search(data) is not None:
+            return self.message
+        return data
+
+    @handles(bytes, bytearray, memoryview)
+    def _sanitize_bytes(self, data: Buffer):
+        if isinstance(data, memoryview) and (data.format != "B" or data.ndim != 1):
+            data = data.cast("B") if data.c_contiguous else memoryview(data.tobytes())
+        if self.max_string_length is not None and len(data) > self.max_string_length:
+            if self.limit_action is LimitAction.MARKER:
+                return self.limit_marker
+            data = data[: self.max_string_length]
+        if not self._binary_matcher:
             return data
-        else:
-            return self.sanitize(data)
+        if self.redaction is Redaction.MESSAGE:
+            return self.message if self._binary_matcher.search(data) is not None else data
+        if self.copy_mode is CopyMode.IN_PLACE and (
+            isinstance(data, bytearray) or (isinstance(data, memoryview) and not data.readonly)
+        ):
+            for pattern, start, end in list(self._binary_matcher.spans(data)):
+                replacement = self._replace_binary_span(pattern, data[start:end])
+                data[start:end] = _fit(replacement, end - start)
+            return data
+        return self._binary_matcher.sub(self._replace_binary_span, data)
 
-    @sanitize.register(set)
-    @sanitize.register(tuple)
-    @sanitize.register(list)
+    @handles(list, tuple, set, frozenset)
     def _sanitize_sequence(self, data):
-        return [self.sanitize(value) for value in data]
+        return SequenceFrame(data, self.copy_mode)
 
-    @sanitize.register
+    @handles(dict)
     def _sanitize_dict(self, data: dict):
-        sensitive_fields = {field.lower() for field in self.keys}
-        cleaned_data = ChainMap({}, data)
-        for key, value in cleaned_data.items():
-            cleaned_data[key] = (
-                _replace(value, self.replacement)
-                if key.lower() in sensitive_fields
-                else self.sanitize(value)
-            )
-        return dict(cleaned_data)
+        return MappingFrame(data, self.copy_mode)
+
+    def _replace(self, value: Any) -> Any:
+        if self._replace_text is None:
+            return self._replacement
+        if self._replace_buffer is not None and isinstance(
+            value, bytes | bytearray | memoryview
+        ):
+            return self._replace_buffer(value)
+        return self._replace_text(str(value))
+
+    def _replace_key(self, rule: str, value: Any) -> Any:
+        if self._recorder is not None:
+            self._recorder.key(rule)
+        return self._replace(value)
+
+    def _replace_span(self, pattern: Pattern[Any], text: str) -> str:
+        replace_text = self._replace_span_text.get(pattern)
+        if replace_text is not None:
+            return replace_text(text)
+        replacement = self._pattern_replacements.get(pattern)
+        if replacement is not None:
+            return replacement  # type: ignore[return-value]
+        return self._replace(text)
+
+    def _replace_binary_span(self, pattern: Pattern[Any], data: Buffer) -> bytes:
+        replace_buffer = self._replace_span_buffer.get(pattern)
+        if replace_buffer is not None:
+            return replace_buffer(data).encode()
+        replacement = self._pattern_replacements.get(pattern)
+        if replacement is not None:
+            return replacement.encode()  # type: ignore[union-attr]
+        if self._replace_buffer is not None:
+            return self._replace_buffer(data).encode()
+        return self._replacement.encode()  # type: ignore[union-attr]
+
+    def _cached(self, replace_text: TextReplacer) -> TextReplacer:
+        if self.replacement_cache_size > 0:
+            return lru_cache(self.replacement_cache_size)(replace_text)
+        return replace_text
+
+
+def _is_decimal(data_type: type) -> bool:
+    # decimals can only exist if the module has been imported, so it's never imported here
+    decimal = sys.modules.get("decimal")
+    return decimal is not None and issubclass(data_type, decimal.Decimal)
 
 
-def _replace(value: Any, replacement: ReplacementType):
-    if callable(replacement):
-        value = str(value)
-        if replacement in HASHLIB_FUNCTIONS:
-            replaced = cast(HashObjectProtocol, replacement(value.encode()))
-            if replacement in (hashlib.shake_128, hashlib.shake_256):
-                return replaced.hexdigest(256)
-            return replaced.hexdigest()
-        return replacement(value)
-    return replacement
+def _fit(replacement: bytes, length: int) -> bytes:
+    """Repeats or truncates the replacement to the given length, for in-place redaction."""
+    if not replacement:
+        return bytes(length)
+    return (replacement * (length // len(replacement) + 1))[:length]
 
 
 class StructlogSanitizer(Sanitizer):
-    """Structlog processor for cleaning up logging context by masking sensitive data."""
+    """
+    Structlog processor for cleaning up logging context by masking sensitive data.
+
+    The values bound to the logging context are passed to the processor with each
+    log event; optionally, their sanitized forms can be cached, so that only the
+    values new to each event are sanitized. The values are cached by their keys and
+    identity, so the bound values must not be modified in place after binding them.
+    Any change of the configuration of the sanitizer discards the cache. The cache
+    isn't used if `max_nodes` is set, as the limit applies to whole events.
+
+    Args:
+        context_cache_size: Maximum number of sanitized context values to remember;
+                            set to `0` to disable caching.
+        options: Arguments of the `Sanitizer` class.
+    """
+
+    def __init__(self, *, context_cache_size: int = 0, **options: Any):
+        self._context_cache: ContextCache | None = None
+        super().__init__(**options)
+        self.context_cache_size = context_cache_size
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == "context_cache_size":
+            super().__setattr__("_context_cache", ContextCache(value) if value > 0 else None)
+        elif name in _CONFIGURATION and self._context_cache is not None:
+            self._context_cache.clear()
+
+    def __copy__(self) -> StructlogSanitizer:
+        clone = super().__copy__()
+        clone.context_cache_size = self.context_cache_size
+        return clone
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Arguments for creating a new sanitizer with the same configuration."""
+        return {**super().config, "context_cache_size": self.context_cache_size}
+
+    def register(self, data_type: type, handler: Handler | None = None) -> Any:
+        """Registers a custom handler, discarding the cached context values."""
+        if handler is not None and self._context_cache is not None:
+            self._context_cache.clear()
+        return super().register(data_type, handler)
 
     def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:  # noqa: F841
         """
@@ -138,4 +1000,38 @@ class StructlogSanitizer(Sanitizer):
         Returns:
             dict
         """
-        return self.sanitize(event_dict)
+        return self.sanitize_event(event_dict)
+
+    def sanitize_event(self, event_dict: EventDict) -> EventDict:
+        """
+        Sanitizes a log event, reusing the cached sanitized context values.
+
+        Args:
+            event_dict: The log event.
+
+        Returns:
+            The sanitized log event.
+        """
+        cache = self._context_cache
+        if cache is None or self.max_nodes is not None:
+            return self.sanitize(event_dict)
+        cleaned: EventDict = {}
+        missing: EventDict = {}
+        for key, value in event_dict.items():
+            cleaned[key] = result = cache.get(key, value)
+            if result is MISSING:
+                missing[key] = value
+        if missing:
+            fresh = self.sanitize(missing)
+            for key, value in missing.items():
+                if key in fresh:
+                    cleaned[key] = fresh[key]
+                    cache.put(key, value, fresh[key])
+                else:
+                    # omitted due to exceeded limits
+                    del cleaned[key]
+        if self.copy_mode is CopyMode.IN_PLACE:
+            event_dict.clear()
+            event_dict.update(cleaned)
+            return event_dict
+        return cleaned
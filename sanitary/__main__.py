@@ -0,0 +1,187 @@
+"""Command line interface for sanitizing JSON and plain text files."""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sys
+from collections.abc import Sequence
+from contextlib import ExitStack
+from pathlib import Path
+
+from . import KeyedHash, Sanitizer
+from .detectors import DETECTORS
+from .embedded_json import EmbeddedJSON
+from .hashing import ReplacementType
+from .matching import Redaction
+from .parallel import sanitize_ndjson_parallel
+from .streaming import StreamFormat, sanitize_stream
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Creates the parser of the command line arguments.
+
+    Returns:
+        The argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m sanitary",
+        description="Remove or replace sensitive data from JSON, NDJSON or plain text files.",
+    )
+    parser.add_argument(
+        "input", nargs="?", default="-", help="input file; standard input if omitted or '-'"
+    )
+    parser.add_argument(
+        "-o", "--output", default="-", help="output file; standard output if omitted or '-'"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=[stream_format.value for stream_format in StreamFormat],
+        default=StreamFormat.NDJSON.value,
+        help="format of the input data (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-k", "--key", action="append", default=[], help="sensitive key; can be repeated"
+    )
+    parser.add_argument(
+        "-p",
+        "--pattern",
+        action="append",
+        default=[],
+        help="regular expression matching sensitive text; can be repeated",
+    )
+    parser.add_argument(
+        "-d",
+        "--detector",
+        action="append",
+        default=[],
+        choices=sorted(DETECTORS),
+        help="built-in detector of sensitive text; can be repeated",
+    )
+    replacement = parser.add_mutually_exclusive_group()
+    replacement.add_argument("-r", "--replacement", help="text replacing sensitive values")
+    replacement.add_argument(
+        "--hash",
+        metavar="ALGORITHM",
+        choices=sorted(hashlib.algorithms_guaranteed),
+        help="replace sensitive values with their hash, using the given algorithm",
+    )
+    parser.add_argument(
+        "--hash-key-env",
+        metavar="VARIABLE",
+        help="environment variable containing the key for keyed hashing; requires --hash",
+    )
+    parser.add_argument("-m", "--message", help="text replacing values matching the patterns")
+    parser.add_argument(
+        "--redaction",
+        choices=[redaction.value for redaction in Redaction],
+        default=Redaction.MESSAGE.value,
+        help="replace whole values matching the patterns with the message, "
+        "or only the matching spans with the replacement (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--embedded-json",
+        choices=[mode.value for mode in EmbeddedJSON],
+        default=EmbeddedJSON.AUTO.value,
+        help="decoding of JSON embedded in text values (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        help="number of worker processes for NDJSON input; 0 uses all CPUs (default: 1)",
+    )
+    return parser
+
+
+def build_sanitizer(arguments: argparse.Namespace) -> Sanitizer:
+    """
+    Creates the sanitizer configured by the command line arguments.
+
+    Args:
+        arguments: Parsed command line arguments.
+
+    Returns:
+        The configured sanitizer.
+    """
+    options: dict = {
+        "keys": arguments.key,
+        "patterns": arguments.pattern,
+        "detectors": arguments.detector,
+        "embedded_json": arguments.embedded_json,
+        "redaction": arguments.redaction,
+    }
+    if arguments.message is not None:
+        options["message"] = arguments.message
+    replacement: ReplacementType | None = arguments.replacement
+    if arguments.hash is not None:
+        if arguments.hash_key_env is not None:
+            replacement = KeyedHash(
+                os.environ[arguments.hash_key_env], algorithm=arguments.hash
+            )
+        else:
+            replacement = getattr(hashlib, arguments.hash)
+    if replacement is not None:
+        options["replacement"] = replacement
+    return Sanitizer(**options)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Runs the command line interface.
+
+    Args:
+        argv: Command line arguments; `sys.argv` is used if omitted.
+
+    Returns:
+        The exit code.
+    """
+    parser = build_parser()
+    arguments = parser.parse_args(argv)
+    if arguments.hash_key_env is not None:
+        if arguments.hash is None:
+            parser.error("--hash-key-env requires --hash")
+        if arguments.hash.startswith("shake_"):
+            parser.error(f"--hash-key-env doesn't support the algorithm {arguments.hash}")
+        if arguments.hash_key_env not in os.environ:
+            parser.error(f"environment variable {arguments.hash_key_env} is not set")
+    if arguments.workers != 1 and arguments.format != StreamFormat.NDJSON.value:
+        parser.error("--workers is supported only for NDJSON input")
+    sanitizer = build_sanitizer(arguments)
+    if arguments.format == StreamFormat.TEXT.value:
+        with ExitStack() as stack:
+            target = (
+                sys.stdout.buffer
+                if arguments.output == "-"
+                else stack.enter_context(Path(arguments.output).open("wb"))
+            )
+            sanitizer.redact_file(
+                sys.stdin.buffer if arguments.input == "-" else arguments.input, target
+            )
+        return 0
+    with ExitStack() as stack:
+        source = (
+            sys.stdin
+            if arguments.input == "-"
+            else stack.enter_context(Path(arguments.input).open(encoding="utf-8"))
+        )
+        target = (
+            sys.stdout
+            if arguments.output == "-"
+            else stack.enter_context(Path(arguments.output).open("w", encoding="utf-8"))
+        )
+        if arguments.workers == 1:
+            sanitize_stream(sanitizer, source, target, arguments.format)
+        else:
+            sanitize_ndjson_parallel(
+                sanitizer, source, target, workers=arguments.workers or None
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
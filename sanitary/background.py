@@ -0,0 +1,210 @@
+"""Structlog processor sanitizing and rendering the log events in a background thread."""
+
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+import traceback
+import weakref
+from collections.abc import Sequence
+from enum import Enum
+from typing import Any
+
+from structlog import DropEvent
+from structlog.types import EventDict, Processor, WrappedLogger
+
+from . import StructlogSanitizer
+
+_STOP = object()
+
+
+class Backpressure(str, Enum):
+    """
+    Handling of log events when the queue of the background worker is full.
+
+    Attributes:
+        BLOCK: Wait until there is space in the queue.
+        DROP: Discard the event.
+        INLINE: Sanitize and emit the event in the calling thread.
+    """
+
+    BLOCK = "block"
+    DROP = "drop"
+    INLINE = "inline"
+
+
+class BackgroundStructlogSanitizer(StructlogSanitizer):
+    """
+    Structlog processor which sanitizes, renders and emits log events in a background thread.
+
+    Log events are put into a bounded queue, so the time spent in the logging call
+    doesn't depend on the size of the logged data. A worker thread then sanitizes
+    each event, passes it through the given processors, and emits the result using
+    the wrapped logger, in the same way Structlog would; therefore, this needs to
+    be the last of the configured processors, and the processors that would
+    normally follow it (e.g. the renderer) need to be passed to it instead.
+
+    As the events are sanitized after the logging call has returned, any values
+    in the logging context must not be modified after logging; for the same reason,
+    the `"in_place"` copy mode should not be used.
+
+    The queued events are emitted when the interpreter exits; `flush` can be
+    used to wait for the queue to be emptied at any other time.
+
+    Args:
+        processors: Processors to apply to the sanitized event, the last of which
+                    usually renders it, e.g. `structlog.processors.JSONRenderer()`.
+        queue_size: Maximum number of events waiting to be processed.
+        backpressure: What to do with new events when the queue is full; see `Backpressure`.
+        options: Arguments of the `Sanitizer` class.
+    """
+
+    def __init__(
+        self,
+        *,
+        processors: Sequence[Processor] = (),
+        queue_size: int = 10000,
+        backpressure: Backpressure | str = Backpressure.BLOCK,
+        **options: Any,
+    ):
+        super().__init__(**options)
+        self.processors: tuple[Processor, ...] = tuple(processors)
+        self.queue_size: int = queue_size
+        self.backpressure: Backpressure = Backpressure(backpressure)
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._thread: threading.Thread | None = None
+        reference = weakref.ref(self)
+        atexit.register(_close, reference)
+        os.register_at_fork(after_in_child=lambda: _reset(reference))
+
+    @property
+    def dropped(self) -> int:
+        """Number of events discarded because the queue was full."""
+        return self._dropped
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """Arguments for creating a new sanitizer with the same configuration."""
+        return {
+            **super().config,
+            "processors": self.processors,
+            "queue_size": self.queue_size,
+            "backpressure": self.backpressure,
+        }
+
+    def __call__(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> EventDict:
+        """
+        Passes the log event to the background worker.
+
+        Args:
+            logger: The logger instance doing the logging.
+            name: Name of the logging method, e.g. `info` or `warning`.
+            event_dict: Current context, including modifications by other processors.
+
+        Raises:
+            DropEvent: Always, as the event is emitted by the background worker.
+        """
+        if self._thread is None:
+            self._start()
+        item = (logger, name, event_dict)
+        if self.backpressure is Backpressure.BLOCK:
+            self._queue.put(item)
+        else:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                if self.backpressure is Backpressure.DROP:
+                    with self._lock:
+                        self._dropped += 1
+                else:
+                    self._emit(logger, name, event_dict)
+        raise DropEvent
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Waits until all queued events are emitted.
+
+        Args:
+            timeout: Maximum number of seconds to wait; waits indefinitely if `None`.
+
+        Returns:
+            Whether all queued events have been emitted.
+        """
+        if timeout is None:
+            self._queue.join()
+            return True
+        finished = threading.Event()
+
+        def wait():
+            self._queue.join()
+            finished.set()
+
+        threading.Thread(target=wait, daemon=True).start()
+        return finished.wait(timeout)
+
+    def close(self) -> None:
+        """Emits all queued events and stops the background worker."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(self.queue_size)
+        self._thread = None
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._work, name="sanitary", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._emit(*item)
+            except Exception:  # noqa: BLE001
+                # logging must not break the application, as in `logging.Handler.handleError`
+                traceback.print_exc()
+            finally:
+                self._queue.task_done()
+
+    def _emit(self, logger: WrappedLogger, name: str, event_dict: EventDict) -> None:
+        event: Any = self.sanitize_event(event_dict)
+        args: tuple
+        kwargs: dict
+        try:
+            for processor in self.processors:
+                event = processor(logger, name, event)
+        except DropEvent:
+            return
+        if isinstance(event, str | bytes | bytearray):
+            args, kwargs = (event,), {}
+        elif isinstance(event, tuple):
+            args, kwargs = event
+        else:
+            args, kwargs = (), event
+        getattr(logger, name)(*args, **kwargs)
+
+
+def _close(reference: weakref.ref[BackgroundStructlogSanitizer]) -> None:
+    sanitizer = reference()
+    if sanitizer is not None:
+        sanitizer.close()
+
+
+def _reset(reference: weakref.ref[BackgroundStructlogSanitizer]) -> None:
+    # threads are not inherited by the forked processes
+    sanitizer = reference()
+    if sanitizer is not None:
+        sanitizer._reset()
@@ -0,0 +1,100 @@
+"""Cache of the sanitized values of logging context, shared between log events."""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from types import NoneType
+from typing import Any
+
+# values which are cheaper to sanitize than to look up
+_UNCACHED = (NoneType, bool, int, float)
+
+MISSING: Any = object()
+
+
+class ContextCache:
+    """
+    Bounded cache of sanitized values, by their keys and the identity of the values.
+
+    The cache is meant for the bound context of log events, i.e. the same value
+    objects passed under the same keys over and over. As identities of objects can
+    be reused after the objects are destroyed, each entry holds a weak reference to
+    its value where possible, or otherwise a strong one, and is only used if the
+    reference still resolves to the looked up value. The least recently used
+    entries are discarded when the cache is full.
+
+    Args:
+        maxsize: Maximum number of cached values.
+    """
+
+    __slots__ = ("_entries", "_lock", "maxsize")
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[Hashable, int], tuple[Callable[[], Any], Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, value: Any) -> Any:
+        """
+        Finds the sanitized form of a value.
+
+        Args:
+            key: The key of the value.
+            value: The original value.
+
+        Returns:
+            The sanitized value, or `MISSING` if it's not cached.
+        """
+        entry_key = (key, id(value))
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None or entry[0]() is not value:
+                return MISSING
+            self._entries.move_to_end(entry_key)
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any, cleaned: Any) -> None:
+        """
+        Remembers the sanitized form of a value, unless it's trivial to sanitize.
+
+        Args:
+            key: The key of the value.
+            value: The original value.
+            cleaned: The sanitized value.
+        """
+        if isinstance(value, _UNCACHED):
+            return
+        try:
+            reference: Callable[[], Any] = weakref.ref(value)
+        except TypeError:
+            reference = _Strong(value)
+        with self._lock:
+            self._entries[(key, id(value))] = (reference, cleaned)
+            self._entries.move_to_end((key, id(value)))
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Discards all cached values."""
+        with self._lock:
+            self._entries.clear()
+
+
+class _Strong:
+    """Strong reference to a value, with the interface of weak references."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __call__(self) -> Any:
+        return self.value
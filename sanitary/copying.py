@@ -0,0 +1,26 @@
+"""Control over copying of sanitized data structures."""
+
+from __future__ import annotations
+
+from enum import Enum
+
+
+class CopyMode(str, Enum):
+    """
+    Modes of producing the sanitized form of containers (dicts, lists, tuples and sets).
+
+    Attributes:
+        ALWAYS: Every container is copied, regardless of whether any of its content
+                has changed; tuples and sets are converted to lists.
+        ON_WRITE: The original containers are returned if none of their content has
+                  changed, and only the containers on the path to a changed value are
+                  copied; tuples and sets keep their type.
+        IN_PLACE: Dicts and lists are modified in place; only immutable containers
+                  are copied on the path to a changed value. With span redaction,
+                  the matching spans of `bytearray` and writable `memoryview`
+                  values are also overwritten in place.
+    """
+
+    ALWAYS = "always"
+    ON_WRITE = "on_write"
+    IN_PLACE = "in_place"
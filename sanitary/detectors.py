@@ -0,0 +1,216 @@
+"""Built-in detectors of common sensitive values, validated beyond regular expressions."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable
+from re import Pattern
+
+_DIGITS = tuple("0123456789")
+_SEPARATORS = re.compile(r"[ -]")
+_IBAN_LENGTH = (15, 34)
+_IBAN_MODULUS = 97
+_LUHN_DOUBLED = (0, 2, 4, 6, 8, 1, 3, 5, 7, 9)
+_EMAIL_LOCAL_LENGTH = 64
+_EMAIL_LENGTH = 254
+_JWT_SEGMENTS = 3
+# prefixes of the identifiers of AWS access keys and other credentials
+_AWS_KEY_PREFIXES = (
+    "ABIA",
+    "ACCA",
+    "AGPA",
+    "AIDA",
+    "AIPA",
+    "AKIA",
+    "ANPA",
+    "ANVA",
+    "APKA",
+    "AROA",
+    "ASCA",
+    "ASIA",
+)
+
+
+class Detector:
+    """
+    Detector of a kind of sensitive text, e.g. credit card numbers.
+
+    The regular expression finds the candidates, which are then checked by the
+    validator, e.g. using a checksum, so that the detector only matches valid
+    values. Detectors are searched for along with the sensitive patterns; texts
+    containing none of the hints are skipped without running the regular
+    expression at all.
+
+    Args:
+        name: Name of the detector, used to enable it and in the statistics.
+        pattern: Regular expression matching the candidates.
+        validate: Callable checking whether a candidate is valid, or `None` if the
+                  regular expression alone is precise enough.
+        hints: Literal texts, at least one of which every candidate contains.
+    """
+
+    __slots__ = ("hints", "name", "pattern", "validate")
+
+    def __init__(
+        self,
+        name: str,
+        pattern: str,
+        validate: Callable[[str], bool] | None,
+        hints: Iterable[str],
+    ):
+        self.name = name
+        self.pattern: Pattern[str] = re.compile(pattern)
+        self.validate = validate
+        self.hints = tuple(hints)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+    def __reduce__(self):
+        # the built-in detectors are pickled by their names
+        return get_detector, (self.name,)
+
+
+def get_detector(name: str) -> Detector:
+    """
+    Finds a built-in detector by its name.
+
+    Args:
+        name: Name of the detector; see `DETECTORS`.
+
+    Returns:
+        The detector.
+
+    Raises:
+        ValueError: If there is no such detector.
+    """
+    try:
+        return DETECTORS[name]
+    except KeyError:
+        available = ", ".join(sorted(DETECTORS))
+        raise ValueError(f"Unknown detector {name!r}; available are: {available}") from None  # noqa: TRY003
+
+
+def is_luhn_valid(number: str) -> bool:
+    """
+    Checks the Luhn checksum of a number, e.g. a payment card number.
+
+    Args:
+        number: The digits, optionally separated by spaces or dashes.
+
+    Returns:
+        Whether the checksum is valid.
+    """
+    digits = _SEPARATORS.sub("", number)
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        value = ord(digit) - 48
+        total += _LUHN_DOUBLED[value] if position % 2 else value
+    return total % 10 == 0
+
+
+def is_iban_valid(iban: str) -> bool:
+    """
+    Checks the length and the mod-97 checksum of an IBAN.
+
+    Args:
+        iban: The IBAN, optionally with its groups separated by spaces.
+
+    Returns:
+        Whether the IBAN is valid.
+    """
+    iban = iban.replace(" ", "")
+    if not _IBAN_LENGTH[0] <= len(iban) <= _IBAN_LENGTH[1]:
+        return False
+    # letters are converted to numbers from 10 to 35
+    rearranged = "".join(str(int(char, 36)) for char in iban[4:] + iban[:4])
+    return int(rearranged) % _IBAN_MODULUS == 1
+
+
+def is_jwt_valid(token: str) -> bool:
+    """
+    Checks the structure of a JSON Web Token, without verifying its signature.
+
+    Args:
+        token: The token.
+
+    Returns:
+        Whether the header and the payload of the token are base64url-encoded JSON
+        objects, the header specifying the algorithm.
+    """
+    from base64 import urlsafe_b64decode
+    from binascii import Error
+    from json import loads
+
+    segments = token.split(".")
+    if len(segments) != _JWT_SEGMENTS:
+        return False
+    try:
+        header, payload = (
+            loads(urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+            for segment in segments[:2]
+        )
+    except (Error, ValueError):
+        return False
+    return isinstance(header, dict) and "alg" in header and isinstance(payload, dict)
+
+
+def is_email_valid(address: str) -> bool:
+    """
+    Checks the lengths and the placement of dots and dashes of an email address.
+
+    Args:
+        address: The address.
+
+    Returns:
+        Whether the address is valid.
+    """
+    local, _, domain = address.rpartition("@")
+    return (
+        len(local) <= _EMAIL_LOCAL_LENGTH
+        and len(address) <= _EMAIL_LENGTH
+        and not local.startswith(".")
+        and not local.endswith(".")
+        and ".." not in local
+        and all(
+            not label.startswith("-") and not label.endswith("-") for label in domain.split(".")
+        )
+    )
+
+
+DETECTORS: dict[str, Detector] = {
+    item.name: item
+    for item in (
+        Detector(
+            "credit_card",
+            r"(?<![0-9-])[0-9](?:[ -]?[0-9]){12,18}(?![0-9-])",
+            is_luhn_valid,
+            _DIGITS,
+        ),
+        Detector(
+            "iban",
+            r"\b[A-Z]{2}[0-9]{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?\b",
+            is_iban_valid,
+            _DIGITS,
+        ),
+        Detector(
+            "jwt",
+            r"\beyJ[A-Za-z0-9_-]+\.eyJ[A-Za-z0-9_-]+\.[A-Za-z0-9_-]*",
+            is_jwt_valid,
+            ("eyJ",),
+        ),
+        Detector(
+            "aws_access_key",
+            rf"\b(?:A3T[A-Z0-9]|{'|'.join(_AWS_KEY_PREFIXES)})[A-Z2-7]{{16}}\b",
+            None,
+            ("A3T", *_AWS_KEY_PREFIXES),
+        ),
+        Detector(
+            "email",
+            r"(?<![A-Za-z0-9_.%+-])[A-Za-z0-9_.%+-]+"
+            r"@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}\b",
+            is_email_valid,
+            ("@",),
+        ),
+    )
+}
@@ -0,0 +1,124 @@
+"""Type-based dispatch of values to their sanitizing handlers."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from typing import Any, TypeVar
+from weakref import WeakKeyDictionary
+
+Handler = Callable[[Any], Any]
+Wrapper = Callable[[type, Handler], Handler]
+Method = TypeVar("Method", bound=Callable[..., Any])
+
+_HANDLED_TYPES = "__sanitary_types__"
+_HANDLER_NAMES: WeakKeyDictionary[type, Mapping[type, str]] = WeakKeyDictionary()
+
+
+def handles(*types: type) -> Callable[[Method], Method]:
+    """
+    Marks a sanitizer method as the handler of values of the given types.
+
+    Handlers are inherited by subclasses, which can override them either by
+    overriding the method itself, or by marking another method for the same types.
+
+    Args:
+        types: The types of values handled by the method.
+
+    Returns:
+        Decorator marking the method.
+    """
+
+    def decorator(method: Method) -> Method:
+        setattr(method, _HANDLED_TYPES, types)
+        return method
+
+    return decorator
+
+
+def handler_names(cls: type) -> Mapping[type, str]:
+    """
+    Collects the names of handler methods defined on a class and its parents.
+
+    Args:
+        cls: The sanitizer class.
+
+    Returns:
+        Mapping of handled types to method names.
+    """
+    names = _HANDLER_NAMES.get(cls)
+    if names is None:
+        names = _HANDLER_NAMES[cls] = {
+            data_type: name
+            for base in reversed(cls.__mro__)
+            for name, attribute in vars(base).items()
+            for data_type in getattr(attribute, _HANDLED_TYPES, ())
+        }
+    return names
+
+
+class DispatchTable:
+    """
+    Maps types of values to their handlers.
+
+    Values of the registered types are dispatched by a single dictionary lookup of
+    their exact type. Handlers of other types are resolved by following the method
+    resolution order of the type, and the result is cached for subsequent values.
+
+    Args:
+        handlers: Mapping of types to their handlers.
+        default: Handler of values that don't match any of the registered types.
+        wrap: Callable accepting a type and its handler, and returning the handler
+              used in the lookup table, e.g. for instrumenting the handlers.
+    """
+
+    def __init__(
+        self, handlers: Mapping[type, Handler], default: Handler, wrap: Wrapper | None = None
+    ):
+        self._registered: dict[type, Handler] = dict(handlers)
+        self.default: Handler = default
+        self.wrap: Wrapper | None = wrap
+        self.handlers: dict[type, Handler] = {}
+        self._reset()
+
+    @property
+    def registered(self) -> dict[type, Handler]:
+        """The registered handlers, by their types."""
+        return dict(self._registered)
+
+    def register(self, data_type: type, handler: Handler) -> None:
+        """
+        Registers a handler of values of the given type and its subclasses.
+
+        Args:
+            data_type: The type of values.
+            handler: Callable accepting the value and returning its sanitized form.
+        """
+        self._registered[data_type] = handler
+        # previously resolved types might now resolve to the new handler
+        self._reset()
+
+    def resolve(self, data_type: type) -> Handler:
+        """
+        Finds the handler of the given type and caches it.
+
+        Args:
+            data_type: The type of values.
+
+        Returns:
+            The handler of the closest registered parent type, or the default handler.
+        """
+        handler = next(
+            (self._registered[base] for base in data_type.__mro__ if base in self._registered),
+            self.default,
+        )
+        if self.wrap is not None:
+            handler = self.wrap(data_type, handler)
+        self.handlers[data_type] = handler
+        return handler
+
+    def _reset(self) -> None:
+        self.handlers.clear()
+        for data_type, handler in self._registered.items():
+            self.handlers[data_type] = (
+                handler if self.wrap is None else self.wrap(data_type, handler)
+            )
@@ -0,0 +1,98 @@
+"""Support for sanitizing JSON documents embedded in text values."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import Enum
+from typing import Any
+
+JSONDecoder = Callable[[str], Any]
+JSONEncoder = Callable[[Any], "str | bytes"]
+
+_BRACKETS = {"{": "}", "[": "]"}
+
+
+class EmbeddedJSON(str, Enum):
+    """
+    Modes of handling text values which might contain JSON documents.
+
+    Attributes:
+        OFF: Text values are never decoded; they are only matched against the patterns.
+        AUTO: Only text values that look like a JSON object or array are decoded.
+        ALWAYS: Decoding is attempted for every text value.
+    """
+
+    OFF = "off"
+    AUTO = "auto"
+    ALWAYS = "always"
+
+
+def looks_like_json(text: str) -> bool:
+    """
+    Cheaply checks whether the text might be a JSON object or array.
+
+    Only the first and the last non-whitespace characters are inspected; the check
+    can return false positives, but never false negatives.
+
+    Args:
+        text: The text to check.
+
+    Returns:
+        `True` if the text is enclosed in matching curly or square brackets.
+    """
+    start = text[:1]
+    end = text[-1:]
+    if start.isspace() or end.isspace():
+        text = text.strip()
+        start = text[:1]
+        end = text[-1:]
+    closing = _BRACKETS.get(start)
+    return closing is not None and end == closing
+
+
+def loads(text: str) -> Any:
+    """
+    Decodes a JSON document using the `json` module, which is imported on first use.
+
+    Args:
+        text: The JSON document.
+
+    Returns:
+        The decoded value.
+    """
+    import json
+
+    return json.loads(text)
+
+
+def dumps(value: Any) -> str:
+    """
+    Serializes the value using the `json` module, which is imported on first use.
+
+    Args:
+        value: The value to serialize.
+
+    Returns:
+        The JSON document.
+    """
+    import json
+
+    return json.dumps(value)
+
+
+def encode(value: Any, encoder: JSONEncoder = dumps) -> str:
+    """
+    Serializes the value into a JSON string.
+
+    Args:
+        value: The value to serialize.
+        encoder: A JSON encoder; encoders returning `bytes`, such as `orjson.dumps`,
+                 are supported as well.
+
+    Returns:
+        The JSON document as a string.
+    """
+    encoded = encoder(value)
+    if isinstance(encoded, bytes):
+        return encoded.decode()
+    return encoded
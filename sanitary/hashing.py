@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import hashlib
+import sys
 from collections.abc import Callable
-from typing import Protocol, runtime_checkable
+from functools import lru_cache, partial
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
-HASHLIB_FUNCTIONS = tuple(
-    getattr(hashlib, name) for name in dir(hashlib) if not name.startswith("_")
-)
+if TYPE_CHECKING:
+    import hmac
 
 
 @runtime_checkable
@@ -71,7 +72,7 @@ class HashObjectProtocol(Protocol):
             length: Optional length in bytes, required of SHAKE algorithms.
         """
 
-    def update(self, obj: bytes, /) -> None:  # noqa: F841
+    def update(self, obj: Buffer, /) -> None:  # noqa: F841
         """
         Update the hash object with the bytes-like object.
 
@@ -84,3 +85,174 @@ class HashObjectProtocol(Protocol):
 
 
 ReplacementType = str | Callable[[str], str] | Callable[[bytes], HashObjectProtocol]
+TextReplacer = Callable[[str], str]
+Buffer = bytes | bytearray | memoryview
+BufferReplacer = Callable[[Buffer], str]
+
+_SHAKE_DIGEST_LENGTH = 256
+
+
+def is_hashlib_function(replacement: Any) -> bool:
+    """
+    Checks whether the replacement is one of the functions of the `hashlib` library.
+
+    The `hashlib` module isn't imported if it hasn't been already, as its functions
+    can't be passed as replacements without importing it.
+
+    Args:
+        replacement: A callable replacement value.
+
+    Returns:
+        Whether the replacement is a `hashlib` function.
+    """
+    hashlib = sys.modules.get("hashlib")
+    return hashlib is not None and replacement in _hashlib_functions(hashlib)
+
+
+@lru_cache(maxsize=1)
+def _hashlib_functions(hashlib: ModuleType) -> tuple[Any, ...]:
+    return tuple(getattr(hashlib, name) for name in dir(hashlib) if not name.startswith("_"))
+
+
+def __getattr__(name: str) -> Any:
+    # `HASHLIB_FUNCTIONS` is computed only when accessed, so that `hashlib` isn't
+    # imported on startup
+    if name == "HASHLIB_FUNCTIONS":
+        import hashlib
+
+        return _hashlib_functions(hashlib)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")  # noqa: TRY003
+
+
+def _digest_length(replacement: Any) -> tuple[int, ...]:
+    hashlib = sys.modules["hashlib"]
+    return (
+        (_SHAKE_DIGEST_LENGTH,) if replacement in {hashlib.shake_128, hashlib.shake_256} else ()
+    )
+
+
+def text_replacer(replacement: Callable) -> TextReplacer:
+    """
+    Converts a replacement callable to a function that accepts and returns a `str` value.
+
+    The functions from the `hashlib` library are wrapped so that they return the
+    hexadecimal digest of the encoded text; other callables are returned as they are.
+
+    Args:
+        replacement: A callable replacement value.
+
+    Returns:
+        Function returning the replacement of the text.
+    """
+    if not is_hashlib_function(replacement):
+        return replacement
+    digest_length = _digest_length(replacement)
+
+    def hash_text(text: str) -> str:
+        return replacement(text.encode()).hexdigest(*digest_length)
+
+    return hash_text
+
+
+class KeyedHash:
+    """
+    Replacement of sensitive values with their keyed hash.
+
+    Unlike plain hashes, keyed hashes of low-entropy values (e.g. email addresses)
+    can't be reversed by brute force without knowing the key, while still giving
+    the same output for the same value wherever the same key is used.
+
+    The BLAKE2 algorithms are keyed natively, while all other algorithms are used
+    with HMAC. The hash state initialized with the key is computed only once, and
+    copied for each hashed value.
+
+    Args:
+        key: The secret key; text is encoded as UTF-8.
+        algorithm: Name of the hashing algorithm, as accepted by `hashlib.new`.
+        digest_size: Size of the digest in bytes; supported only by the BLAKE2 algorithms.
+        length: Maximum length of the resulting hexadecimal digest; longer digests
+                are truncated.
+    """
+
+    def __init__(
+        self,
+        key: str | bytes,
+        *,
+        algorithm: str = "sha256",
+        digest_size: int | None = None,
+        length: int | None = None,
+    ):
+        import hashlib
+        import hmac
+
+        if isinstance(key, str):
+            key = key.encode()
+        if length is not None and length < 1:
+            raise ValueError("Digest length must be positive.")  # noqa: TRY003
+        self.key = key
+        self.algorithm = algorithm
+        self.digest_size = digest_size
+        self.length = length
+        self._state: HashObjectProtocol | hmac.HMAC
+        if algorithm in {"blake2b", "blake2s"}:
+            blake2 = getattr(hashlib, algorithm)
+            options: dict[str, Any] = {"key": key}
+            if digest_size is not None:
+                options["digest_size"] = digest_size
+            self._state = blake2(**options)
+        elif digest_size is not None:
+            raise ValueError(f"Digest size is not configurable for {algorithm}.")  # noqa: TRY003
+        elif algorithm.startswith("shake_"):
+            raise ValueError(f"Variable length algorithm {algorithm} is not supported.")  # noqa: TRY003
+        else:
+            self._state = hmac.new(key, digestmod=algorithm)
+
+    def __call__(self, value: str | Buffer) -> str:
+        """
+        Calculates the keyed hash of the value.
+
+        Args:
+            value: The text to hash, or binary data read directly from the buffer.
+
+        Returns:
+            The hexadecimal digest, truncated to the configured length.
+        """
+        state = self._state.copy()
+        state.update(value.encode() if isinstance(value, str) else value)
+        return state.hexdigest()[: self.length]
+
+    def __reduce__(self):
+        return (
+            partial(
+                KeyedHash,
+                algorithm=self.algorithm,
+                digest_size=self.digest_size,
+                length=self.length,
+            ),
+            (self.key,),
+        )
+
+
+def buffer_replacer(replacement: Callable) -> BufferReplacer:
+    """
+    Converts a replacement callable to a function that accepts binary data.
+
+    The functions from the `hashlib` library and `KeyedHash` instances hash the data
+    directly from the buffer; other callables receive the data decoded as UTF-8.
+
+    Args:
+        replacement: A callable replacement value.
+
+    Returns:
+        Function returning the replacement of the binary data, as text.
+    """
+    if isinstance(replacement, KeyedHash):
+        return replacement
+    if not is_hashlib_function(replacement):
+        return lambda data: replacement(str(data, "utf-8", "replace"))
+    digest_length = _digest_length(replacement)
+
+    def hash_buffer(data: Buffer) -> str:
+        return replacement(data).hexdigest(*digest_length)
+
+    return hash_buffer
@@ -0,0 +1,189 @@
+"""Matching of sensitive keys, by their names or paths within nested data."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from re import Pattern
+from typing import Any
+
+PATH_SEPARATOR = "."
+REGEX_PREFIX = "re:"
+WILDCARD = "*"
+CACHE_SIZE = 4096
+
+Decision = tuple["str | None", "KeyState"]
+
+
+class _Node:
+    """A node of the trie of key paths."""
+
+    __slots__ = ("combined", "exact", "merged", "patterns", "separate", "terminal", "wildcard")
+
+    def __init__(self) -> None:
+        self.exact: dict[str, _Node] = {}
+        self.patterns: dict[str, tuple[Pattern[str], _Node]] = {}
+        self.wildcard: _Node | None = None
+        self.terminal: str | None = None
+        # alternation of the merged patterns, and the patterns searched individually
+        self.combined: Pattern[str] | None = None
+        self.merged: tuple[tuple[Pattern[str], _Node], ...] = ()
+        self.separate: tuple[tuple[Pattern[str], _Node], ...] = ()
+
+    def child(self, segment: str) -> _Node:
+        if segment == WILDCARD:
+            if self.wildcard is None:
+                self.wildcard = _Node()
+            return self.wildcard
+        if segment.startswith(REGEX_PREFIX):
+            pattern = re.compile(segment[len(REGEX_PREFIX) :], re.IGNORECASE)
+        elif WILDCARD in segment:
+            # only `*` is a wildcard, as other glob characters are common in key names,
+            # e.g. `user[password]`; globs match whole keys, so they are anchored
+            parts = (re.escape(part) for part in segment.split(WILDCARD))
+            pattern = re.compile(rf"\A(?s:{'.*'.join(parts)})\Z")
+        else:
+            return self.exact.setdefault(segment, _Node())
+        return self.patterns.setdefault(segment, (pattern, _Node()))[1]
+
+    def combine(self) -> None:
+        """Merges the patterns of the node and its descendants into single alternations."""
+        # numbered groups would be renumbered by merging, breaking backreferences
+        merged = tuple(item for item in self.patterns.values() if not item[0].groups)
+        if len(merged) > 1:
+            try:
+                self.combined = re.compile("|".join(_scoped(pattern) for pattern, _ in merged))
+                self.merged = merged
+            except re.error:
+                # e.g. flags which apply to the whole expression
+                self.combined = None
+        self.separate = tuple(
+            item for item in self.patterns.values() if item not in self.merged
+        )
+        for node in (*self.exact.values(), *(node for _, node in self.patterns.values())):
+            node.combine()
+        if self.wildcard is not None:
+            self.wildcard.combine()
+
+    def matching(self, key: str) -> Iterable[_Node]:
+        node = self.exact.get(key)
+        if node is not None:
+            yield node
+        if self.wildcard is not None:
+            yield self.wildcard
+        # most keys don't match any of the patterns, which a single search rules out
+        if self.combined is not None and self.combined.search(key) is not None:
+            for pattern, node in self.merged:
+                if pattern.search(key):
+                    yield node
+        for pattern, node in self.separate:
+            if pattern.search(key):
+                yield node
+
+
+class KeyState:
+    """
+    Position within the nested data, relative to the configured key paths.
+
+    Each state caches the decisions made for the keys encountered in it.
+
+    Args:
+        nodes: The trie nodes of partially matched paths.
+    """
+
+    __slots__ = ("cache", "nodes")
+
+    def __init__(self, nodes: frozenset[_Node]):
+        self.nodes = nodes
+        self.cache: dict[Any, Decision] = {}
+
+
+class KeyMatcher:
+    """
+    Decides which keys of nested dicts are sensitive.
+
+    Each rule is a path of key names separated by dots, e.g. `headers.authorization`,
+    which matches a key at the end of the path at any nesting level, as well as a
+    flattened key named by the whole path; lists and other sequences within the
+    path are skipped. Each segment of the path can be
+    either an exact key name, a `*` matching any key, or a glob pattern like
+    `*_token`, in which only `*` is a wildcard, so that key names like
+    `user[password]` are matched literally. Alternatively, a rule prefixed by `re:` is a regular expression
+    matching the key names. All matching is case-insensitive.
+
+    The rules are compiled into a trie, whose glob and regular expression segments
+    at each position are merged into a single alternation, and the decision for
+    each key is cached per position in the trie, so the cost of matching a key
+    doesn't depend on the number of rules.
+
+    Args:
+        rules: The rules matching sensitive keys.
+        cache_size: Maximum number of cached decisions per position; the cache is
+                    cleared when full.
+    """
+
+    def __init__(self, rules: Iterable[str], cache_size: int = CACHE_SIZE):
+        self.rules: frozenset[str] = frozenset(rules)
+        self.cache_size = cache_size
+        self._root = _Node()
+        for rule in self.rules:
+            node = self._root
+            for segment in _split(rule):
+                node = node.child(segment)
+            node.terminal = rule
+            if PATH_SEPARATOR in rule and not rule.startswith(REGEX_PREFIX):
+                # paths might also be flattened keys, e.g. of ECS log events
+                self._root.child(rule.lower()).terminal = rule
+        self._root.combine()
+        self._states: dict[frozenset[_Node], KeyState] = {}
+        self.root: KeyState = self._state(frozenset())
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def decide(self, state: KeyState, key: Any) -> Decision:
+        """
+        Decides whether the key is sensitive.
+
+        Args:
+            state: The position of the dict containing the key.
+            key: The key; keys other than `str` are matched by their string form.
+
+        Returns:
+            The rule matching the key, or `None` if the key isn't sensitive, and the
+            position of its value.
+        """
+        decision = state.cache.get(key) if type(key) is str else None
+        if decision is not None:
+            return decision
+        normalized = (key if isinstance(key, str) else str(key)).lower()
+        nodes = set()
+        rule = None
+        # paths can start at any nesting level
+        for node in (self._root, *state.nodes):
+            for child in node.matching(normalized):
+                rule = rule or child.terminal
+                if child.exact or child.patterns or child.wildcard is not None:
+                    nodes.add(child)
+        decision = (rule, self._state(frozenset(nodes)))
+        if type(key) is str:
+            if len(state.cache) >= self.cache_size:
+                state.cache.clear()
+            state.cache[key] = decision
+        return decision
+
+    def _state(self, nodes: frozenset[_Node]) -> KeyState:
+        state = self._states.get(nodes)
+        if state is None:
+            state = self._states[nodes] = KeyState(nodes)
+        return state
+
+
+def _split(rule: str) -> list[str]:
+    if rule.startswith(REGEX_PREFIX):
+        return [rule]
+    return rule.lower().split(PATH_SEPARATOR)
+
+
+def _scoped(pattern: Pattern[str]) -> str:
+    return f"(?{'i' if pattern.flags & re.IGNORECASE else ''}:{pattern.pattern})"
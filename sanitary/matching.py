@@ -0,0 +1,426 @@
+"""Matching of text against a collection of regular expression patterns."""
+
+from __future__ import annotations
+
+import re
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from enum import Enum
+from functools import partial
+from itertools import repeat
+from re import Pattern
+from typing import TYPE_CHECKING, Any, cast
+
+if TYPE_CHECKING:
+    from .detectors import Detector
+    from .hashing import ReplacementType
+
+if sys.version_info >= (3, 11):
+    from re import _parser  # type: ignore[attr-defined]
+else:
+    import sre_parse as _parser
+
+_SPECIAL_CHARS = frozenset(".^$*+?{}[]\\|()")
+_OPTIONAL_QUANTIFIERS = frozenset("*?{")
+# length of the start of the literal prefixes by which the patterns are grouped
+_GROUP_PREFIX_LENGTH = 4
+
+# a searched pattern, its original, and the literals at least one of which each of
+# its matches contains, or `None` if there are none
+_Searched = tuple[Pattern[Any], Pattern[Any], "tuple[Any, ...] | None"]
+
+
+class Redaction(str, Enum):
+    """
+    Handling of text values matching the sensitive patterns.
+
+    Attributes:
+        MESSAGE: The whole text is replaced with a message.
+        SPANS: Only the matching parts of the text are replaced.
+    """
+
+    MESSAGE = "message"
+    SPANS = "spans"
+
+
+class PatternMatcher:
+    """
+    Matches text against many regular expression patterns.
+
+    Each pattern is searched individually, as the regular expression engine skips
+    ahead to the possible starts of a single pattern much faster than it tries all
+    the alternatives of merged patterns at every position. Before running the
+    engine, the text is checked against the literal prefix of each pattern, so that
+    the patterns which can't possibly match are skipped; the patterns whose prefixes
+    start alike are grouped, and skipped together by a single check. Patterns without
+    a literal prefix, e.g. those starting with a character class, are always searched.
+
+    The maximum length of a match of any of the patterns is available as the
+    `max_length` attribute, which is `None` if the length isn't bounded, e.g. due
+    to repetitions like `+` or `*`.
+
+    A binary matcher searches `bytes`, `bytearray` and `memoryview` values directly,
+    without decoding them: text patterns are compiled as `bytes` patterns matching
+    their UTF-8 encoding, so character classes like digits or word characters match
+    only ASCII, and the patterns which can't be compiled as `bytes` are skipped.
+    Likewise, a text matcher skips the `bytes` patterns.
+
+    Each match of a detector is only reported, with the pattern of the detector, if
+    the detector validates it. Instead of their literal prefixes, the hints of the
+    detectors are used to skip the text which can't possibly match.
+
+    Args:
+        patterns: Collection of compiled regular expression patterns.
+        binary: Whether to match binary values instead of text.
+        detectors: Collection of detectors of sensitive text.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[Pattern[Any]],
+        binary: bool = False,
+        detectors: Iterable[Detector] = (),
+    ):
+        self.patterns: tuple[Pattern[Any], ...] = tuple(dict.fromkeys(patterns))
+        self.detectors: tuple[Detector, ...] = tuple(detectors)
+        self.binary = binary
+        # names of the detectors, by their patterns
+        self.labels: dict[Pattern[Any], str] = {
+            detector.pattern: detector.name for detector in self.detectors
+        }
+        self._validators: dict[Pattern[Any], Callable[[Any], bool]] = {
+            detector.pattern: (
+                partial(_validate_decoded, detector.validate) if binary else detector.validate
+            )
+            for detector in self.detectors
+            if detector.validate is not None
+        }
+        hints = {detector.pattern: detector.hints for detector in self.detectors}
+        # the searched patterns, mapped to the original ones
+        searched: dict[Pattern[Any], Pattern[Any]] = {}
+        for pattern in (*self.patterns, *self.labels):
+            converted = _to_bytes(pattern) if binary else pattern
+            if converted is not None and isinstance(converted.pattern, bytes) is binary:
+                searched[converted] = pattern
+        self._groups: tuple[tuple[Any, tuple[_Searched, ...]], ...] = _group(
+            (pattern, original, _encoded(_prefilter({pattern: original}, hints), binary))
+            for pattern, original in searched.items()
+        )
+        self.max_length: int | None = _max_length(searched)
+        self._prefixes: tuple[Any, ...] | None = _encoded(_prefilter(searched, hints), binary)
+
+    def __bool__(self) -> bool:
+        return bool(self._groups)
+
+    def might_match(self, text: Any) -> bool:
+        """
+        Quickly checks whether the text could match any of the patterns.
+
+        Args:
+            text: The text to check.
+
+        Returns:
+            `False` if the text certainly doesn't match, `True` otherwise.
+        """
+        # memoryview doesn't support searching for a subsequence
+        if self._prefixes is None or type(text) is memoryview:
+            return True
+        for prefix in self._prefixes:
+            if prefix in text:
+                return True
+        return False
+
+    def search(self, text: Any) -> Pattern[Any] | None:
+        """
+        Finds a pattern matching the text.
+
+        Args:
+            text: The text to search.
+
+        Returns:
+            The original pattern that matched the text, or `None` if there was no match.
+        """
+        # memoryview doesn't support searching for a subsequence
+        filtered = type(text) is not memoryview
+        validators = self._validators
+        for key, group in self._groups:
+            if filtered and key is not None and key not in text:
+                continue
+            for pattern, original, prefixes in group:
+                if filtered and prefixes is not None:
+                    for prefix in prefixes:
+                        if prefix in text:
+                            break
+                    else:
+                        continue
+                if original not in validators:
+                    if pattern.search(text) is not None:
+                        return original
+                elif any(
+                    self._is_valid(original, match.group()) for match in pattern.finditer(text)
+                ):
+                    return original
+        return None
+
+    def sub(self, replace: Callable[[Pattern[Any], Any], Any], text: Any) -> Any:
+        """
+        Replaces all matches of the patterns within the text.
+
+        All the matches are replaced in a single pass, in which the leftmost match
+        wins, so that the replacements are never matched again.
+
+        Args:
+            replace: Callable accepting the original matching pattern and the matched
+                     text, and returning the replacement text.
+            text: The text to search.
+
+        Returns:
+            The text with all the matches replaced; binary values with any matches are
+            returned as `bytes`.
+        """
+        parts = []
+        written = 0
+        for original, match in sorted(self._matches(text), key=_match_start):
+            start = match.start()
+            if start < written:
+                # overlaps an already replaced match
+                continue
+            parts.append(text[written:start])
+            parts.append(replace(original, match.group()))
+            written = match.end()
+        if not parts:
+            return text
+        parts.append(text[written:])
+        return (b"" if self.binary else "").join(parts)
+
+    def spans(self, text: Any, start: int = 0) -> Iterator[tuple[Pattern[Any], int, int]]:
+        """
+        Finds all matches of the patterns within the text.
+
+        The patterns are searched one by one, so the matches of different patterns
+        might overlap.
+
+        Args:
+            text: The text to search.
+            start: Position at which to start the search; unlike slicing the text,
+                   the preceding text is still visible to lookbehind assertions.
+
+        Yields:
+            The original matching pattern, and the start and end of each match.
+        """
+        for original, match in self._matches(text, start):
+            yield original, match.start(), match.end()
+
+    def _candidates(self, text: Any) -> Iterator[tuple[Pattern[Any], Pattern[Any]]]:
+        """Selects the patterns which might match the text, by their literal prefixes."""
+        # memoryview doesn't support searching for a subsequence
+        filtered = type(text) is not memoryview
+        for key, group in self._groups:
+            if filtered and key is not None and key not in text:
+                continue
+            for pattern, original, prefixes in group:
+                if filtered and prefixes is not None:
+                    for prefix in prefixes:
+                        if prefix in text:
+                            break
+                    else:
+                        continue
+                yield pattern, original
+
+    def _matches(self, text: Any, start: int = 0) -> Iterator[tuple[Pattern[Any], re.Match]]:
+        for pattern, original in self._candidates(text):
+            for match in pattern.finditer(text, start):
+                if self._is_valid(original, match.group()):
+                    yield original, match
+
+    def _is_valid(self, pattern: Pattern[Any], matched: Any) -> bool:
+        validate = self._validators.get(pattern)
+        return validate is None or validate(matched)
+
+
+class CompiledPatterns:
+    """
+    Sensitive patterns compiled for matching both text and binary values.
+
+    Args:
+        patterns: Collection of regular expression patterns, or a mapping of the
+                  patterns to their own replacements; `None` stands for the default
+                  replacement.
+        detectors: Names of the built-in detectors of sensitive text to search for
+                   along with the patterns; see `sanitary.detectors.DETECTORS`.
+    """
+
+    __slots__ = ("binary", "detectors", "replacements", "text")
+
+    def __init__(
+        self,
+        patterns: Iterable[Any] | Mapping[Any, ReplacementType | None],
+        detectors: Iterable[str] = (),
+    ):
+        self.replacements: dict[Pattern[Any], ReplacementType | None] = {
+            re.compile(pattern): replacement
+            for pattern, replacement in (
+                patterns.items()
+                if isinstance(patterns, Mapping)
+                else zip(patterns, repeat(None))
+            )
+        }
+        self.detectors: frozenset[str] = frozenset(detectors)
+        found: tuple[Detector, ...] = ()
+        if self.detectors:
+            from .detectors import get_detector
+
+            found = tuple(get_detector(name) for name in sorted(self.detectors))
+        self.text = PatternMatcher(self.replacements, detectors=found)
+        self.binary = PatternMatcher(self.replacements, binary=True, detectors=found)
+
+
+def _group(searched: Iterable[_Searched]) -> tuple[tuple[Any, tuple[_Searched, ...]], ...]:
+    """
+    Groups the searched patterns by the start of their literal prefixes.
+
+    A single check for the start of the prefixes skips all the patterns of a group; the
+    patterns without a single literal prefix are grouped under `None`, and checked
+    individually, if at all.
+    """
+    groups: dict[Any, list[_Searched]] = {}
+    for item in searched:
+        prefixes = item[2]
+        key = prefixes[0][:_GROUP_PREFIX_LENGTH] if prefixes and len(prefixes) == 1 else None
+        groups.setdefault(key, []).append(item)
+    grouped: list[tuple[Any, tuple[_Searched, ...]]] = []
+    for key, items in groups.items():
+        if key is not None and len(items) == 1:
+            # a single pattern is checked by its whole prefix
+            key = cast(tuple, items[0][2])[0]
+        grouped.append(
+            (
+                key,
+                tuple(
+                    (pattern, original, None if prefixes == (key,) else prefixes)
+                    for pattern, original, prefixes in items
+                ),
+            )
+        )
+    return tuple(grouped)
+
+
+def _validate_decoded(validate: Callable[[str], bool], matched: bytes) -> bool:
+    # binary patterns of the detectors only match ASCII text
+    return validate(matched.decode("latin-1"))
+
+
+def _to_bytes(pattern: Pattern[Any]) -> Pattern[bytes] | None:
+    if isinstance(pattern.pattern, bytes):
+        return pattern
+    try:
+        return re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+    except re.error:
+        return None
+
+
+def _max_length(patterns: Iterable[Pattern[Any]]) -> int | None:
+    length = 0
+    for pattern in patterns:
+        try:
+            width = _parser.parse(pattern.pattern, pattern.flags).getwidth()[1]
+        except re.error:
+            return None
+        if width >= _parser.MAXREPEAT:
+            return None
+        length = max(length, width)
+    return length
+
+
+def _match_start(item: tuple[Pattern[Any], re.Match]) -> int:
+    return item[1].start()
+
+
+def _source(pattern: Pattern[Any]) -> str:
+    # bytes patterns are analyzed as text, which latin-1 maps one to one
+    source = pattern.pattern
+    return source.decode("latin-1") if isinstance(source, bytes) else source
+
+
+def _prefilter(
+    patterns: Mapping[Pattern[Any], Pattern[Any]], hints: Mapping[Pattern[Any], tuple[str, ...]]
+) -> tuple[str, ...] | None:
+    candidates = sorted(
+        {
+            hint
+            for pattern, original in patterns.items()
+            for hint in hints.get(original, (_literal_prefix(pattern),))
+        },
+        key=len,
+    )
+    if not candidates or not candidates[0]:
+        return None
+    prefixes: list[str] = []
+    for prefix in candidates:
+        # a prefix containing a shorter one is redundant, as the shorter one must be present too
+        if not any(other in prefix for other in prefixes):
+            prefixes.append(prefix)
+    return tuple(prefixes)
+
+
+def _encoded(prefixes: tuple[str, ...] | None, binary: bool) -> tuple[Any, ...] | None:
+    if prefixes is None or not binary:
+        return prefixes
+    return tuple(prefix.encode("latin-1") for prefix in prefixes)
+
+
+def _literal_prefix(pattern: Pattern[Any]) -> str:
+    """Extracts the literal text every match of the pattern must start with."""
+    source = _source(pattern)
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE):
+        return ""
+    if _has_top_level_alternation(source):
+        return ""
+    position = 0
+    if source.startswith("^"):
+        position = 1
+    elif source.startswith("\\A"):
+        position = 2
+    prefix: list[str] = []
+    while position < len(source):
+        char = source[position]
+        if char == "\\":
+            escaped = source[position + 1 : position + 2]
+            if not escaped or escaped.isalnum():
+                break
+            prefix.append(escaped)
+            position += 2
+        elif char in _SPECIAL_CHARS:
+            if char in _OPTIONAL_QUANTIFIERS and prefix:
+                prefix.pop()
+            break
+        else:
+            prefix.append(char)
+            position += 1
+    return "".join(prefix)
+
+
+def _has_top_level_alternation(source: str) -> bool:
+    depth = 0
+    in_class = False
+    position = 0
+    while position < len(source):
+        char = source[position]
+        if char == "\\":
+            position += 2
+            continue
+        if in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+            # a closing bracket right after the opening one is a literal
+            if source[position + 1 : position + 2] == "]":
+                position += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+        position += 1
+    return False
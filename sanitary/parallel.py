@@ -0,0 +1,255 @@
+"""Sanitizing of large data in parallel, using multiple processes or threads."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from copy import copy
+from functools import partial
+from itertools import islice
+from typing import TYPE_CHECKING, Any, TextIO, cast
+
+from .streaming import sanitize_ndjson
+
+if TYPE_CHECKING:
+    from . import Sanitizer
+    from .keys import KeyState
+
+CHUNK_SIZE = 1000
+SPLIT_THRESHOLD = 10_000
+# large containers are typically close to the top of documents, e.g. lists of results
+MAX_SPLIT_DEPTH = 8
+# number of chunks per thread, so that threads finishing early get more work
+CHUNKS_PER_THREAD = 4
+
+_SPLIT_TYPES = (dict, list)
+
+_worker_sanitizer: Sanitizer | None = None
+
+
+def sanitize_many(
+    sanitizer: Sanitizer,
+    items: Iterable[Any],
+    *,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Sanitizes many independent items in parallel, using a pool of processes.
+
+    The items are sent to the worker processes in chunks, and the sanitized items
+    are yielded in the original order. Each worker process recreates the sanitizer
+    from its configuration only once; custom handlers registered on the sanitizer
+    instance are not available in the workers.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        items: The items to sanitize.
+        workers: Number of worker processes; defaults to the number of CPUs. If `1`,
+                 the items are sanitized in the current process.
+        chunk_size: Number of items sent to a worker process at once.
+
+    Yields:
+        The sanitized items.
+    """
+    if workers == 1:
+        yield from map(sanitizer.sanitize, items)
+        return
+    yield from _map_chunks(sanitizer, _sanitize_chunk, items, workers, chunk_size)
+
+
+def sanitize_ndjson_parallel(
+    sanitizer: Sanitizer,
+    source: TextIO,
+    target: TextIO,
+    *,
+    workers: int | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """
+    Sanitizes a stream of newline-delimited JSON in parallel, using a pool of processes.
+
+    The lines are sent to the worker processes in chunks, and the sanitized lines are
+    written in the original order. Only a limited number of chunks are processed at
+    once, so the memory use doesn't depend on the size of the input.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        source: Text stream to read from.
+        target: Text stream to write the sanitized data to.
+        workers: Number of worker processes; defaults to the number of CPUs.
+        chunk_size: Number of lines sent to a worker process at once.
+    """
+    for line in _map_chunks(sanitizer, _sanitize_lines, source, workers, chunk_size):
+        target.write(line)
+        target.write("\n")
+
+
+def sanitize_threaded(
+    sanitizer: Sanitizer,
+    data: Any,
+    *,
+    workers: int | None = None,
+    threshold: int = SPLIT_THRESHOLD,
+) -> Any:
+    """
+    Sanitizes a single large document, splitting its large containers across threads.
+
+    Lists and dicts with at least `threshold` items are split into chunks, which are
+    sanitized by a pool of threads, and the results are put together in the original
+    order; such containers are looked for only in the first few levels of the
+    document. Threads only run in parallel on free-threaded builds of Python, so by
+    default the document is split only if the global interpreter lock is disabled;
+    otherwise, it's sanitized by the current thread, unless the number of workers is
+    given explicitly, e.g. for replacement callables which release the lock.
+
+    The threads share the compiled keys and patterns of the sanitizer, which are
+    immutable, but each thread uses a copy of the sanitizer with its own replacement
+    and text caches, so that the threads don't contend for the locks of shared
+    caches; the statistics of the caches of the sanitizer don't include the work of
+    the threads. The result is the same as that of `Sanitizer.sanitize`; if the
+    statistics are collected or `max_nodes` is set, the whole document is sanitized
+    by the current thread.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        data: The document to sanitize.
+        workers: Number of threads; defaults to the number of CPUs if the global
+                 interpreter lock is disabled, and to `1` otherwise.
+        threshold: Minimum number of items of a container to split it.
+
+    Returns:
+        The sanitized document.
+    """
+    if workers is None:
+        workers = 1 if _gil_enabled() else os.cpu_count() or 1
+    if workers == 1 or sanitizer._recorder is not None or sanitizer.max_nodes is not None:
+        return sanitizer.sanitize(data)
+    with ThreadPoolExecutor(workers) as pool:
+        splitter = _Splitter(sanitizer, pool, workers, threshold)
+        return splitter.sanitize(data, sanitizer._keys.root, 1)
+
+
+def _gil_enabled() -> bool:
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+class _Splitter:
+    """Sanitizes a document, splitting its large containers into chunks."""
+
+    __slots__ = ("chunks", "local", "pool", "sanitizer", "threshold")
+
+    def __init__(self, sanitizer: Sanitizer, pool: Executor, workers: int, threshold: int):
+        self.sanitizer = sanitizer
+        self.pool = pool
+        self.chunks = workers * CHUNKS_PER_THREAD
+        self.threshold = threshold
+        self.local = threading.local()
+
+    def thread_sanitizer(self) -> Sanitizer:
+        """The copy of the sanitizer with caches used only by the current thread."""
+        sanitizer = getattr(self.local, "sanitizer", None)
+        if sanitizer is None:
+            sanitizer = self.local.sanitizer = copy(self.sanitizer)
+        return sanitizer
+
+    def sanitize(self, data: Any, key_state: KeyState, depth: int) -> Any:
+        """Sanitizes a value at the given position and nesting level."""
+        sanitizer = self.sanitizer
+        max_depth = sanitizer.max_depth
+        if (
+            type(data) not in _SPLIT_TYPES
+            or depth > MAX_SPLIT_DEPTH
+            or (max_depth is not None and max_depth < depth)
+        ):
+            return sanitizer._sanitize_nested(data, key_state, depth)
+        handler = sanitizer._handlers.get(type(data)) or sanitizer._dispatch.resolve(type(data))
+        if handler not in (sanitizer._sanitize_dict, sanitizer._sanitize_sequence):
+            # handled by a custom handler
+            return sanitizer._sanitize_nested(data, key_state, depth)
+        frame = handler(data)
+        if len(data) < self.threshold:
+            for key, value in frame.items:
+                rule, value_state = (
+                    sanitizer._keys.decide(key_state, key) if frame.keyed else (None, key_state)
+                )
+                cleaned = (
+                    sanitizer._replace_key(rule, value)
+                    if rule is not None
+                    else self.sanitize(value, value_state, depth + 1)
+                )
+                frame.set(key, value, cleaned)
+            return frame.finish()
+        items = list(frame.items)
+        size = -(-len(items) // self.chunks)
+        sanitize_items = partial(_sanitize_items, self, frame.keyed, key_state, depth + 1)
+        chunks = [items[start : start + size] for start in range(0, len(items), size)]
+        for chunk, cleaned_chunk in zip(
+            chunks, self.pool.map(sanitize_items, chunks), strict=True
+        ):
+            for (key, value), cleaned in zip(chunk, cleaned_chunk, strict=True):
+                frame.set(key, value, cleaned)
+        return frame.finish()
+
+
+def _sanitize_items(
+    splitter: _Splitter,
+    keyed: bool,
+    key_state: KeyState,
+    depth: int,
+    items: list[tuple[Any, Any]],
+) -> list[Any]:
+    sanitizer = splitter.thread_sanitizer()
+    decide, sanitize = sanitizer._keys.decide, sanitizer._sanitize_nested
+    cleaned = []
+    for key, value in items:
+        rule, value_state = decide(key_state, key) if keyed else (None, key_state)
+        cleaned.append(
+            sanitizer._replace_key(rule, value)
+            if rule is not None
+            else sanitize(value, value_state, depth)
+        )
+    return cleaned
+
+
+def _map_chunks(
+    sanitizer: Sanitizer,
+    function: Callable[[list[Any]], list[Any]],
+    items: Iterable[Any],
+    workers: int | None,
+    chunk_size: int,
+) -> Iterator[Any]:
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_initialize, initargs=(sanitizer,)) as pool:
+        pending: deque[Future[list[Any]]] = deque()
+        for chunk in _chunks(items, chunk_size):
+            pending.append(pool.submit(function, chunk))
+            # limit the number of chunks in memory, while keeping all workers busy
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _initialize(sanitizer: Sanitizer) -> None:
+    global _worker_sanitizer
+    _worker_sanitizer = sanitizer
+
+
+def _sanitize_chunk(items: list[Any]) -> list[Any]:
+    return list(map(cast("Sanitizer", _worker_sanitizer).sanitize, items))
+
+
+def _sanitize_lines(lines: list[str]) -> list[str]:
+    return list(sanitize_ndjson(cast("Sanitizer", _worker_sanitizer), lines))
@@ -0,0 +1,121 @@
+"""Plans for reading the fields of structured objects, computed once per class."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from typing import Any
+from weakref import WeakKeyDictionary
+
+_MISSING = object()
+_SPECIAL_SLOTS = frozenset({"__dict__", "__weakref__"})
+_PLANS: WeakKeyDictionary[type, FieldPlan | None] = WeakKeyDictionary()
+
+
+class FieldPlan:
+    """
+    How to read the fields of objects of a class, and how to rebuild them.
+
+    Args:
+        fields: Names of the fields.
+        items: Callable returning the names and values of the fields of an object.
+        rebuild: Callable creating an object of the class from the values of all the
+                 fields; if `None`, the sanitized object is a dict of its fields.
+    """
+
+    __slots__ = ("fields", "items", "rebuild")
+
+    def __init__(
+        self,
+        fields: tuple[str, ...],
+        items: Callable[[Any], Iterator[tuple[str, Any]]],
+        rebuild: Callable[[Iterable[Any]], Any] | None = None,
+    ):
+        self.fields = fields
+        self.items = items
+        self.rebuild = rebuild
+
+
+def field_plan(cls: type) -> FieldPlan | None:
+    """
+    Creates the plan for objects of a class, if it has statically known fields.
+
+    Supported are named tuples, dataclasses, attrs classes and classes with
+    `__slots__`, unless they define their own text representation, like paths or
+    UUIDs; other objects don't have a fixed set of fields. Typed dicts don't
+    need a plan, as they are plain dicts at runtime. Plans are cached per class.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        The plan, or `None` if the class isn't supported.
+    """
+    try:
+        return _PLANS[cls]
+    except KeyError:
+        plan = _PLANS[cls] = _create_plan(cls)
+        return plan
+
+
+def is_named_tuple(cls: type) -> bool:
+    """
+    Checks whether the class is a named tuple.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        Whether the class is a subclass of `tuple` with named fields.
+    """
+    return issubclass(cls, tuple) and isinstance(getattr(cls, "_fields", None), tuple)
+
+
+def _create_plan(cls: type) -> FieldPlan | None:
+    if is_named_tuple(cls):
+        fields: tuple[str, ...] = cls._fields  # type: ignore[attr-defined]
+        return FieldPlan(fields, partial(zip, fields), cls._make)  # type: ignore[attr-defined]
+    # dataclasses can only exist if the module has been imported
+    dataclasses = sys.modules.get("dataclasses")
+    if dataclasses is not None and dataclasses.is_dataclass(cls):
+        fields = tuple(field.name for field in dataclasses.fields(cls))
+        return FieldPlan(fields, partial(_attributes, fields, False))
+    attributes = getattr(cls, "__attrs_attrs__", None)
+    if attributes is not None:
+        fields = tuple(attribute.name for attribute in attributes)
+        return FieldPlan(fields, partial(_attributes, fields, False))
+    if cls.__str__ is not object.__str__ or cls.__repr__ is not object.__repr__:
+        # value types like paths, UUIDs or fractions are sanitized by their text
+        return None
+    slots: dict[str, None] = {}
+    dynamic = False
+    for base in cls.__mro__[:-1]:
+        if "__slots__" not in vars(base):
+            # instances of classes without slots anywhere in the hierarchy have a `__dict__`
+            dynamic = True
+            continue
+        base_slots = vars(base)["__slots__"]
+        for slot in (base_slots,) if isinstance(base_slots, str) else base_slots:
+            dynamic = dynamic or slot == "__dict__"
+            if slot not in _SPECIAL_SLOTS:
+                slots[_mangle(base, slot)] = None
+    if not slots:
+        return None
+    fields = tuple(slots)
+    return FieldPlan(fields, partial(_attributes, fields, dynamic))
+
+
+def _attributes(fields: tuple[str, ...], dynamic: bool, data: Any) -> Iterator[tuple[str, Any]]:
+    for name in fields:
+        value = getattr(data, name, _MISSING)
+        if value is not _MISSING:
+            yield name, value
+    if dynamic:
+        yield from vars(data).items()
+
+
+def _mangle(cls: type, name: str) -> str:
+    if name.startswith("__") and not name.endswith("__"):
+        return f"_{cls.__name__.lstrip('_')}{name}"
+    return name
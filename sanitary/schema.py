@@ -0,0 +1,372 @@
+"""Sanitizing functions generated for data of a statically known shape."""
+
+from __future__ import annotations
+
+import sys
+import typing
+from collections.abc import Callable, Mapping, MutableSequence, Sequence
+from functools import partial
+from itertools import count
+from operator import is_
+from types import NoneType, UnionType
+from typing import TYPE_CHECKING, Any, Union
+
+from .copying import CopyMode
+from .embedded_json import EmbeddedJSON
+from .traversal import is_frame
+
+if TYPE_CHECKING:
+    from . import Sanitizer
+    from .keys import KeyState
+
+# shapes of values other than objects and arrays
+TEXT = "text"
+SCALAR = "scalar"
+ANY = "any"
+
+_SCALAR_TYPES = (int, float, bool, NoneType)
+_JSON_SCALARS = frozenset({"integer", "number", "boolean", "null"})
+_SEQUENCES = (list, Sequence, MutableSequence)
+
+
+class ObjectShape:
+    """
+    Shape of a dict with known keys, or of a dataclass.
+
+    Args:
+        fields: The shapes of the values, by their keys.
+        record_type: The dataclass, or `None` if the shape is a dict.
+    """
+
+    __slots__ = ("fields", "record_type")
+
+    def __init__(self, fields: dict[str, Shape], record_type: type | None = None):
+        self.fields = fields
+        self.record_type = record_type
+
+
+class ArrayShape:
+    """
+    Shape of a list of values of the same shape.
+
+    Args:
+        items: The shape of the items.
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self, items: Shape):
+        self.items = items
+
+
+Shape = ObjectShape | ArrayShape | str
+
+
+def parse_schema(schema: Mapping[str, Any] | Any) -> Shape:
+    """
+    Determines the shape of data from its schema.
+
+    The schema is either a JSON Schema, of which only the `type`, `properties` and
+    `items` keywords are used, or a type hint such as a `TypedDict` or a dataclass,
+    whose fields are described by their annotations. Parts of the schema which
+    can't be described this way, e.g. unions of different types or recursive
+    types, have any shape.
+
+    Args:
+        schema: The JSON Schema or the type.
+
+    Returns:
+        The shape.
+    """
+    if isinstance(schema, Mapping):
+        return _parse_json_schema(schema)
+    return _parse_hint(schema, ())
+
+
+def compile_schema(
+    sanitizer: Sanitizer, schema: Mapping[str, Any] | Any
+) -> Callable[[Any], Any]:
+    """
+    Generates a function sanitizing data of the given schema like the sanitizer.
+
+    The sensitive keys are matched against the paths of the schema in advance, so
+    the generated code replaces the values of sensitive keys and scans the text
+    values directly, while the numbers and other scalars are passed through
+    without being dispatched to handlers. Any part of the data that doesn't match
+    the schema, e.g. a dict with different keys or a value of a different type, is
+    sanitized by the generic traversal instead, so the result is always the same
+    as that of `Sanitizer.sanitize`.
+
+    The function is based on the configuration of the sanitizer at the time of
+    generation, and needs to be generated again if the configuration changes. If
+    the statistics are collected or `max_nodes` is set, the function is simply
+    `Sanitizer.sanitize`.
+
+    Args:
+        sanitizer: The sanitizer.
+        schema: The JSON Schema of the data, or its type; see `parse_schema`.
+
+    Returns:
+        The sanitizing function.
+    """
+    shape = parse_schema(schema)
+    if sanitizer._recorder is not None or sanitizer.max_nodes is not None:
+        return sanitizer.sanitize
+    return _Generator(sanitizer).generate(shape)
+
+
+def _parse_json_schema(schema: Mapping[str, Any]) -> Shape:
+    schema_type = schema.get("type")
+    if isinstance(schema_type, list):
+        # nulls are passed through by the generic traversal
+        types = [name for name in schema_type if name != "null"]
+        schema_type = types[0] if len(types) == 1 else None
+    if schema_type == "object" or (schema_type is None and "properties" in schema):
+        properties = schema.get("properties", {})
+        return ObjectShape(
+            {
+                name: _parse_json_schema(value) if isinstance(value, Mapping) else ANY
+                for name, value in properties.items()
+            }
+        )
+    if schema_type == "array" or (schema_type is None and "items" in schema):
+        items = schema.get("items")
+        return ArrayShape(_parse_json_schema(items) if isinstance(items, Mapping) else ANY)
+    if schema_type == "string":
+        return TEXT
+    if schema_type in _JSON_SCALARS:
+        return SCALAR
+    return ANY
+
+
+def _parse_hint(hint: Any, seen: tuple[Any, ...]) -> Shape:
+    if hint is str:
+        return TEXT
+    if hint in _SCALAR_TYPES or hint is None:
+        return SCALAR
+    origin = typing.get_origin(hint)
+    arguments = typing.get_args(hint)
+    if origin in _SEQUENCES and len(arguments) == 1:
+        return ArrayShape(_parse_hint(arguments[0], seen))
+    if origin is Union or origin is UnionType:
+        # nulls are passed through by the generic traversal
+        types = [argument for argument in arguments if argument is not NoneType]
+        return _parse_hint(types[0], seen) if len(types) == 1 else ANY
+    if hint in seen:
+        # recursive types are described only up to the first repetition
+        return ANY
+    return _parse_class(hint, (*seen, hint))
+
+
+def _parse_class(hint: Any, seen: tuple[Any, ...]) -> Shape:
+    if typing.is_typeddict(hint):
+        hints = typing.get_type_hints(hint)
+        return ObjectShape({name: _parse_hint(value, seen) for name, value in hints.items()})
+    # dataclasses can only exist if the module has been imported
+    dataclasses = sys.modules.get("dataclasses")
+    if isinstance(hint, type) and dataclasses is not None and dataclasses.is_dataclass(hint):
+        hints = typing.get_type_hints(hint)
+        return ObjectShape(
+            {
+                field.name: _parse_hint(hints.get(field.name, Any), seen)
+                for field in dataclasses.fields(hint)
+            },
+            hint,
+        )
+    return ANY
+
+
+class _Generator:
+    """Generates the source code of the functions sanitizing the parts of the shape."""
+
+    __slots__ = (
+        "_constants",
+        "_fast_types",
+        "_ids",
+        "_lines",
+        "_namespace",
+        "_scan",
+        "_text",
+        "sanitizer",
+    )
+
+    def __init__(self, sanitizer: Sanitizer):
+        self.sanitizer = sanitizer
+        self._lines: list[str] = []
+        self._namespace: dict[str, Any] = {
+            "_nested": sanitizer._sanitize_nested,
+            "_replace": sanitizer._replace,
+            "_replacement": sanitizer._replacement,
+            "_scalars": frozenset(_SCALAR_TYPES),
+            "_is": is_,
+        }
+        self._constants: dict[int, str] = {}
+        self._ids = count()
+        resolve = sanitizer._dispatch.resolve
+        # the fast paths are only valid for types that aren't handled by custom handlers
+        self._fast_types = {
+            TEXT: resolve(str) == sanitizer._sanitize_str,
+            SCALAR: all(
+                resolve(data_type) == sanitizer._sanitize_scalar for data_type in _SCALAR_TYPES
+            ),
+            dict: resolve(dict) == sanitizer._sanitize_dict,
+            list: resolve(list) == sanitizer._sanitize_sequence,
+        }
+        self._scan = (
+            bool(sanitizer._matcher)
+            or sanitizer.embedded_json is not EmbeddedJSON.OFF
+            or sanitizer.max_string_length is not None
+        )
+        # text can only be decoded into nested containers if it's embedded JSON
+        self._text = "_text" if sanitizer.embedded_json is EmbeddedJSON.OFF else "_scan"
+        self._namespace["_text"] = sanitizer._sanitize_str
+        self._namespace["_scan"] = partial(_scan, sanitizer)
+
+    def generate(self, shape: Shape) -> Callable[[Any], Any]:
+        """Compiles the function sanitizing the data of the shape."""
+        sanitizer = self.sanitizer
+        name = self._function(shape, sanitizer._keys.root, 1)
+        if name is None:
+            return sanitizer.sanitize
+        source = "\n".join(self._lines)
+        exec(compile(source, "<sanitary schema>", "exec"), self._namespace)  # noqa: S102
+        return self._namespace[name]
+
+    def _constant(self, value: Any) -> str:
+        name = self._constants.get(id(value))
+        if name is None:
+            name = self._constants[id(value)] = f"_constant_{next(self._ids)}"
+            self._namespace[name] = value
+        return name
+
+    def _function(self, shape: Shape, key_state: KeyState, depth: int) -> str | None:
+        """Generates the function sanitizing a container, if it can be specialized."""
+        max_depth = self.sanitizer.max_depth
+        if max_depth is not None and max_depth < depth:
+            return None
+        if isinstance(shape, ArrayShape) and self._fast_types[list]:
+            return self._array_function(shape, key_state, depth)
+        if isinstance(shape, ObjectShape) and self._is_fast_object(shape):
+            return self._object_function(shape, key_state, depth)
+        return None
+
+    def _is_fast_object(self, shape: ObjectShape) -> bool:
+        if shape.record_type is None:
+            return self._fast_types[dict]
+        handler = self.sanitizer._dispatch.resolve(shape.record_type)
+        return (
+            isinstance(handler, partial)
+            and handler.func == self.sanitizer._sanitize_record
+            and handler.args[0].fields == tuple(shape.fields)
+        )
+
+    def _value(self, shape: Shape, key_state: KeyState, depth: int, variable: str) -> str:
+        """Generates the expression sanitizing the value of a variable."""
+        fallback = f"_nested({variable}, {self._constant(key_state)}, {depth})"
+        if shape == TEXT and self._fast_types[TEXT]:
+            if not self._scan:
+                return f"{variable} if type({variable}) is str else {fallback}"
+            if self._text == "_text":
+                return f"_text({variable}) if type({variable}) is str else {fallback}"
+            return (
+                f"_scan({variable}, {self._constant(key_state)}, {depth}) "
+                f"if type({variable}) is str else {fallback}"
+            )
+        if shape == SCALAR and self._fast_types[SCALAR]:
+            return f"{variable} if type({variable}) in _scalars else {fallback}"
+        if isinstance(shape, ArrayShape | ObjectShape):
+            function = self._function(shape, key_state, depth)
+            if function is not None:
+                return f"{function}({variable})"
+        return fallback
+
+    def _array_function(self, shape: ArrayShape, key_state: KeyState, depth: int) -> str:
+        name = f"_array_{next(self._ids)}"
+        item = self._value(shape.items, key_state, depth + 1, "item")
+        lines = [
+            f"def {name}(data):",
+            "    if type(data) is not list:",
+            f"        return _nested(data, {self._constant(key_state)}, {depth})",
+            f"    cleaned = [{item} for item in data]",
+        ]
+        copy_mode = self.sanitizer.copy_mode
+        if copy_mode is CopyMode.ON_WRITE:
+            lines.append("    if all(map(_is, cleaned, data)):")
+            lines.append("        return data")
+        elif copy_mode is CopyMode.IN_PLACE:
+            lines.append("    data[:] = cleaned")
+            lines.append("    return data")
+        lines.append("    return cleaned")
+        self._lines.extend(lines)
+        return name
+
+    def _object_function(self, shape: ObjectShape, key_state: KeyState, depth: int) -> str:
+        name = f"_object_{next(self._ids)}"
+        fallback = f"_nested(data, {self._constant(key_state)}, {depth})"
+        lines = [f"def {name}(data):"]
+        if shape.record_type is None:
+            lines += [
+                "    if type(data) is not dict:",
+                f"        return {fallback}",
+                f"    if tuple(data) != {tuple(shape.fields)!r}:",
+                f"        return {fallback}",
+            ]
+            lines += (
+                f"    value_{index} = data[{key!r}]" for index, key in enumerate(shape.fields)
+            )
+        else:
+            lines += [
+                f"    if type(data) is not {self._constant(shape.record_type)}:",
+                f"        return {fallback}",
+                "    try:",
+                *(
+                    f"        value_{index} = data.{key}"
+                    for index, key in enumerate(shape.fields)
+                ),
+                "    except AttributeError:",
+                f"        return {fallback}",
+            ]
+        decide = self.sanitizer._keys.decide
+        for index, (key, field_shape) in enumerate(shape.fields.items()):
+            rule, field_state = decide(key_state, key)
+            if rule is None:
+                value = self._value(field_shape, field_state, depth + 1, f"value_{index}")
+            elif self.sanitizer._replace_text is None:
+                value = "_replacement"
+            else:
+                value = f"_replace(value_{index})"
+            lines.append(f"    cleaned_{index} = {value}")
+        lines += self._object_result(shape)
+        self._lines.extend(lines)
+        return name
+
+    def _object_result(self, shape: ObjectShape) -> list[str]:
+        cleaned = ", ".join(
+            f"{key!r}: cleaned_{index}" for index, key in enumerate(shape.fields)
+        )
+        copy_mode = self.sanitizer.copy_mode
+        lines: list[str] = []
+        if shape.record_type is None and copy_mode is CopyMode.IN_PLACE:
+            lines += (
+                f"    data[{key!r}] = cleaned_{index}" for index, key in enumerate(shape.fields)
+            )
+            lines.append("    return data")
+        elif shape.record_type is None and copy_mode is CopyMode.ON_WRITE:
+            unchanged = " and ".join(
+                f"cleaned_{index} is value_{index}" for index in range(len(shape.fields))
+            )
+            lines.append(f"    if {unchanged or 'True'}:")
+            lines.append("        return data")
+        # dataclasses are always sanitized into dicts of their fields
+        lines.append(f"    return {{{cleaned}}}")
+        return lines
+
+
+def _scan(sanitizer: Sanitizer, value: str, key_state: KeyState, depth: int) -> Any:
+    """Sanitizes a text value, which might be an embedded JSON document."""
+    cleaned = sanitizer._sanitize_str(value)
+    if not is_frame(cleaned):
+        return cleaned
+    if sanitizer.max_depth is not None and sanitizer.max_depth < depth:
+        return sanitizer._exceed_depth(cleaned)
+    return sanitizer._walk(cleaned, value, key_state, depth)
@@ -0,0 +1,65 @@
+"""Compiled configuration of sanitizers, for creating them without recompiling."""
+
+from __future__ import annotations
+
+import os
+import pickle
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .keys import KeyMatcher
+from .matching import CompiledPatterns
+
+
+class SanitizerSpec(NamedTuple):
+    """
+    Compiled, immutable configuration of a sanitizer.
+
+    Holds the sensitive keys compiled into a trie and the sensitive patterns with
+    their literal prefixes, so that sanitizers created from the spec using
+    `Sanitizer.from_spec` skip analyzing them. The spec can be pickled,
+    e.g. to pass it to worker processes, or saved to a cache file using `dump` and
+    loaded using `load`. Regular expressions are compiled by the `re` module when
+    the spec is loaded, which caches them for the lifetime of the process.
+
+    Attributes:
+        keys: The compiled sensitive keys.
+        patterns: The compiled sensitive patterns.
+        options: The remaining arguments of the sanitizer.
+    """
+
+    keys: KeyMatcher
+    patterns: CompiledPatterns
+    options: tuple[tuple[str, Any], ...]
+
+    def dump(self, path: str | os.PathLike[str]) -> None:
+        """
+        Saves the spec to a file, e.g. a cache shared by short-lived processes.
+
+        All the options, such as custom replacement callables, need to be picklable.
+
+        Args:
+            path: Path of the file.
+        """
+        Path(path).write_bytes(pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> SanitizerSpec:
+        """
+        Loads a spec saved by `dump`.
+
+        As with any pickled data, only files from trusted sources should be loaded.
+
+        Args:
+            path: Path of the file.
+
+        Returns:
+            The spec.
+
+        Raises:
+            TypeError: If the file doesn't contain a spec.
+        """
+        spec = pickle.loads(Path(path).read_bytes())  # noqa: S301
+        if not isinstance(spec, cls):
+            raise TypeError(f"{path} doesn't contain a sanitizer spec")  # noqa: TRY003
+        return spec
@@ -0,0 +1,216 @@
+"""Counters and timings of the sanitization, collected on demand."""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterator
+from re import Pattern
+from time import perf_counter
+from typing import Any
+
+from .dispatch import Handler
+from .matching import PatternMatcher
+
+
+class SanitizerStats:
+    """
+    Statistics of sanitizing data.
+
+    Attributes:
+        calls: Number of sanitized data items, i.e. calls of `Sanitizer.sanitize`.
+        nodes: Numbers of visited values, by the names of their types.
+        keys: Numbers of values replaced due to sensitive keys, by the matching key rules.
+        patterns: Numbers of text values, or spans of text, matching the sensitive
+                  patterns, by the patterns or the names of the detectors.
+        json_decodes: Number of attempts to decode embedded JSON.
+        json_failures: Number of text values which weren't valid JSON after all.
+        cache_hits: Number of replacements and sanitized text values found in the caches.
+        total_time: Seconds spent in sanitizing.
+        scan_time: Seconds spent in searching text values for the sensitive patterns.
+    """
+
+    __slots__ = (
+        "cache_hits",
+        "calls",
+        "json_decodes",
+        "json_failures",
+        "keys",
+        "nodes",
+        "patterns",
+        "scan_time",
+        "total_time",
+    )
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.nodes: Counter[str] = Counter()
+        self.keys: Counter[str] = Counter()
+        self.patterns: Counter[str | bytes] = Counter()
+        self.json_decodes = 0
+        self.json_failures = 0
+        self.cache_hits = 0
+        self.total_time = 0.0
+        self.scan_time = 0.0
+
+    @property
+    def traversal_time(self) -> float:
+        """Seconds spent in sanitizing, other than searching for the patterns."""
+        return self.total_time - self.scan_time
+
+    def update(self, other: SanitizerStats) -> None:
+        """
+        Adds other statistics to these.
+
+        Args:
+            other: The statistics to add.
+        """
+        self.calls += other.calls
+        self.nodes.update(other.nodes)
+        self.keys.update(other.keys)
+        self.patterns.update(other.patterns)
+        self.json_decodes += other.json_decodes
+        self.json_failures += other.json_failures
+        self.cache_hits += other.cache_hits
+        self.total_time += other.total_time
+        self.scan_time += other.scan_time
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Converts the statistics to plain data, e.g. for exporting them as metrics.
+
+        Returns:
+            The statistics, including the traversal time.
+        """
+        return {
+            "calls": self.calls,
+            "nodes": dict(self.nodes),
+            "keys": dict(self.keys),
+            "patterns": dict(self.patterns),
+            "json_decodes": self.json_decodes,
+            "json_failures": self.json_failures,
+            "cache_hits": self.cache_hits,
+            "total_time": self.total_time,
+            "scan_time": self.scan_time,
+            "traversal_time": self.traversal_time,
+        }
+
+
+StatsCallback = Callable[[SanitizerStats], Any]
+
+
+class Recorder(threading.local):
+    """
+    Holds the statistics of the current sanitizing call in each thread.
+
+    Provides the wrappers which instrument the parts of the sanitizer, so that
+    the parts are not affected at all when the statistics are not collected.
+
+    Attributes:
+        stats: Statistics of the current call, or `None` outside of it.
+    """
+
+    stats: SanitizerStats | None = None
+
+    def handler(self, data_type: type, handler: Handler) -> Handler:
+        """
+        Wraps a value handler, counting the visited values.
+
+        Args:
+            data_type: The type of values.
+            handler: The handler of the values.
+
+        Returns:
+            The wrapped handler.
+        """
+        name = data_type.__name__
+
+        def record(data: Any) -> Any:
+            self.stats.nodes[name] += 1  # type: ignore[union-attr]
+            return handler(data)
+
+        return record
+
+    def decoder(self, decoder: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        """
+        Wraps a JSON decoder, counting the decoding attempts and failures.
+
+        Args:
+            decoder: The decoder.
+
+        Returns:
+            The wrapped decoder.
+        """
+
+        def record(data: Any) -> Any:
+            stats: Any = self.stats
+            stats.json_decodes += 1
+            try:
+                return decoder(data)
+            except ValueError:
+                stats.json_failures += 1
+                raise
+
+        return record
+
+    def key(self, rule: str) -> None:
+        """
+        Counts a value replaced due to a sensitive key.
+
+        Args:
+            rule: The rule matching the key.
+        """
+        self.stats.keys[rule] += 1  # type: ignore[union-attr]
+
+
+class RecordingMatcher:
+    """
+    Pattern matcher counting the matches and measuring the time of the search.
+
+    Args:
+        matcher: The instrumented matcher.
+        recorder: The recorder of the statistics.
+    """
+
+    def __init__(self, matcher: PatternMatcher, recorder: Recorder):
+        self.matcher = matcher
+        self.patterns = matcher.patterns
+        self.labels = matcher.labels
+        self.max_length = matcher.max_length
+        self._recorder = recorder
+
+    def __bool__(self) -> bool:
+        return bool(self.matcher)
+
+    def search(self, text: Any) -> Pattern[Any] | None:
+        """Finds a pattern matching the text."""
+        stats: Any = self._recorder.stats
+        start = perf_counter()
+        pattern = self.matcher.search(text)
+        stats.scan_time += perf_counter() - start
+        if pattern is not None:
+            stats.patterns[self.labels.get(pattern, pattern.pattern)] += 1
+        return pattern
+
+    def sub(self, replace: Callable[[Pattern[Any], Any], Any], text: Any) -> Any:
+        """Replaces all matches of the patterns within the text."""
+        stats: Any = self._recorder.stats
+
+        def record(pattern: Pattern[Any], matched: Any) -> Any:
+            stats.patterns[self.labels.get(pattern, pattern.pattern)] += 1
+            return replace(pattern, matched)
+
+        start = perf_counter()
+        result = self.matcher.sub(record, text)
+        stats.scan_time += perf_counter() - start
+        return result
+
+    def spans(self, text: Any, start: int = 0) -> Iterator[tuple[Pattern[Any], int, int]]:
+        """Finds all matches of the patterns within the text."""
+        stats: Any = self._recorder.stats
+        started = perf_counter()
+        spans = list(self.matcher.spans(text, start))
+        stats.scan_time += perf_counter() - started
+        for pattern, _, _ in spans:
+            stats.patterns[self.labels.get(pattern, pattern.pattern)] += 1
+        return iter(spans)
@@ -0,0 +1,149 @@
+"""Integration with the standard library `logging` module."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from typing import Any
+from weakref import WeakSet
+
+from . import Sanitizer
+from .embedded_json import encode
+
+# attribute of the sanitizer holding the records it has already sanitized
+_SANITIZED = "_sanitized_records"
+
+# messages sanitized by their content, rather than by their text; other objects, e.g.
+# exceptions or lazily formatted messages, are sanitized as their text
+_CONTAINERS = (Mapping, list, tuple, set, frozenset)
+_RECORD_ATTRIBUTES = frozenset(
+    {*vars(logging.makeLogRecord({})), "message", "asctime", "taskName"}
+)
+
+
+def sanitize_record(sanitizer: Sanitizer, record: logging.LogRecord) -> logging.LogRecord:
+    """
+    Sanitizes a log record in place, unless it has already been sanitized.
+
+    The message is merged with its arguments before sanitizing, so that the patterns
+    can match across both; a message which is a container, e.g. a dict, and arguments
+    passed as a mapping are sanitized beforehand, so that their sensitive keys are
+    replaced too. The extra attributes of the record are sanitized as a dict, so
+    that their names can match the sensitive keys; the attributes omitted due to
+    exceeded limits are removed from the record. The sanitized records are
+    remembered by the sanitizer, without keeping them alive.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        record: The log record.
+
+    Returns:
+        The same log record.
+    """
+    sanitized = _sanitized_records(sanitizer)
+    if record in sanitized:
+        return record
+    if isinstance(record.msg, _CONTAINERS):
+        record.msg = sanitizer.sanitize(record.msg)
+    if isinstance(record.args, Mapping):
+        record.args = sanitizer.sanitize(record.args)
+    try:
+        message = record.getMessage()
+    except (TypeError, ValueError):
+        # the sanitized arguments might not match the format anymore
+        message = f"{record.msg} {record.args}"
+    cleaned = sanitizer.sanitize(message)
+    record.msg = (
+        cleaned if isinstance(cleaned, str) else encode(cleaned, sanitizer.json_encoder)
+    )
+    record.args = None
+    extra = {
+        name: value for name, value in vars(record).items() if name not in _RECORD_ATTRIBUTES
+    }
+    if extra:
+        cleaned_extra = sanitizer.sanitize(extra)
+        if not isinstance(cleaned_extra, Mapping):
+            # the attributes are nested too deep, and replaced with the marker
+            cleaned_extra = dict.fromkeys(extra, cleaned_extra)
+        for name in extra:
+            if name in cleaned_extra:
+                vars(record)[name] = cleaned_extra[name]
+            else:
+                # omitted due to exceeded limits
+                del vars(record)[name]
+    sanitized.add(record)
+    return record
+
+
+def _sanitized_records(sanitizer: Sanitizer) -> WeakSet[logging.LogRecord]:
+    records = getattr(sanitizer, _SANITIZED, None)
+    if records is None:
+        records = WeakSet()
+        setattr(sanitizer, _SANITIZED, records)
+    return records
+
+
+class SanitizingFilter(Sanitizer, logging.Filter):
+    """
+    Logging filter sanitizing the log records.
+
+    The filter should be added to the handlers rather than to the loggers, so that
+    it processes only the records which pass the level of the handler, and which
+    are therefore going to be emitted; for the same reason, it should be the last
+    of the filters of the handler. Each record is sanitized only once, even if it's
+    emitted by several handlers with the same filter.
+
+    Args:
+        options: Arguments of the `Sanitizer` class.
+    """
+
+    def __init__(self, **options: Any):
+        super().__init__(**options)
+        logging.Filter.__init__(self)
+        _sanitized_records(self)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Sanitizes the log record in place.
+
+        Args:
+            record: The log record.
+
+        Returns:
+            Always `True`, as no records are dropped.
+        """
+        sanitize_record(self, record)
+        return True
+
+
+class SanitizingFormatter(logging.Formatter):
+    """
+    Logging formatter sanitizing the log records before formatting them.
+
+    As formatting happens only for the records which are emitted, no work is done
+    for records dropped due to their level or by the filters. Each record is
+    sanitized only once, even if it's formatted by several handlers using the same
+    sanitizer.
+
+    Args:
+        args: Arguments of the `logging.Formatter` class, e.g. the format string.
+        sanitizer: The sanitizer to use.
+        kwargs: Keyword arguments of the `logging.Formatter` class.
+    """
+
+    def __init__(self, *args: Any, sanitizer: Sanitizer, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.sanitizer = sanitizer
+        _sanitized_records(sanitizer)
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Sanitizes the log record in place, and formats it.
+
+        Args:
+            record: The log record.
+
+        Returns:
+            The formatted record.
+        """
+        return super().format(sanitize_record(self.sanitizer, record))
@@ -0,0 +1,329 @@
+"""Sanitizing of JSON data streams, without loading them into memory."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import ExitStack
+from enum import Enum
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, TextIO
+
+from .embedded_json import encode
+from .stats import RecordingMatcher
+
+if TYPE_CHECKING:
+    from . import Sanitizer
+
+CHUNK_SIZE = 64 * 1024
+FILE_CHUNK_SIZE = 1024 * 1024
+MAX_MATCH_LENGTH = 4096
+
+_WHITESPACE = " \t\n\r"
+_NUMBERS = (int, float)
+_NUMBER_CONTINUATIONS = ".eE+-"
+_NUMBER_TAIL = 2
+
+
+class StreamFormat(str, Enum):
+    """
+    Formats of sanitized data streams.
+
+    Attributes:
+        NDJSON: Newline-delimited JSON, with one JSON document per line; lines that
+                aren't valid JSON are sanitized as text.
+        JSON: A single JSON document; if it's an array, its items are read and
+              sanitized one by one.
+        TEXT: Plain text, in which the spans matching the patterns are replaced;
+              handled by `redact_file` rather than `sanitize_stream`.
+    """
+
+    NDJSON = "ndjson"
+    JSON = "json"
+    TEXT = "text"
+
+
+def sanitize_ndjson(sanitizer: Sanitizer, lines: Iterable[str]) -> Iterator[str]:
+    """
+    Sanitizes lines of newline-delimited JSON.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        lines: The lines to sanitize, e.g. an open text file.
+
+    Yields:
+        Sanitized lines, without the trailing newline. Empty lines are skipped.
+    """
+    for raw_line in lines:
+        line = raw_line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        try:
+            record = sanitizer.json_decoder(line)
+        except ValueError:
+            sanitized = sanitizer.sanitize(line)
+            yield (
+                sanitized
+                if isinstance(sanitized, str)
+                else encode(sanitized, sanitizer.json_encoder)
+            )
+        else:
+            yield encode(sanitizer.sanitize(record), sanitizer.json_encoder)
+
+
+def iter_json_array(stream: TextIO, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Incrementally decodes the items of a JSON array.
+
+    Only a single item is held in memory at any time.
+
+    Args:
+        stream: Text stream containing a JSON array.
+        chunk_size: Number of characters to read from the stream at once.
+
+    Yields:
+        Decoded items of the array.
+
+    Raises:
+        json.JSONDecodeError: If the stream doesn't contain a valid JSON array.
+    """
+    reader = _ChunkReader(stream, chunk_size)
+    if reader.skip_whitespace() != "[":
+        raise json.JSONDecodeError("Expecting '['", reader.buffer, reader.position)  # noqa: TRY003
+    yield from _iter_items(reader)
+
+
+def sanitize_stream(
+    sanitizer: Sanitizer,
+    source: TextIO,
+    target: TextIO,
+    stream_format: StreamFormat | str = StreamFormat.NDJSON,
+) -> None:
+    """
+    Sanitizes a stream of JSON data, writing the result incrementally.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        source: Text stream to read from.
+        target: Text stream to write the sanitized data to.
+        stream_format: Format of the data; see `StreamFormat`.
+
+    Raises:
+        ValueError: If the format is plain text, which is redacted using `redact_file`.
+    """
+    stream_format = StreamFormat(stream_format)
+    if stream_format is StreamFormat.TEXT:
+        raise ValueError("Plain text is redacted using redact_file")  # noqa: TRY003
+    if stream_format is StreamFormat.NDJSON:
+        for line in sanitize_ndjson(sanitizer, source):
+            target.write(line)
+            target.write("\n")
+        return
+    reader = _ChunkReader(source, CHUNK_SIZE)
+    if reader.skip_whitespace() != "[":
+        document = sanitizer.sanitize(json.loads(reader.read_all()))
+        target.write(encode(document, sanitizer.json_encoder))
+        target.write("\n")
+        return
+    separator = "["
+    for item in _iter_items(reader):
+        target.write(separator)
+        target.write(encode(sanitizer.sanitize(item), sanitizer.json_encoder))
+        separator = ",\n"
+    target.write("[]\n" if separator == "[" else "]\n")
+
+
+def redact_file(
+    sanitizer: Sanitizer,
+    source: str | os.PathLike[str] | BinaryIO,
+    target: BinaryIO,
+    *,
+    chunk_size: int = FILE_CHUNK_SIZE,
+    max_match_length: int = MAX_MATCH_LENGTH,
+) -> None:
+    """
+    Replaces the spans of a plain text file matching the patterns, in constant memory.
+
+    The file is memory-mapped if possible, or otherwise read in chunks, and scanned
+    for the patterns without decoding it, like binary values. Consecutive chunks
+    overlap by the maximum length of a match of the patterns, so that matches
+    crossing the chunk boundaries are found too; for patterns without a maximum
+    length, e.g. those using `+` or `*`, the overlap is `max_match_length`, and
+    longer matches crossing the boundaries might be cut short. Lookbehind assertions
+    can see up to `max_match_length` bytes preceding each chunk. The matching spans
+    are always replaced, regardless of the `redaction` of the sanitizer.
+
+    Args:
+        sanitizer: The sanitizer to use.
+        source: Path of the file to redact, or a binary stream to read it from.
+        target: Binary stream to write the redacted text to.
+        chunk_size: Number of bytes to scan at once; at least the overlap is scanned.
+        max_match_length: Maximum length of a match of the patterns without one.
+    """
+    with ExitStack() as stack:
+        if isinstance(source, str | os.PathLike):
+            source = stack.enter_context(Path(source).open("rb"))
+        window = _mapped_window(source, stack) or _StreamWindow(source)
+        _redact(sanitizer, window, target.write, chunk_size, max_match_length)
+
+
+def _mapped_window(
+    source: BinaryIO, stack: ExitStack
+) -> Callable[[int, int], memoryview] | None:
+    try:
+        mapped = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # not a regular file, e.g. a pipe, or an empty file which can't be mapped
+        return None
+    stack.callback(mapped.close)
+    view = stack.enter_context(memoryview(mapped))
+
+    def window(start: int, end: int) -> memoryview:
+        return view[start:end]
+
+    return window
+
+
+class _StreamWindow:
+    """Keeps the part of a stream which is still needed, for streams that can't be mapped."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.buffer = b""
+        self.offset = 0
+
+    def __call__(self, start: int, end: int) -> bytes:
+        self.buffer = self.buffer[start - self.offset :]
+        self.offset = start
+        while len(self.buffer) < end - start:
+            chunk = self.stream.read(end - start - len(self.buffer))
+            if not chunk:
+                break
+            self.buffer += chunk
+        return self.buffer[: end - start]
+
+
+def _redact(
+    sanitizer: Sanitizer,
+    window: Callable[[int, int], Any],
+    write: Callable[[Any], Any],
+    chunk_size: int,
+    max_match_length: int,
+) -> None:
+    matcher = sanitizer._binary_matcher
+    if isinstance(matcher, RecordingMatcher):
+        matcher = matcher.matcher
+    overlap = matcher.max_length
+    if overlap is None or overlap > max_match_length:
+        overlap = max_match_length
+    # the chunks must not be shorter than the overlap, so that the windows never move back
+    chunk_size = max(chunk_size, overlap, 1)
+    replace = sanitizer._replace_binary_span
+    position = 0
+    while True:
+        # the text preceding the chunk is visible to lookbehind assertions, but not scanned
+        context = min(position, max_match_length)
+        data = window(position - context, position + chunk_size + overlap)
+        final = len(data) - context < chunk_size + overlap
+        # matches starting in the overlap are left to the next chunk
+        limit = len(data) if final else context + chunk_size
+        written = context
+        spans = sorted(matcher.spans(data, context), key=itemgetter(1))
+        for pattern, start, end in spans:
+            if start >= limit:
+                break
+            if start < written or start == end:
+                continue
+            write(data[written:start])
+            write(replace(pattern, data[start:end]))
+            written = end
+        if written < limit:
+            write(data[written:limit])
+            written = limit
+        if final:
+            return
+        position += written - context
+
+
+def _iter_items(reader: _ChunkReader) -> Iterator[Any]:
+    decoder = json.JSONDecoder()
+    reader.position += 1
+    if reader.skip_whitespace() == "]":
+        reader.position += 1
+        return
+    while True:
+        reader.skip_whitespace()
+        yield reader.decode(decoder)
+        char = reader.skip_whitespace()
+        if char == "]":
+            return
+        if char != ",":
+            raise json.JSONDecodeError(  # noqa: TRY003
+                "Expecting ',' delimiter", reader.buffer, reader.position
+            )
+        reader.position += 1
+
+
+class _ChunkReader:
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.exhausted = False
+
+    def read_more(self, size: int) -> bool:
+        if self.exhausted:
+            return False
+        chunk = self.stream.read(size)
+        if not chunk:
+            self.exhausted = True
+            return False
+        # discard the already consumed part of the buffer
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def read_all(self) -> str:
+        self.buffer = self.buffer[self.position :] + self.stream.read()
+        self.position = 0
+        self.exhausted = True
+        return self.buffer
+
+    def skip_whitespace(self) -> str:
+        while True:
+            while (
+                self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE
+            ):
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.read_more(self.chunk_size):
+                return ""
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        size = self.chunk_size
+        while True:
+            try:
+                item, end = decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if not self.read_more(size):
+                    raise
+            else:
+                if not self.might_continue(item, end) or not self.read_more(size):
+                    self.position = end
+                    return item
+            # avoid decoding large items over and over again
+            size *= 2
+
+    def might_continue(self, item: Any, end: int) -> bool:
+        # a number cut off by the end of the buffer is decoded without the rest, e.g.
+        # `-1.` as `-1`, leaving at most the two characters of an incomplete exponent
+        return (
+            type(item) in _NUMBERS
+            and len(self.buffer) - end <= _NUMBER_TAIL
+            and not self.buffer[end:].strip(_NUMBER_CONTINUATIONS)
+        )
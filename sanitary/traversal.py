@@ -0,0 +1,280 @@
+"""Frames of the iterative traversal of nested data structures."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Iterator
+from enum import Enum
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from .copying import CopyMode
+
+if TYPE_CHECKING:
+    from .keys import KeyState
+
+
+# whether the objects of each type are frames, as checks of the abstract class are slow
+_FRAME_TYPES: dict[type, bool] = {}
+
+
+class LimitAction(str, Enum):
+    """
+    Handling of values exceeding the traversal limits.
+
+    Attributes:
+        MARKER: Values over the limits are replaced with a marker text.
+        TRUNCATE: Texts are truncated to the maximum length, containers nested too
+                  deep are replaced with empty containers, and the content of the
+                  containers is omitted after the maximum number of values is reached.
+    """
+
+    MARKER = "marker"
+    TRUNCATE = "truncate"
+
+
+class Frame(ABC):
+    """
+    A container being traversed.
+
+    The traversal iterates over the `items` of the frame, and passes the sanitized
+    value of each item to `set`; once all the items are processed, `finish` returns
+    the sanitized container.
+
+    Attributes:
+        items: Iterator over key-value pairs of the container content.
+        keyed: Whether the keys of the items are mapping keys.
+        depth: Nesting level of the container, set by the traversal.
+        key: Key of the container within its parent, set by the traversal.
+        original: The container within its parent, set by the traversal.
+        key_state: Position of the container relative to the sensitive key paths, set
+                   by the traversal.
+    """
+
+    __slots__ = ("count", "depth", "items", "key", "key_state", "keyed", "original")
+
+    def __init__(self, items: Iterator[tuple[Any, Any]], keyed: bool = False):
+        self.items = items
+        self.keyed = keyed
+        self.count = 0
+        self.depth = 0
+        self.key: Any = None
+        self.original: Any = None
+        self.key_state: KeyState = None  # type: ignore[assignment]
+
+    @abstractmethod
+    def set(self, key: Any, original: Any, cleaned: Any) -> None:
+        """
+        Stores the sanitized value of an item.
+
+        Args:
+            key: The key of the item.
+            original: The original value.
+            cleaned: The sanitized value.
+        """
+
+    @abstractmethod
+    def finish(self, truncated: bool = False) -> Any:
+        """
+        Produces the sanitized container.
+
+        Args:
+            truncated: Whether the items not passed to `set` should be omitted.
+
+        Returns:
+            The sanitized container.
+        """
+
+
+def is_frame(value: Any) -> bool:
+    """
+    Checks whether a value returned by a handler is a frame to be traversed.
+
+    Args:
+        value: The value.
+
+    Returns:
+        Whether the value is a `Frame`; the result is cached for each type.
+    """
+    try:
+        return _FRAME_TYPES[type(value)]
+    except KeyError:
+        result = _FRAME_TYPES[type(value)] = isinstance(value, Frame)
+        return result
+
+
+class MappingFrame(Frame):
+    """
+    A dict being traversed.
+
+    Args:
+        data: The dict.
+        copy_mode: How to produce the sanitized dict.
+    """
+
+    __slots__ = ("cleaned", "copy_mode", "source")
+
+    def __init__(self, data: dict, copy_mode: CopyMode):
+        super().__init__(iter(data.items()), keyed=True)
+        self.source = data
+        self.copy_mode = copy_mode
+        self.cleaned: dict | None = None
+        if copy_mode is CopyMode.ALWAYS:
+            self.cleaned = {}
+        elif copy_mode is CopyMode.IN_PLACE:
+            self.cleaned = data
+
+    def set(self, key: Any, original: Any, cleaned: Any) -> None:
+        """Stores the sanitized value of an item."""
+        self.count += 1
+        if self.copy_mode is CopyMode.ALWAYS:
+            self.cleaned[key] = cleaned  # type: ignore[index]
+        elif cleaned is not original:
+            if self.cleaned is None:
+                self.cleaned = dict(self.source)
+            self.cleaned[key] = cleaned
+
+    def finish(self, truncated: bool = False) -> Any:
+        """Produces the sanitized container."""
+        cleaned = self.source if self.cleaned is None else self.cleaned
+        if not truncated or self.copy_mode is CopyMode.ALWAYS:
+            return cleaned
+        if cleaned is self.source and self.copy_mode is CopyMode.IN_PLACE:
+            for key in list(islice(cleaned, self.count, None)):
+                del cleaned[key]
+            return cleaned
+        return dict(islice(cleaned.items(), self.count))
+
+
+class SequenceFrame(Frame):
+    """
+    A list, tuple or set being traversed.
+
+    Args:
+        data: The sequence.
+        copy_mode: How to produce the sanitized sequence.
+    """
+
+    __slots__ = ("cleaned", "copy_mode", "source")
+
+    def __init__(self, data: Any, copy_mode: CopyMode):
+        super().__init__(enumerate(data))
+        self.source = data
+        self.copy_mode = copy_mode
+        self.cleaned: list | None = None
+        if copy_mode is CopyMode.ALWAYS:
+            self.cleaned = []
+        elif copy_mode is CopyMode.IN_PLACE and type(data) is list:
+            self.cleaned = data
+
+    def set(self, key: Any, original: Any, cleaned: Any) -> None:
+        """Stores the sanitized value of an item."""
+        self.count += 1
+        if self.copy_mode is CopyMode.ALWAYS:
+            self.cleaned.append(cleaned)  # type: ignore[union-attr]
+        elif cleaned is not original:
+            if self.cleaned is None:
+                self.cleaned = list(self.source)
+            self.cleaned[key] = cleaned
+
+    def finish(self, truncated: bool = False) -> Any:
+        """Produces the sanitized container."""
+        cleaned = self.cleaned
+        if self.copy_mode is CopyMode.ALWAYS:
+            return cleaned
+        if truncated:
+            if cleaned is None:
+                cleaned = list(islice(self.source, self.count))
+            else:
+                del cleaned[self.count :]
+        if cleaned is None:
+            return self.source
+        return _convert(cleaned, self.source)
+
+
+class RecordFrame(Frame):
+    """
+    An object being traversed by its fields, e.g. a dataclass or a named tuple.
+
+    Args:
+        data: The object.
+        items: Iterator over the names and values of the fields.
+        rebuild: Callable creating the sanitized object from the sanitized values of
+                 all the fields; if `None`, the sanitized object is a dict of the fields.
+        copy_mode: How to produce the sanitized object, if it's rebuilt.
+    """
+
+    __slots__ = ("changed", "cleaned", "copy_mode", "rebuild", "source")
+
+    def __init__(
+        self,
+        data: Any,
+        items: Iterator[tuple[str, Any]],
+        rebuild: Callable[[Iterable[Any]], Any] | None,
+        copy_mode: CopyMode,
+    ):
+        super().__init__(items, keyed=True)
+        self.source = data
+        self.rebuild = rebuild
+        self.copy_mode = copy_mode
+        self.cleaned: dict[str, Any] = {}
+        self.changed = False
+
+    def set(self, key: Any, original: Any, cleaned: Any) -> None:
+        """Stores the sanitized value of an item."""
+        self.count += 1
+        self.cleaned[key] = cleaned
+        self.changed = self.changed or cleaned is not original
+
+    def finish(self, truncated: bool = False) -> Any:
+        """Produces the sanitized container."""
+        if self.rebuild is None:
+            return self.cleaned
+        if truncated:
+            # the object can't be created without all of its fields
+            return tuple(self.cleaned.values())
+        if not self.changed and self.copy_mode is not CopyMode.ALWAYS:
+            return self.source
+        return self.rebuild(self.cleaned.values())
+
+
+def _convert(cleaned: list, source: Any) -> Any:
+    if isinstance(source, list):
+        return cleaned
+    if isinstance(source, tuple):
+        return tuple(cleaned)
+    try:
+        return frozenset(cleaned) if isinstance(source, frozenset) else set(cleaned)
+    except TypeError:
+        # sanitized values, such as decoded JSON, might not be hashable
+        return cleaned
+
+
+class ValueFrame(Frame):
+    """
+    A single value being traversed, e.g. a decoded embedded JSON document.
+
+    Args:
+        value: The value.
+        convert: Callable converting the sanitized value to the final result.
+        default: The result if the value is omitted due to truncation.
+    """
+
+    __slots__ = ("convert", "default", "result")
+
+    def __init__(self, value: Any, convert: Callable[[Any], Any] | None, default: Any):
+        super().__init__(iter(((None, value),)))
+        self.convert = convert
+        self.default = default
+        self.result: Any = None
+
+    def set(self, key: Any, original: Any, cleaned: Any) -> None:
+        """Stores the sanitized value of an item."""
+        self.count += 1
+        self.result = cleaned
+
+    def finish(self, truncated: bool = False) -> Any:
+        """Produces the sanitized container."""
+        if not self.count:
+            return self.default
+        return self.result if self.convert is None else self.convert(self.result)
@@ -0,0 +1,136 @@
+import json
+import threading
+
+import pytest
+import structlog
+
+from sanitary.background import BackgroundStructlogSanitizer, Backpressure
+
+SENSITIVE_KEYS = {"email", "card"}
+
+
+class ListLogger:
+    def __init__(self, release=None):
+        self.messages = []
+        self.threads = set()
+        self.release = release
+
+    def info(self, message):
+        thread = threading.current_thread().name
+        if self.release is not None and thread == "sanitary":
+            self.release.wait()
+        self.threads.add(thread)
+        self.messages.append(json.loads(message))
+
+    warning = info
+
+
+def _logger(wrapped, **options):
+    sanitizer = BackgroundStructlogSanitizer(
+        keys=SENSITIVE_KEYS, processors=[structlog.processors.JSONRenderer()], **options
+    )
+    return structlog.wrap_logger(wrapped, processors=[sanitizer]), sanitizer
+
+
+def test_events_are_sanitized_and_emitted_in_background():
+    wrapped = ListLogger()
+    logger, sanitizer = _logger(wrapped)
+
+    logger.info("login", request={"email": "user@domain.xyz", "path": "/"})
+    logger.warning("failure", card="4111")
+    assert sanitizer.flush(timeout=5)
+
+    assert wrapped.messages == [
+        {"event": "login", "request": {"email": "********", "path": "/"}},
+        {"event": "failure", "card": "********"},
+    ]
+    assert wrapped.threads == {"sanitary"}
+    sanitizer.close()
+
+
+def test_events_are_dropped_when_queue_is_full():
+    release = threading.Event()
+    wrapped = ListLogger(release)
+    logger, sanitizer = _logger(wrapped, queue_size=1, backpressure="drop")
+
+    for index in range(10):
+        logger.info("event", index=index)
+    release.set()
+    sanitizer.close()
+
+    assert sanitizer.backpressure is Backpressure.DROP
+    assert sanitizer.dropped > 0
+    assert len(wrapped.messages) == 10 - sanitizer.dropped
+
+
+def test_dropped_events_dont_discard_the_caches():
+    release = threading.Event()
+    wrapped = ListLogger(release)
+    logger, sanitizer = _logger(
+        wrapped, queue_size=1, backpressure="drop", context_cache_size=16, text_cache_size=16
+    )
+    sanitizer.sanitize_event({"event": "login", "user": ["jane"]})
+    with pytest.raises(AttributeError):
+        sanitizer.dropped = 0
+
+    try:
+        for index in range(10):
+            logger.info("event", index=index)
+        cache_sizes = (len(sanitizer._context_cache), sanitizer.text_cache_info().currsize)
+    finally:
+        release.set()
+        sanitizer.close()
+
+    assert sanitizer.dropped > 0
+    assert cache_sizes[0] > 0
+    assert cache_sizes[1] > 0
+
+
+def test_events_are_emitted_inline_when_queue_is_full():
+    release = threading.Event()
+    wrapped = ListLogger(release)
+    logger, sanitizer = _logger(wrapped, queue_size=1, backpressure="inline")
+
+    for index in range(20):
+        logger.info("event", index=index, card="4111")
+    release.set()
+    sanitizer.close()
+
+    assert "MainThread" in wrapped.threads
+    assert sorted(message["index"] for message in wrapped.messages) == list(range(20))
+    assert all(message["card"] == "********" for message in wrapped.messages)
+
+
+def test_queued_events_are_emitted_on_close():
+    wrapped = ListLogger()
+    logger, sanitizer = _logger(wrapped)
+
+    for index in range(100):
+        logger.info("event", index=index)
+    sanitizer.close()
+
+    assert [message["index"] for message in wrapped.messages] == list(range(100))
+
+
+def test_downstream_processor_can_drop_events():
+    def drop_debug(logger, name, event_dict):
+        if event_dict.get("debug"):
+            raise structlog.DropEvent
+        return event_dict
+
+    wrapped = ListLogger()
+    sanitizer = BackgroundStructlogSanitizer(
+        processors=[drop_debug, structlog.processors.JSONRenderer()]
+    )
+    logger = structlog.wrap_logger(wrapped, processors=[sanitizer])
+
+    logger.info("first", debug=True)
+    logger.info("second")
+    sanitizer.close()
+
+    assert wrapped.messages == [{"event": "second"}]
+
+
+def test_invalid_backpressure_is_rejected():
+    with pytest.raises(ValueError):
+        BackgroundStructlogSanitizer(backpressure="ignore")
@@ -0,0 +1,105 @@
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from sanitary import Sanitizer
+
+REPLACEMENT = "********"
+MESSAGE = "#### WARNING: Message replaced due to sensitive information."
+
+RECORDS = [
+    {
+        "id": index,
+        "email": f"user{index % 3}@example.com",
+        "note": "card 1234" if index % 2 else "nothing",
+        "profile": {"password": "secret", "tags": ["a", "b"]},
+        "payload": '{"token": "abc", "value": 1}',
+    }
+    for index in range(10)
+]
+
+
+@pytest.mark.parametrize(
+    "options",
+    (
+        {"keys": {"email", "password"}},
+        {"keys": {"email", "profile.password"}, "replacement": hashlib.sha256},
+        {"keys": {"token"}, "patterns": {r"\d{4}"}, "redaction": "spans"},
+        {"keys": {"re:^e"}, "embedded_json": "off", "patterns": {"card"}},
+        {"keys": {"tags"}, "max_depth": 2, "limit_action": "truncate"},
+        {"keys": {"email"}, "max_string_length": 5},
+        {"keys": {"email"}, "collect_stats": True},
+        {"keys": {"email"}, "max_nodes": 5},
+    ),
+)
+def test_batch_is_sanitized_like_separate_records(options):
+    sanitizer = Sanitizer(**options)
+
+    assert sanitizer.sanitize_batch(RECORDS) == [sanitizer.sanitize(row) for row in RECORDS]
+
+
+def test_columns_are_sanitized_as_lists():
+    sanitizer = Sanitizer(keys={"email"}, patterns={r"\d{4}"})
+
+    cleaned = sanitizer.sanitize_batch({"email": ("a@b.c", "d@e.f"), "note": ["1234", "ok"]})
+
+    assert cleaned == {"email": [REPLACEMENT, REPLACEMENT], "note": [MESSAGE, "ok"]}
+
+
+def test_records_with_different_keys():
+    sanitizer = Sanitizer(keys={"email"})
+
+    cleaned = sanitizer.sanitize_batch([{"email": "a@b.c"}, {"name": "jane"}, {}])
+
+    assert cleaned == [{"email": REPLACEMENT}, {"name": "jane"}, {}]
+
+
+def test_repeated_values_are_hashed_once():
+    sanitizer = Sanitizer(keys={"email"}, replacement=hashlib.sha256, replacement_cache_size=0)
+    records = [{"email": f"user{index % 2}@example.com"} for index in range(10)]
+
+    with patch.object(sanitizer, "_replace_text", wraps=sanitizer._replace_text) as replace:
+        cleaned = sanitizer.sanitize_batch(records)
+
+    assert replace.call_count == 2
+    assert cleaned[2] == {"email": hashlib.sha256(b"user0@example.com").hexdigest()}
+
+
+def test_repeated_texts_are_scanned_once():
+    sanitizer = Sanitizer(patterns={r"\d{4}"})
+    records = [{"note": "card 1234"}] * 10
+
+    with patch.object(sanitizer, "_matcher", wraps=sanitizer._matcher) as matcher:
+        sanitizer.sanitize_batch(records)
+
+    assert matcher.search.call_count == 1
+
+
+def test_equal_values_of_different_types_are_replaced_separately():
+    sanitizer = Sanitizer(keys={"value"}, replacement=str.upper)
+
+    cleaned = sanitizer.sanitize_batch([{"value": 1}, {"value": True}, {"value": [1]}])
+
+    assert cleaned == [{"value": "1"}, {"value": "TRUE"}, {"value": "[1]"}]
+
+
+@pytest.mark.parametrize("copy_mode", ("on_write", "in_place"))
+def test_unchanged_records_are_not_copied(copy_mode):
+    sanitizer = Sanitizer(keys={"email"}, copy_mode=copy_mode)
+    clean = {"name": "jane"}
+
+    assert sanitizer.sanitize_batch([clean])[0] is clean
+
+
+def test_records_are_modified_in_place():
+    sanitizer = Sanitizer(keys={"email"}, copy_mode="in_place")
+    record = {"email": "a@b.c"}
+
+    assert sanitizer.sanitize_batch([record])[0] is record
+    assert record == {"email": REPLACEMENT}
+
+
+def test_records_must_be_mappings():
+    with pytest.raises(TypeError):
+        Sanitizer().sanitize_batch([{"name": "jane"}, ["jane"]])
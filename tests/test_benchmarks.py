@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from benchmarks.__main__ import main
+from benchmarks.runner import Result, regressions
+from benchmarks.scenarios import SCENARIOS
+
+
+def test_scenario_names_are_unique():
+    assert len({scenario.name for scenario in SCENARIOS}) == len(SCENARIOS)
+
+
+def test_benchmarks_are_saved_and_compared(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+
+    exit_code = main(["-s", "structlog", "-n", "20", "-r", "1", "--save", str(baseline)])
+
+    assert exit_code == 0
+    assert set(json.loads(baseline.read_text())) == {"structlog-event"}
+    assert main(["-s", "structlog", "-n", "20", "-r", "1", "--compare", str(baseline)]) in {
+        0,
+        1,
+    }
+    assert "structlog-event" in capsys.readouterr().out
+
+
+def test_regressions_are_throughput_losses_over_threshold():
+    def result(throughput):
+        return Result(throughput=throughput, p50=1, p90=1, p99=1, allocated=0)
+
+    baseline = {"a": result(100), "b": result(100), "c": result(100)}
+    results = {"a": result(95), "b": result(80), "d": result(10)}
+
+    assert regressions(results, baseline, threshold=0.1) == {"b": pytest.approx(-0.2)}
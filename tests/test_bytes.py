@@ -0,0 +1,76 @@
+import hashlib
+
+import pytest
+
+from sanitary import KeyedHash, Sanitizer
+
+MESSAGE = "#### WARNING: Message replaced due to sensitive information."
+EMAIL = r"[\w.]+@[\w.]+"
+
+
+@pytest.mark.parametrize("data_type", (bytes, bytearray, memoryview))
+def test_binary_values_are_searched_without_decoding(data_type):
+    sanitizer = Sanitizer(patterns={EMAIL})
+
+    assert sanitizer.sanitize(data_type(b"mail jane@example.com")) == MESSAGE
+    clean = data_type(b"nothing to see")
+    assert sanitizer.sanitize(clean) is clean
+
+
+def test_binary_values_are_not_sanitized_as_their_representation():
+    sanitizer = Sanitizer(patterns={r"^b'"})
+
+    assert sanitizer.sanitize(b"body") == b"body"
+
+
+def test_spans_of_binary_values_are_replaced():
+    sanitizer = Sanitizer(patterns={EMAIL: "<email>", r"\d{4}": None}, redaction="spans")
+
+    cleaned = sanitizer.sanitize(memoryview(b"jane@example.com paid 1234"))
+
+    assert cleaned == b"<email> paid ********"
+
+
+def test_spans_of_binary_values_are_hashed_from_the_buffer():
+    sanitizer = Sanitizer(patterns={EMAIL}, replacement=hashlib.sha256, redaction="spans")
+
+    cleaned = sanitizer.sanitize(b"to jane@example.com")
+
+    assert cleaned == b"to " + hashlib.sha256(b"jane@example.com").hexdigest().encode()
+
+
+@pytest.mark.parametrize(
+    "replacement",
+    (hashlib.sha512, KeyedHash("key", algorithm="blake2b", length=16)),
+)
+def test_binary_values_of_sensitive_keys_are_hashed_directly(replacement):
+    sanitizer = Sanitizer(keys={"body"}, replacement=replacement)
+
+    cleaned = sanitizer.sanitize({"body": bytearray(b"secret")})
+
+    assert cleaned == {"body": sanitizer.sanitize({"body": "secret"})["body"]}
+
+
+def test_binary_spans_are_redacted_in_place():
+    sanitizer = Sanitizer(patterns={EMAIL, r"\d{4}"}, redaction="spans", copy_mode="in_place")
+    buffer = bytearray(b"jane@example.com paid 1234, ok")
+    view = memoryview(bytearray(b"id 5678"))
+
+    assert sanitizer.sanitize(buffer) is buffer
+    assert sanitizer.sanitize(view) is view
+    assert buffer == bytearray(b"**************** paid ****, ok")
+    assert view.tobytes() == b"id ****"
+
+
+def test_read_only_buffers_are_not_redacted_in_place():
+    sanitizer = Sanitizer(patterns={r"\d{4}"}, redaction="spans", copy_mode="in_place")
+    view = memoryview(b"id 5678")
+
+    assert sanitizer.sanitize(view) == b"id ********"
+    assert view.tobytes() == b"id 5678"
+
+
+def test_binary_values_are_limited_in_length():
+    sanitizer = Sanitizer(max_string_length=4, limit_action="truncate")
+
+    assert sanitizer.sanitize(memoryview(b"123456")).tobytes() == b"1234"
@@ -0,0 +1,113 @@
+import pickle
+from dataclasses import dataclass
+from unittest.mock import patch
+
+import pytest
+
+from sanitary import StructlogSanitizer
+from sanitary.context import MISSING, ContextCache
+
+REPLACEMENT = "********"
+
+
+@dataclass
+class User:
+    name: str
+    password: str
+
+
+@pytest.fixture
+def sanitizer():
+    return StructlogSanitizer(keys={"password"}, context_cache_size=16, copy_mode="on_write")
+
+
+def test_only_new_values_are_sanitized(sanitizer):
+    context = {"user": {"name": "jane", "password": "secret"}}
+
+    with patch.object(sanitizer, "sanitize", wraps=sanitizer.sanitize) as sanitize:
+        first = sanitizer(None, "info", {**context, "event": "first"})
+        second = sanitizer(None, "info", {**context, "event": "second"})
+
+    assert first == {"user": {"name": "jane", "password": REPLACEMENT}, "event": "first"}
+    assert second == {"user": {"name": "jane", "password": REPLACEMENT}, "event": "second"}
+    assert second["user"] is first["user"]
+    assert sanitize.call_args_list[1].args == ({"event": "second"},)
+
+
+def test_values_are_cached_by_key(sanitizer):
+    value = "secret"
+
+    assert sanitizer(None, "info", {"note": value}) == {"note": value}
+    assert sanitizer(None, "info", {"password": value}) == {"password": REPLACEMENT}
+
+
+def test_equal_values_with_different_identity_are_not_reused(sanitizer):
+    sanitizer(None, "info", {"user": {"password": "secret"}})
+
+    assert sanitizer(None, "info", {"user": {"password": "other"}}) == {
+        "user": {"password": REPLACEMENT}
+    }
+    assert len(sanitizer._context_cache) == 2
+
+
+def test_configuration_change_discards_the_cache(sanitizer):
+    user = {"name": "jane"}
+    sanitizer(None, "info", {"user": user})
+
+    sanitizer.keys = {"name"}
+
+    assert sanitizer(None, "info", {"user": user}) == {"user": {"name": REPLACEMENT}}
+
+
+def test_registering_a_handler_discards_the_cache(sanitizer):
+    user = User("jane", "secret")
+    assert sanitizer(None, "info", {"user": user}) == {
+        "user": {"name": "jane", "password": REPLACEMENT}
+    }
+
+    sanitizer.register(User, lambda data: data.name)
+
+    assert sanitizer(None, "info", {"user": user}) == {"user": "jane"}
+
+
+def test_cache_is_not_used_with_limited_number_of_values():
+    sanitizer = StructlogSanitizer(context_cache_size=16, max_nodes=100)
+
+    sanitizer(None, "info", {"user": {"name": "jane"}})
+
+    assert len(sanitizer._context_cache) == 0
+
+
+def test_sanitizer_with_cache_is_picklable(sanitizer):
+    copy = pickle.loads(pickle.dumps(sanitizer))  # noqa: S301
+
+    assert copy.context_cache_size == 16
+    assert copy(None, "info", {"password": "secret"}) == {"password": REPLACEMENT}
+
+
+def test_least_recently_used_values_are_discarded():
+    cache = ContextCache(2)
+    first, second, third = User("a", "1"), {"b": 2}, ["c"]
+    cache.put("first", first, "1")
+    cache.put("second", second, "2")
+    assert cache.get("first", first) == "1"
+
+    cache.put("third", third, "3")
+
+    assert cache.get("second", second) is MISSING
+    assert cache.get("first", first) == "1"
+    assert cache.get("third", third) == "3"
+
+
+def test_destroyed_values_are_not_matched_by_reused_identity():
+    cache = ContextCache(2)
+    cache.put("user", User("a", "1"), "cleaned")
+
+    assert cache.get("user", User("b", "2")) is MISSING
+
+
+def test_trivial_values_are_not_cached():
+    cache = ContextCache(2)
+    cache.put("count", 1000, 1000)
+
+    assert len(cache) == 0
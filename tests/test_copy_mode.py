@@ -0,0 +1,104 @@
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.copying import CopyMode
+
+SENSITIVE_KEYS = {"password"}
+SENSITIVE_PATTERNS = {"Bearer "}
+
+
+def _sanitizer(copy_mode):
+    return Sanitizer(keys=SENSITIVE_KEYS, patterns=SENSITIVE_PATTERNS, copy_mode=copy_mode)
+
+
+def test_all_containers_are_copied_by_default():
+    data = {"user": {"name": "foo"}, "tags": ("a", "b")}
+
+    cleaned_data = Sanitizer(keys=SENSITIVE_KEYS).sanitize(data)
+
+    assert cleaned_data == {"user": {"name": "foo"}, "tags": ["a", "b"]}
+    assert cleaned_data is not data
+    assert cleaned_data["user"] is not data["user"]
+
+
+@pytest.mark.parametrize("copy_mode", (CopyMode.ON_WRITE, CopyMode.IN_PLACE))
+def test_unchanged_structure_is_returned_as_is(copy_mode):
+    data = {"user": {"name": "foo", "roles": ["admin"]}, "tags": ("a", "b"), "ids": {1, 2}}
+
+    cleaned_data = _sanitizer(copy_mode).sanitize(data)
+
+    assert cleaned_data is data
+    assert cleaned_data == {
+        "user": {"name": "foo", "roles": ["admin"]},
+        "tags": ("a", "b"),
+        "ids": {1, 2},
+    }
+
+
+def test_only_path_to_changed_value_is_copied_on_write():
+    data = {
+        "user": {"name": "foo", "password": "secret"},
+        "request": {"headers": ["Bearer abc", "Accept"]},
+        "clean": {"foo": ["bar"]},
+    }
+
+    cleaned_data = _sanitizer("on_write").sanitize(data)
+
+    assert cleaned_data == {
+        "user": {"name": "foo", "password": "********"},
+        "request": {
+            "headers": [
+                "#### WARNING: Message replaced due to sensitive information.",
+                "Accept",
+            ]
+        },
+        "clean": {"foo": ["bar"]},
+    }
+    assert cleaned_data is not data
+    assert cleaned_data["user"] is not data["user"]
+    assert cleaned_data["request"]["headers"] is not data["request"]["headers"]
+    assert cleaned_data["clean"] is data["clean"]
+    assert data["user"]["password"] == "secret"
+    assert data["request"]["headers"][0] == "Bearer abc"
+
+
+def test_dicts_and_lists_are_modified_in_place():
+    user = {"name": "foo", "password": "secret"}
+    headers = ["Bearer abc", "Accept"]
+    data = {"user": user, "headers": headers}
+
+    cleaned_data = _sanitizer("in_place").sanitize(data)
+
+    assert cleaned_data is data
+    assert cleaned_data["user"] is user
+    assert cleaned_data["headers"] is headers
+    assert user["password"] == "********"
+    assert headers[0].startswith("#### WARNING:")
+
+
+@pytest.mark.parametrize("copy_mode", (CopyMode.ON_WRITE, CopyMode.IN_PLACE))
+def test_immutable_containers_keep_their_type_when_changed(copy_mode):
+    tags = ("a", "Bearer abc")
+    data = {"tags": tags, "names": frozenset({"b", "Bearer def"})}
+
+    cleaned_data = _sanitizer(copy_mode).sanitize(data)
+
+    assert cleaned_data["tags"][0] == "a"
+    assert cleaned_data["tags"][1].startswith("#### WARNING:")
+    assert isinstance(cleaned_data["tags"], tuple)
+    assert isinstance(cleaned_data["names"], frozenset)
+    assert tags == ("a", "Bearer abc")
+
+
+def test_object_attributes_are_never_modified():
+    class Foo:
+        def __init__(self):
+            self.password = "secret"
+            self.name = "foo"
+
+    foo = Foo()
+
+    cleaned_data = _sanitizer("in_place").sanitize({"foo": foo})
+
+    assert cleaned_data == {"foo": {"password": "********", "name": "foo"}}
+    assert foo.password == "secret"
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from decimal import Decimal
+
+from sanitary import Sanitizer
+from sanitary.dispatch import handles
+
+
+def test_immutable_scalars_are_returned_unchanged():
+    data = {"none": None, "true": True, "int": 12345678901234567890, "float": 1.5}
+
+    cleaned_data = Sanitizer(keys={"password"}).sanitize(data)
+
+    assert cleaned_data == data
+    assert cleaned_data["none"] is None
+    assert cleaned_data["true"] is True
+    assert cleaned_data["int"] is data["int"]
+
+
+def test_subclasses_of_registered_types_are_resolved_and_cached():
+    sanitizer = Sanitizer(keys={"password"})
+
+    cleaned_data = sanitizer.sanitize(OrderedDict(password="secret"))  # noqa: S106
+
+    assert cleaned_data == {"password": "********"}
+    assert sanitizer._dispatch.handlers[OrderedDict] == sanitizer._sanitize_dict
+
+
+def test_custom_handler_can_be_registered():
+    class Secret:
+        pass
+
+    sanitizer = Sanitizer()
+    sanitizer.register(Secret, lambda value: "<secret>")
+
+    assert sanitizer.sanitize({"foo": [Secret()]}) == {"foo": ["<secret>"]}
+
+
+def test_registered_handler_overrides_resolved_types():
+    class Amount(Decimal):
+        pass
+
+    sanitizer = Sanitizer()
+    assert sanitizer.sanitize(Amount("1.5")) == 1.5
+
+    @sanitizer.register(Decimal)
+    def decimal_to_str(value):
+        return str(value)
+
+    assert sanitizer.sanitize(Amount("1.5")) == "1.5"
+
+
+def test_subclass_can_define_handlers():
+    class BytesSanitizer(Sanitizer):
+        @handles(bytes)
+        def _sanitize_bytes(self, data):
+            return self.sanitize(data.decode())
+
+        def _sanitize_decimal(self, data):
+            return str(data)
+
+    sanitizer = BytesSanitizer(patterns={"Bearer "})
+
+    assert sanitizer.sanitize(b"Bearer abc").startswith("#### WARNING:")
+    assert sanitizer.sanitize(Decimal("1.5")) == "1.5"
+    assert Sanitizer().sanitize(Decimal("1.5")) == 1.5
@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.embedded_json import EmbeddedJSON, looks_like_json
+
+SENSITIVE_KEYS = {"password"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    ('{"a": 1}', "[1, 2]", '  \n{"a": 1}  ', "[INFO] started ]", "{not json}"),
+)
+def test_json_like_text_is_detected(text):
+    assert looks_like_json(text)
+
+
+@pytest.mark.parametrize("text", ("", "   ", "plain text", "123", '"quoted"', "[INFO] started"))
+def test_plain_text_is_not_detected_as_json(text):
+    assert not looks_like_json(text)
+
+
+def test_embedded_json_object_is_sanitized_by_default():
+    data = {"body": json.dumps({"user": "foo", "password": "secret"})}
+
+    cleaned_data = Sanitizer(keys=SENSITIVE_KEYS).sanitize(data)
+
+    assert cleaned_data == {"body": {"user": "foo", "password": "********"}}
+
+
+def test_scalar_json_text_is_not_decoded_by_default():
+    cleaned_data = Sanitizer(keys=SENSITIVE_KEYS).sanitize({"a": "123", "b": "null"})
+
+    assert cleaned_data == {"a": "123", "b": "null"}
+
+
+def test_scalar_json_text_is_decoded_when_always_enabled():
+    sanitizer = Sanitizer(keys=SENSITIVE_KEYS, embedded_json="always")
+
+    assert sanitizer.embedded_json is EmbeddedJSON.ALWAYS
+    assert sanitizer.sanitize({"a": "123", "b": "[1, 2]"}) == {"a": 123, "b": [1, 2]}
+
+
+def test_embedded_json_is_not_decoded_when_off():
+    body = json.dumps({"password": "secret"})
+
+    cleaned_data = Sanitizer(keys=SENSITIVE_KEYS, embedded_json="off").sanitize({"body": body})
+
+    assert cleaned_data == {"body": body}
+
+
+def test_patterns_are_matched_when_off():
+    body = json.dumps({"auth": "Bearer abc"})
+
+    cleaned_data = Sanitizer(patterns={"Bearer "}, embedded_json="off").sanitize(body)
+
+    assert cleaned_data.startswith("#### WARNING:")
+
+
+def test_invalid_json_falls_back_to_pattern_matching():
+    sanitizer = Sanitizer(patterns={"Bearer "})
+
+    assert sanitizer.sanitize("[Bearer abc]").startswith("#### WARNING:")
+    assert sanitizer.sanitize("[INFO] done]") == "[INFO] done]"
+
+
+def test_sanitized_json_is_reserialized():
+    body = json.dumps({"user": "foo", "password": "secret"})
+
+    cleaned_data = Sanitizer(keys=SENSITIVE_KEYS, reserialize_json=True).sanitize(
+        {"body": body}
+    )
+
+    assert cleaned_data == {"body": json.dumps({"user": "foo", "password": "********"})}
+
+
+def test_custom_json_codec_is_used():
+    calls = []
+
+    def decoder(text):
+        calls.append(text)
+        return json.loads(text)
+
+    def encoder(value):
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    sanitizer = Sanitizer(
+        keys=SENSITIVE_KEYS, json_decoder=decoder, json_encoder=encoder, reserialize_json=True
+    )
+    cleaned_data = sanitizer.sanitize('{"password": "secret"}')
+
+    assert calls == ['{"password": "secret"}']
+    assert cleaned_data == '{"password":"********"}'
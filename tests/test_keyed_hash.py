@@ -0,0 +1,75 @@
+import hashlib
+import hmac
+import pickle
+
+import pytest
+
+from sanitary import KeyedHash, Sanitizer
+
+KEY = b"secret key"
+
+
+@pytest.mark.parametrize("algorithm", ("sha256", "sha512", "sha3_256", "md5"))
+def test_values_are_hashed_with_hmac(algorithm):
+    keyed_hash = KeyedHash(KEY, algorithm=algorithm)
+
+    expected = hmac.new(KEY, b"user@domain.xyz", algorithm).hexdigest()
+    assert keyed_hash("user@domain.xyz") == expected
+    assert keyed_hash("user@domain.xyz") == expected
+
+
+@pytest.mark.parametrize("algorithm", ("blake2b", "blake2s"))
+def test_blake2_is_keyed_natively(algorithm):
+    keyed_hash = KeyedHash(KEY.decode(), algorithm=algorithm, digest_size=16)
+
+    expected = getattr(hashlib, algorithm)(b"foo", key=KEY, digest_size=16).hexdigest()
+    assert keyed_hash("foo") == expected
+    assert len(keyed_hash("foo")) == 32
+
+
+def test_digest_is_truncated():
+    keyed_hash = KeyedHash(KEY, length=12)
+
+    assert keyed_hash("foo") == hmac.new(KEY, b"foo", "sha256").hexdigest()[:12]
+
+
+def test_same_key_gives_same_output_across_instances():
+    assert KeyedHash(KEY)("foo") == KeyedHash(KEY)("foo")
+    assert KeyedHash(KEY)("foo") != KeyedHash(b"other key")("foo")
+
+
+def test_keyed_hash_can_be_pickled():
+    keyed_hash = KeyedHash(KEY, algorithm="blake2b", digest_size=20, length=8)
+
+    restored = pickle.loads(pickle.dumps(keyed_hash))  # noqa: S301
+
+    assert restored("foo") == keyed_hash("foo")
+    assert restored.length == 8
+
+
+@pytest.mark.parametrize(
+    "options",
+    ({"length": 0}, {"algorithm": "sha256", "digest_size": 16}, {"algorithm": "shake_128"}),
+)
+def test_invalid_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        KeyedHash(KEY, **options)
+
+
+def test_sanitizer_replaces_values_with_keyed_hash():
+    sanitizer = Sanitizer(keys={"email"}, replacement=KeyedHash(KEY, length=16))
+
+    cleaned_data = sanitizer.sanitize({"email": "user@domain.xyz"})
+
+    assert cleaned_data == {
+        "email": hmac.new(KEY, b"user@domain.xyz", "sha256").hexdigest()[:16]
+    }
+
+
+def test_hashlib_functions_are_available_for_compatibility():
+    from sanitary import hashing
+
+    assert hashlib.sha256 in hashing.HASHLIB_FUNCTIONS
+    assert hashlib.md5 in hashing.HASHLIB_FUNCTIONS
+    with pytest.raises(AttributeError):
+        hashing.UNKNOWN  # noqa: B018
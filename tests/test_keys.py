@@ -0,0 +1,198 @@
+import json
+
+from sanitary import Sanitizer
+from sanitary.keys import KeyMatcher
+
+REPLACEMENT = "********"
+
+
+def test_plain_keys_are_matched_case_insensitively():
+    sanitizer = Sanitizer(keys={"Password"})
+
+    assert sanitizer.keys == frozenset({"Password"})
+    assert sanitizer.sanitize({"PASSWORD": "a", "password": "b", "user": "c"}) == {
+        "PASSWORD": REPLACEMENT,
+        "password": REPLACEMENT,
+        "user": "c",
+    }
+
+
+def test_glob_keys_match_key_names():
+    sanitizer = Sanitizer(keys={"*_token", "secret*key"})
+
+    assert sanitizer.sanitize(
+        {
+            "access_token": "a",
+            "Refresh_Token": "b",
+            "secret_key": "c",
+            "secret_api_key": "d",
+            "token": "e",
+            "secret": "f",
+        }
+    ) == {
+        "access_token": REPLACEMENT,
+        "Refresh_Token": REPLACEMENT,
+        "secret_key": REPLACEMENT,
+        "secret_api_key": REPLACEMENT,
+        "token": "e",
+        "secret": "f",
+    }
+
+
+def test_regex_keys_are_searched_in_key_names():
+    sanitizer = Sanitizer(keys={r"re:^(api|auth)[-_]?key$", r"re:\Bssn\b"})
+
+    assert sanitizer.sanitize(
+        {"API_KEY": "a", "authkey": "b", "api_key_id": "c", "user_ssn": "d", "ssn": "e"}
+    ) == {
+        "API_KEY": REPLACEMENT,
+        "authkey": REPLACEMENT,
+        "api_key_id": "c",
+        "user_ssn": REPLACEMENT,
+        "ssn": "e",
+    }
+
+
+def test_key_paths_match_only_within_the_parent_keys():
+    sanitizer = Sanitizer(keys={"headers.authorization"})
+
+    assert sanitizer.sanitize(
+        {"authorization": "a", "headers": {"Authorization": "b", "host": "c"}}
+    ) == {"authorization": "a", "headers": {"Authorization": REPLACEMENT, "host": "c"}}
+
+
+def test_key_paths_also_match_flattened_keys():
+    sanitizer = Sanitizer(keys={"http.authorization", "user.password", "*.token"})
+
+    assert sanitizer.sanitize(
+        {"http.authorization": "a", "User.Password": "b", "auth.token": "c", "user": "d"}
+    ) == {
+        "http.authorization": REPLACEMENT,
+        "User.Password": REPLACEMENT,
+        "auth.token": REPLACEMENT,
+        "user": "d",
+    }
+
+
+def test_key_paths_match_at_any_nesting_level_and_skip_sequences():
+    sanitizer = Sanitizer(keys={"headers.authorization"})
+
+    assert sanitizer.sanitize(
+        {
+            "requests": [
+                {"headers": {"authorization": "a"}},
+                {"headers": [{"authorization": "b"}]},
+            ]
+        }
+    ) == {
+        "requests": [
+            {"headers": {"authorization": REPLACEMENT}},
+            {"headers": [{"authorization": REPLACEMENT}]},
+        ]
+    }
+
+
+def test_glob_characters_other_than_wildcards_are_literal():
+    sanitizer = Sanitizer(keys={"[secret]", "user[password]", "why?", "card[*]"})
+
+    assert sanitizer.sanitize(
+        {
+            "[secret]": "a",
+            "s": "b",
+            "user[password]": "c",
+            "userp": "d",
+            "why?": "e",
+            "why": "f",
+            "card[number]": "g",
+            "cardn": "h",
+        }
+    ) == {
+        "[secret]": REPLACEMENT,
+        "s": "b",
+        "user[password]": REPLACEMENT,
+        "userp": "d",
+        "why?": REPLACEMENT,
+        "why": "f",
+        "card[number]": REPLACEMENT,
+        "cardn": "h",
+    }
+
+
+def test_key_paths_with_wildcards():
+    sanitizer = Sanitizer(keys={"user.*.email", "*.card.number"})
+
+    assert sanitizer.sanitize(
+        {
+            "user": {"home": {"email": "a"}, "email": "b"},
+            "payment": {"card": {"number": "c"}},
+            "card": {"number": "d"},
+        }
+    ) == {
+        "user": {"home": {"email": REPLACEMENT}, "email": "b"},
+        "payment": {"card": {"number": REPLACEMENT}},
+        "card": {"number": "d"},
+    }
+
+
+def test_key_paths_continue_into_embedded_json():
+    sanitizer = Sanitizer(keys={"body.card"})
+
+    cleaned_data = sanitizer.sanitize({"body": json.dumps({"card": "1234"}), "card": "5678"})
+
+    assert cleaned_data == {"body": {"card": REPLACEMENT}, "card": "5678"}
+
+
+def test_keys_other_than_strings_are_matched_by_their_string_form():
+    sanitizer = Sanitizer(keys={"1", "none.x"})
+
+    assert sanitizer.sanitize({1: "a", 2: "b", None: {"x": "c"}, (1, 2): "d"}) == {
+        1: REPLACEMENT,
+        2: "b",
+        None: {"x": REPLACEMENT},
+        (1, 2): "d",
+    }
+
+
+def test_keys_can_be_replaced():
+    sanitizer = Sanitizer(keys={"password"})
+
+    sanitizer.keys = {"email"}
+
+    assert sanitizer.sanitize({"password": "a", "email": "b"}) == {
+        "password": "a",
+        "email": REPLACEMENT,
+    }
+
+
+def test_decision_cache_is_bounded():
+    matcher = KeyMatcher({"password"}, cache_size=10)
+
+    for number in range(25):
+        assert matcher.decide(matcher.root, f"key{number}") == (None, matcher.root)
+    assert matcher.decide(matcher.root, "Password")[0] == "password"
+
+    assert len(matcher.root.cache) <= 10
+
+
+def test_glob_and_regex_keys_are_merged_into_a_single_pattern():
+    matcher = KeyMatcher({"*_token", "secret*", r"re:^api[-_]?key$", r"re:(\w)\1pass"})
+
+    assert matcher._root.combined is not None
+    assert len(matcher._root.merged) == 3
+    for key, rule in (
+        ("access_token", "*_token"),
+        ("secret1", "secret*"),
+        ("API-KEY", r"re:^api[-_]?key$"),
+        ("xxpass", r"re:(\w)\1pass"),
+        ("xypass", None),
+        ("token", None),
+    ):
+        assert matcher.decide(matcher.root, key)[0] == rule
+
+
+def test_regex_keys_with_global_flags_are_matched_separately():
+    matcher = KeyMatcher({"*_token", r"re:(?x) pass \s? word"})
+
+    assert matcher._root.combined is None
+    assert matcher.decide(matcher.root, "pass word")[0] == r"re:(?x) pass \s? word"
+    assert matcher.decide(matcher.root, "my_token")[0] == "*_token"
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.traversal import LimitAction
+
+MARKER = "#### WARNING: Value omitted due to exceeded limits."
+
+
+def _nested(depth):
+    data = "leaf"
+    for _ in range(depth):
+        data = {"child": [data]}
+    return data
+
+
+def test_deeply_nested_data_does_not_exceed_recursion_limit():
+    cleaned_data = Sanitizer(keys={"password"}).sanitize(_nested(10000))
+
+    for _ in range(10000):
+        cleaned_data = cleaned_data["child"][0]
+    assert cleaned_data == "leaf"
+
+
+@pytest.mark.parametrize("copy_mode", ("always", "on_write", "in_place"))
+def test_cyclic_references_are_replaced_with_marker(copy_mode):
+    data = {"name": "root", "items": []}
+    data["self"] = data
+    data["items"].append(data["items"])
+
+    cleaned_data = Sanitizer(keys={"password"}, copy_mode=copy_mode).sanitize(data)
+
+    assert cleaned_data["self"] == MARKER
+    assert cleaned_data["items"] == [MARKER]
+
+
+def test_repeated_references_are_not_cycles():
+    shared = {"password": "secret"}
+
+    cleaned_data = Sanitizer(keys={"password"}).sanitize({"a": shared, "b": [shared, shared]})
+
+    assert cleaned_data == {
+        "a": {"password": "********"},
+        "b": [{"password": "********"}, {"password": "********"}],
+    }
+
+
+def test_cyclic_object_attributes_are_replaced_with_marker():
+    class Node:
+        def __init__(self):
+            self.parent = self
+            self.password = "secret"
+
+    assert Sanitizer(keys={"password"}).sanitize(Node()) == {
+        "parent": MARKER,
+        "password": "********",
+    }
+
+
+def test_containers_over_max_depth_are_replaced_with_marker():
+    sanitizer = Sanitizer(max_depth=2)
+
+    assert sanitizer.sanitize({"a": {"b": {"c": 1}}, "d": 1}) == {"a": {"b": MARKER}, "d": 1}
+
+
+def test_containers_over_max_depth_are_emptied_when_truncating():
+    sanitizer = Sanitizer(max_depth=2, limit_action="truncate")
+
+    assert sanitizer.limit_action is LimitAction.TRUNCATE
+    assert sanitizer.sanitize({"a": {"b": {"c": 1}, "d": [1]}}) == {"a": {"b": {}, "d": []}}
+
+
+def test_embedded_json_counts_towards_max_depth():
+    sanitizer = Sanitizer(max_depth=2)
+    data = {"body": json.dumps({"nested": {"a": 1}})}
+
+    assert sanitizer.sanitize(data) == {"body": MARKER}
+
+
+def test_values_over_max_nodes_are_replaced_with_marker():
+    sanitizer = Sanitizer(max_nodes=4)
+
+    cleaned_data = sanitizer.sanitize({"a": 1, "b": [2, 3], "c": 4})
+
+    assert cleaned_data == {"a": 1, "b": [2, MARKER], "c": MARKER}
+
+
+@pytest.mark.parametrize("copy_mode", ("always", "on_write", "in_place"))
+def test_values_over_max_nodes_are_omitted_when_truncating(copy_mode):
+    sanitizer = Sanitizer(max_nodes=4, limit_action="truncate", copy_mode=copy_mode)
+
+    cleaned_data = sanitizer.sanitize({"a": 1, "b": [2, 3], "c": 4})
+
+    assert cleaned_data == {"a": 1, "b": [2]}
+
+
+def test_node_budget_applies_to_each_call():
+    sanitizer = Sanitizer(max_nodes=3)
+
+    assert sanitizer.sanitize([1, 2]) == [1, 2]
+    assert sanitizer.sanitize([1, 2]) == [1, 2]
+
+
+def test_long_strings_are_replaced_with_marker():
+    sanitizer = Sanitizer(max_string_length=5)
+
+    assert sanitizer.sanitize(["short", "too long"]) == ["short", MARKER]
+
+
+def test_long_strings_are_truncated_before_matching():
+    sanitizer = Sanitizer(patterns={"Bearer "}, max_string_length=7, limit_action="truncate")
+
+    assert sanitizer.sanitize(["too long", "Bearer abc", "x Bearer abc"]) == [
+        "too lon",
+        "#### WARNING: Message replaced due to sensitive information.",
+        "x Beare",
+    ]
+
+
+def test_custom_limit_marker_is_used():
+    sanitizer = Sanitizer(max_string_length=1, limit_marker="[omitted]")
+
+    assert sanitizer.sanitize({"a": "abc"}) == {"a": "[omitted]"}
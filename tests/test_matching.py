@@ -0,0 +1,126 @@
+import re
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.matching import PatternMatcher
+
+
+def test_matcher_returns_the_matching_pattern():
+    patterns = [re.compile(r"Bearer "), re.compile(r"'Refresh':"), re.compile(r"\d{16}")]
+    matcher = PatternMatcher(patterns)
+
+    assert matcher.search("token: Bearer abc") is patterns[0]
+    assert matcher.search("{'Refresh': 'abc'}") is patterns[1]
+    assert matcher.search("card 4111111111111111") is patterns[2]
+    assert matcher.search("nothing to see here") is None
+
+
+def test_patterns_are_searched_only_when_their_prefixes_are_present():
+    foo, bar, digits = re.compile("foo"), re.compile("bar", re.IGNORECASE), re.compile(r"\d+")
+    matcher = PatternMatcher([foo, bar, digits])
+
+    assert [original for _, original in matcher._candidates("a foo")] == [foo, bar, digits]
+    assert [original for _, original in matcher._candidates("a BAR")] == [bar, digits]
+    assert matcher.search("BAR") is bar
+    assert matcher.search("FOO") is None
+
+
+def test_patterns_with_common_prefix_are_skipped_together():
+    patterns = [re.compile(f"secret_{index}=\\w+") for index in range(3)]
+    matcher = PatternMatcher(patterns)
+
+    assert len(matcher._groups) == 1
+    assert list(matcher._candidates("nothing to see here")) == []
+    assert [original for _, original in matcher._candidates("secret_1=abc")] == [patterns[1]]
+    assert matcher.search("secret_2=abc") is patterns[2]
+
+
+def test_replacements_are_not_matched_again():
+    matcher = PatternMatcher([re.compile(r"\d{4}"), re.compile(r"\*+")])
+
+    cleaned = matcher.sub(lambda pattern, text: "*" * len(text) + "1234", "pin 1234 ok")
+
+    assert cleaned == "pin ****1234 ok"
+
+
+def test_text_and_binary_matchers_skip_patterns_of_the_other_type():
+    text_pattern, bytes_pattern = re.compile("foo"), re.compile(b"bar")
+
+    text_matcher = PatternMatcher([text_pattern, bytes_pattern])
+    binary_matcher = PatternMatcher([text_pattern, bytes_pattern], binary=True)
+
+    assert text_matcher.search("foo bar") is text_pattern
+    assert text_matcher.search("bar") is None
+    assert binary_matcher.search(b"foo") is text_pattern
+    assert binary_matcher.search(memoryview(b"a bar")) is bytes_pattern
+    assert set(binary_matcher._prefixes) == {b"foo", b"bar"}
+
+
+def test_binary_matcher_matches_utf8_encoded_text():
+    pattern = re.compile("café")
+    matcher = PatternMatcher([pattern, re.compile(r"\N{EM DASH}")], binary=True)
+
+    assert matcher.search("a café".encode()) is pattern
+    assert list(matcher._candidates("a café".encode())) == [
+        (re.compile("café".encode()), pattern)
+    ]
+
+
+def test_backreferences_are_matched_correctly():
+    pattern = re.compile(r"(\w+)-\1")
+    matcher = PatternMatcher([re.compile(r"(x)y"), pattern])
+
+    assert matcher.search("abc-abc") is pattern
+    assert matcher.search("abc-abd") is None
+
+
+def test_conditional_groups_are_matched_correctly():
+    pattern = re.compile(r"(a)?(?(1)b|c)x")
+    matcher = PatternMatcher([pattern, re.compile("zz(q)")])
+
+    assert matcher.search("abx") is pattern
+    assert matcher.search("cx") is pattern
+    assert matcher.search("ax") is None
+
+
+def test_prefilter_uses_shortest_literal_prefixes():
+    matcher = PatternMatcher(
+        [re.compile(r"Bearer \w+"), re.compile(r"Bear"), re.compile(r"^secret\.key=.*")]
+    )
+
+    assert matcher._prefixes == ("Bear", "secret.key=")
+    assert not matcher.might_match("nothing to see here")
+    assert matcher.might_match("a Bear")
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    (r"foo|bar", r"x?abc", r"[ab]c", r"\d+", r"(?i)foo", r"(?x)foo bar"),
+)
+def test_prefilter_is_disabled_when_any_pattern_has_no_literal_prefix(pattern):
+    matcher = PatternMatcher([re.compile("Bearer "), re.compile(pattern)])
+
+    assert matcher._prefixes is None
+    assert matcher.might_match("anything")
+
+
+@pytest.mark.parametrize(
+    ("pattern", "prefix"),
+    ((r"ab?c", "a"), (r"ab*", "a"), (r"ab+", "ab"), (r"a\.b{2}", "a.")),
+)
+def test_optional_characters_are_excluded_from_prefix(pattern, prefix):
+    matcher = PatternMatcher([re.compile(pattern)])
+
+    assert matcher._prefixes == (prefix,)
+
+
+def test_sanitizer_exposes_compiled_patterns():
+    sanitizer = Sanitizer(patterns=["Bearer ", re.compile("foo")])
+
+    assert sanitizer.patterns == {re.compile("Bearer "), re.compile("foo")}
+
+    sanitizer.patterns = ["bar"]
+
+    assert sanitizer.sanitize("Bearer abc") == "Bearer abc"
+    assert sanitizer.sanitize("foobar").startswith("#### WARNING:")
@@ -0,0 +1,175 @@
+import hashlib
+import io
+import json
+import pickle
+from copy import copy
+from unittest.mock import patch
+
+import pytest
+
+import sanitary.parallel
+from sanitary import KeyedHash, Sanitizer
+from sanitary.__main__ import main
+from sanitary.parallel import sanitize_ndjson_parallel, sanitize_threaded
+
+SENSITIVE_KEYS = {"email", "password"}
+
+
+def test_sanitizer_can_be_pickled():
+    sanitizer = Sanitizer(
+        keys=SENSITIVE_KEYS,
+        patterns={"Bearer "},
+        replacement=KeyedHash(b"key", length=8),
+        copy_mode="on_write",
+    )
+
+    restored = pickle.loads(pickle.dumps(sanitizer))  # noqa: S301
+
+    assert restored.keys == sanitizer.keys
+    assert restored.patterns == sanitizer.patterns
+    assert restored.copy_mode == sanitizer.copy_mode
+    data = {"email": "user@domain.xyz", "auth": "Bearer abc"}
+    assert restored.sanitize(data) == sanitizer.sanitize(data)
+
+
+def test_many_items_are_sanitized_in_order():
+    sanitizer = Sanitizer(keys=SENSITIVE_KEYS, replacement=hashlib.sha256)
+    items = [{"id": index, "email": f"user{index}@domain.xyz"} for index in range(50)]
+
+    sanitized = list(sanitizer.sanitize_many(items, workers=2, chunk_size=7))
+
+    assert sanitized == [sanitizer.sanitize(item) for item in items]
+
+
+def test_many_items_are_sanitized_in_current_process():
+    sanitizer = Sanitizer(keys=SENSITIVE_KEYS)
+    sanitizer.register(complex, lambda value: "complex")
+
+    sanitized = list(sanitizer.sanitize_many([{"email": "x"}, 1j], workers=1))
+
+    assert sanitized == [{"email": "********"}, "complex"]
+
+
+def test_ndjson_is_sanitized_in_parallel():
+    lines = [json.dumps({"id": index, "password": "secret"}) for index in range(30)]
+    target = io.StringIO()
+
+    sanitize_ndjson_parallel(
+        Sanitizer(keys=SENSITIVE_KEYS),
+        io.StringIO("\n".join(lines)),
+        target,
+        workers=2,
+        chunk_size=4,
+    )
+
+    records = [json.loads(line) for line in target.getvalue().splitlines()]
+    assert records == [{"id": index, "password": "********"} for index in range(30)]
+
+
+def test_command_line_uses_workers(tmp_path):
+    source = tmp_path / "input.ndjson"
+    target = tmp_path / "output.ndjson"
+    source.write_text("".join(f'{{"id": {index}, "email": "x"}}\n' for index in range(10)))
+
+    assert main([str(source), "-o", str(target), "-k", "email", "--workers", "2"]) == 0
+
+    records = [json.loads(line) for line in target.read_text().splitlines()]
+    assert records == [{"id": index, "email": "********"} for index in range(10)]
+
+
+EXPORT = {
+    "meta": {"count": 100, "token": "abc"},
+    "results": [
+        {"id": index, "email": f"user{index}@domain.xyz", "note": f"card {index:04d}"}
+        for index in range(100)
+    ],
+    "index": {f"user{index}": {"password": "secret", "id": index} for index in range(50)},
+}
+
+
+@pytest.mark.parametrize(
+    "options",
+    (
+        {"keys": SENSITIVE_KEYS},
+        {"keys": SENSITIVE_KEYS, "replacement": hashlib.sha256, "patterns": {r"\d{4}"}},
+        {"keys": {"results.email", "token"}, "redaction": "spans", "patterns": {"card"}},
+        {"keys": SENSITIVE_KEYS, "max_depth": 2, "limit_action": "truncate"},
+        {"keys": SENSITIVE_KEYS, "max_nodes": 20},
+        {"keys": SENSITIVE_KEYS, "collect_stats": True},
+    ),
+)
+def test_large_document_is_sanitized_in_threads(options):
+    sanitizer = Sanitizer(**options)
+
+    cleaned = sanitizer.sanitize_threaded(EXPORT, workers=4, threshold=10)
+
+    assert cleaned == sanitizer.sanitize(EXPORT)
+
+
+@pytest.mark.parametrize("copy_mode", ("on_write", "in_place"))
+def test_unchanged_containers_are_not_copied_in_threads(copy_mode):
+    sanitizer = Sanitizer(keys={"secret"}, copy_mode=copy_mode)
+    items = [{"id": index} for index in range(20)]
+
+    cleaned = sanitize_threaded(sanitizer, {"items": items}, workers=2, threshold=10)
+
+    assert cleaned["items"] is items
+    assert all(
+        cleaned_item is item for cleaned_item, item in zip(cleaned["items"], items, strict=True)
+    )
+
+
+def test_custom_handlers_are_used_in_threads():
+    sanitizer = Sanitizer(keys=SENSITIVE_KEYS)
+    sanitizer.register(complex, lambda value: "complex")
+
+    with patch(
+        "sanitary.parallel._sanitize_items", wraps=sanitary.parallel._sanitize_items
+    ) as sanitize_items:
+        cleaned = sanitize_threaded(sanitizer, [1j] * 24, workers=2, threshold=10)
+
+    assert cleaned == ["complex"] * 24
+    assert sanitize_items.call_count == 8
+
+
+def test_threads_use_caches_of_their_own():
+    sanitizer = Sanitizer(
+        keys=SENSITIVE_KEYS, patterns={"secret"}, replacement=hashlib.sha256, text_cache_size=64
+    )
+    items = [
+        {"email": f"user{index % 3}@domain.xyz", "note": "no secret"} for index in range(24)
+    ]
+
+    cleaned = sanitize_threaded(sanitizer, items, workers=2, threshold=10)
+
+    assert cleaned == sanitizer.sanitize(items)
+    assert sanitizer.replacement_cache_info().hits == 21
+    assert sanitizer.text_cache_info().hits == 23
+
+
+def test_copies_have_caches_of_their_own():
+    sanitizer = Sanitizer(keys=SENSITIVE_KEYS, replacement=hashlib.sha256, text_cache_size=64)
+    sanitizer.register(complex, lambda value: "complex")
+
+    duplicate = copy(sanitizer)
+    cleaned = duplicate.sanitize({"email": "user@domain.xyz", "note": "ok", "number": 1j})
+
+    assert cleaned == sanitizer.sanitize(
+        {"email": "user@domain.xyz", "note": "ok", "number": 1j}
+    )
+    assert duplicate.keys is sanitizer.keys
+    assert duplicate.replacement_cache_info().misses == 1
+    assert duplicate.text_cache_info().misses == 1
+    assert sanitizer.replacement_cache_info().misses == 1
+    assert sanitizer.text_cache_info().misses == 1
+
+
+def test_document_is_sanitized_in_current_thread_with_global_lock(monkeypatch):
+    monkeypatch.setattr("sanitary.parallel._gil_enabled", lambda: True)
+    sanitizer = Sanitizer(keys=SENSITIVE_KEYS)
+
+    with patch("sanitary.parallel.ThreadPoolExecutor") as executor:
+        cleaned = sanitize_threaded(sanitizer, EXPORT, threshold=10)
+
+    assert cleaned == sanitizer.sanitize(EXPORT)
+    executor.assert_not_called()
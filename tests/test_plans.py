@@ -0,0 +1,152 @@
+from dataclasses import dataclass, field
+from fractions import Fraction
+from ipaddress import ip_address
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple, TypedDict
+from uuid import UUID
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.plans import field_plan
+
+REPLACEMENT = "********"
+
+
+class Point(NamedTuple):
+    x: int
+    card: str
+
+
+@dataclass(frozen=True)
+class User:
+    name: str
+    card: str
+    tags: list = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SlottedUser:
+    name: str
+    card: str
+
+
+class Slotted:
+    __slots__ = ("__private", "card", "name")
+
+    def __init__(self, name, card=None):
+        self.name = name
+        self.__private = "hidden"
+        if card is not None:
+            self.card = card
+
+
+class MixedSlots(Slotted):
+    pass
+
+
+class AttrsStyle:
+    # the attribute descriptors of attrs classes, which are not a dependency
+    __attrs_attrs__ = (
+        type("Attribute", (), {"name": "name"}),
+        type("Attribute", (), {"name": "card"}),
+    )
+
+    def __init__(self, name, card):
+        self.name = name
+        self.card = card
+
+
+class Account(TypedDict):
+    name: str
+    card: str
+
+
+@pytest.fixture
+def sanitizer():
+    return Sanitizer(keys={"card"})
+
+
+def test_named_tuples_keep_their_type(sanitizer):
+    cleaned = sanitizer.sanitize({"point": Point(1, "1234")})
+
+    assert cleaned == {"point": Point(1, REPLACEMENT)}
+    assert type(cleaned["point"]) is Point
+
+
+@pytest.mark.parametrize("copy_mode", ("on_write", "in_place"))
+def test_unchanged_named_tuples_are_not_copied(copy_mode):
+    point = Point(1, "1234")
+
+    assert Sanitizer(keys={"other"}, copy_mode=copy_mode).sanitize(point) is point
+
+
+@pytest.mark.parametrize("data_type", (User, SlottedUser, AttrsStyle))
+def test_objects_with_declared_fields_are_sanitized_as_dicts(sanitizer, data_type):
+    cleaned = sanitizer.sanitize(data_type("jane", "1234"))
+
+    assert {"name": "jane", "card": REPLACEMENT}.items() <= cleaned.items()
+
+
+def test_dataclass_fields_are_sanitized_recursively(sanitizer):
+    cleaned = sanitizer.sanitize(User("jane", "1234", [{"card": "5678"}]))
+
+    assert cleaned == {"name": "jane", "card": REPLACEMENT, "tags": [{"card": REPLACEMENT}]}
+
+
+def test_slots_are_read_including_private_and_unset_ones(sanitizer):
+    assert sanitizer.sanitize(Slotted("jane", "1234")) == {
+        "_Slotted__private": "hidden",
+        "card": REPLACEMENT,
+        "name": "jane",
+    }
+    assert sanitizer.sanitize(Slotted("jane")) == {
+        "_Slotted__private": "hidden",
+        "name": "jane",
+    }
+
+
+def test_slots_are_combined_with_instance_dict(sanitizer):
+    data = MixedSlots("jane")
+    data.card = "1234"
+    data.extra = "value"
+
+    assert sanitizer.sanitize(data) == {
+        "_Slotted__private": "hidden",
+        "card": REPLACEMENT,
+        "name": "jane",
+        "extra": "value",
+    }
+
+
+@pytest.mark.parametrize(
+    "value",
+    (
+        Path("/tmp/card"),  # noqa: S108
+        PurePosixPath("card"),
+        UUID(int=1234),
+        ip_address("1.2.3.4"),
+        Fraction(1, 3),
+    ),
+)
+def test_value_types_with_slots_are_sanitized_as_text(sanitizer, value):
+    assert sanitizer.sanitize({"value": value}) == {"value": str(value)}
+
+
+def test_typed_dicts_are_plain_dicts(sanitizer):
+    assert sanitizer.sanitize(Account(name="jane", card="1234")) == {
+        "name": "jane",
+        "card": REPLACEMENT,
+    }
+
+
+def test_plans_are_cached_per_class():
+    assert field_plan(User) is field_plan(User)
+    assert field_plan(User).fields == ("name", "card", "tags")
+    assert field_plan(dict) is None
+
+
+def test_custom_handlers_take_precedence_over_plans(sanitizer):
+    sanitizer.register(Point, lambda data: "point")
+
+    assert sanitizer.sanitize(Point(1, "1234")) == "point"
@@ -0,0 +1,106 @@
+import hashlib
+import io
+import re
+from random import Random
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.__main__ import main
+from sanitary.streaming import sanitize_stream
+
+CARD = r"\d{4}-\d{4}-\d{4}-\d{4}"
+EMAIL = r"[\w.]+@example\.com"
+
+
+def _text(size=20000):
+    rng = Random(1)  # noqa: S311
+    words = []
+    while sum(map(len, words)) < size:
+        choice = rng.random()
+        if choice < 0.05:
+            words.append("-".join(f"{rng.randrange(10000):04d}" for _ in range(4)))
+        elif choice < 0.1:
+            words.append(f"user{rng.randrange(100)}@example.com")
+        else:
+            words.append(rng.choice(("request", "started", "finished", "ok", "\n")))
+    return " ".join(words).encode()
+
+
+def _expected(sanitizer, data):
+    return sanitizer._binary_matcher.sub(sanitizer._replace_binary_span, data)
+
+
+@pytest.mark.parametrize("chunk_size", (7, 64, 1000, 1 << 20))
+def test_file_is_redacted_in_chunks(tmp_path, chunk_size):
+    sanitizer = Sanitizer(patterns={CARD: "<card>", EMAIL: None})
+    source = tmp_path / "input.log"
+    source.write_bytes(_text())
+    target = io.BytesIO()
+
+    sanitizer.redact_file(source, target, chunk_size=chunk_size)
+
+    assert target.getvalue() == _expected(sanitizer, source.read_bytes())
+    assert b"<card>" in target.getvalue()
+
+
+@pytest.mark.parametrize("chunk_size", (5, 64))
+def test_streams_are_redacted_in_chunks(chunk_size):
+    sanitizer = Sanitizer(patterns={CARD, EMAIL}, replacement=hashlib.sha256)
+    data = _text(5000)
+    target = io.BytesIO()
+
+    sanitizer.redact_file(io.BytesIO(data), target, chunk_size=chunk_size)
+
+    assert target.getvalue() == _expected(sanitizer, data)
+
+
+def test_lookbehind_sees_the_previous_chunk():
+    sanitizer = Sanitizer(patterns={r"(?<=card )\d{4}"})
+    target = io.BytesIO()
+
+    sanitizer.redact_file(io.BytesIO(b"card 1234 and 5678, card 9012"), target, chunk_size=4)
+
+    assert target.getvalue() == b"card ******** and 5678, card ********"
+
+
+def test_unbounded_matches_are_found_within_the_overlap():
+    sanitizer = Sanitizer(patterns={r"secret\w+"})
+    data = b"x" * 100 + b" secret_value " * 10
+    target = io.BytesIO()
+
+    sanitizer.redact_file(io.BytesIO(data), target, chunk_size=16, max_match_length=32)
+
+    assert target.getvalue() == b"x" * 100 + b" ******** " * 10
+
+
+def test_empty_file_is_redacted(tmp_path):
+    source = tmp_path / "empty.log"
+    source.write_bytes(b"")
+    target = io.BytesIO()
+
+    Sanitizer(patterns={CARD}).redact_file(source, target)
+
+    assert target.getvalue() == b""
+
+
+def test_maximum_length_of_match_is_computed():
+    assert Sanitizer(patterns={CARD, "abc"})._binary_matcher.max_length == 19
+    assert Sanitizer(patterns={EMAIL})._binary_matcher.max_length is None
+
+
+def test_stream_of_text_format_is_not_sanitized():
+    with pytest.raises(ValueError, match="redact_file"):
+        sanitize_stream(Sanitizer(), io.StringIO(), io.StringIO(), "text")
+
+
+def test_command_line_redacts_text_file(tmp_path):
+    source = tmp_path / "input.log"
+    target = tmp_path / "output.log"
+    source.write_text("paid with 1234-5678-9012-3456 by jane@example.com\n")
+
+    exit_code = main([str(source), "-o", str(target), "-f", "text", "-p", CARD, "-r", "[card]"])
+
+    assert exit_code == 0
+    assert target.read_text() == "paid with [card] by jane@example.com\n"
+    assert re.search(CARD, target.read_text()) is None
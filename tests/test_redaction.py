@@ -0,0 +1,62 @@
+import hashlib
+import pickle
+import re
+
+from sanitary import Sanitizer
+from sanitary.matching import PatternMatcher, Redaction
+
+EMAIL = r"[\w.]+@[\w.]+"
+CARD = r"\b\d{4}-\d{4}-\d{4}-\d{4}\b"
+
+
+def test_whole_message_is_replaced_by_default():
+    sanitizer = Sanitizer(patterns={EMAIL})
+
+    assert sanitizer.redaction is Redaction.MESSAGE
+    assert sanitizer.sanitize("user jane@example.com logged in") == sanitizer.message
+
+
+def test_only_matching_spans_are_replaced():
+    sanitizer = Sanitizer(patterns={EMAIL, CARD}, redaction="spans")
+
+    assert (
+        sanitizer.sanitize("user jane@example.com paid with 1234-5678-9012-3456, ok")
+        == "user ******** paid with ********, ok"
+    )
+    assert sanitizer.sanitize({"note": "nothing to see"}) == {"note": "nothing to see"}
+
+
+def test_spans_are_replaced_with_hashes():
+    sanitizer = Sanitizer(patterns={EMAIL}, replacement=hashlib.sha256, redaction="spans")
+
+    digest = hashlib.sha256(b"jane@example.com").hexdigest()
+    assert sanitizer.sanitize("mail jane@example.com now") == f"mail {digest} now"
+
+
+def test_spans_are_replaced_with_per_pattern_replacements():
+    sanitizer = Sanitizer(
+        patterns={EMAIL: "<email>", CARD: hashlib.sha512, r"secret": None},
+        redaction="spans",
+    )
+
+    digest = hashlib.sha512(b"1234-5678-9012-3456").hexdigest()
+    assert (
+        sanitizer.sanitize("jane@example.com 1234-5678-9012-3456 secret")
+        == f"<email> {digest} ********"
+    )
+
+
+def test_per_pattern_replacements_survive_pickling():
+    sanitizer = Sanitizer(patterns={EMAIL: "<email>"}, redaction="spans")
+
+    restored = pickle.loads(pickle.dumps(sanitizer))  # noqa: S301
+
+    assert restored.sanitize("to jane@example.com") == "to <email>"
+
+
+def test_patterns_which_cannot_be_merged_are_replaced_separately():
+    matcher = PatternMatcher([re.compile(r"(?P<word>ab)\1?"), re.compile(r"\d+")])
+
+    assert matcher.sub(lambda pattern, text: f"[{len(text)}]", "ab 12 abab 345") == (
+        "[2] [2] [4] [3]"
+    )
@@ -0,0 +1,63 @@
+import hashlib
+
+from sanitary import Sanitizer
+
+
+def test_hashed_replacements_are_cached():
+    sanitizer = Sanitizer(keys={"email"}, replacement=hashlib.sha256)
+    data = [
+        {"email": "user@domain.xyz"},
+        {"email": "user@domain.xyz"},
+        {"email": "foo@bar.baz"},
+    ]
+
+    cleaned_data = sanitizer.sanitize(data)
+
+    expected = hashlib.sha256(b"user@domain.xyz").hexdigest()
+    assert cleaned_data[0]["email"] == cleaned_data[1]["email"] == expected
+    cache_info = sanitizer.replacement_cache_info()
+    assert cache_info.hits == 1
+    assert cache_info.misses == 2
+    assert cache_info.currsize == 2
+
+
+def test_replacement_cache_is_bounded():
+    sanitizer = Sanitizer(keys={"id"}, replacement=hashlib.sha512, replacement_cache_size=2)
+
+    sanitizer.sanitize([{"id": value} for value in range(10)])
+
+    assert sanitizer.replacement_cache_info().currsize == 2
+
+
+def test_replacement_cache_can_be_disabled():
+    calls = []
+
+    def replacement_callable(value):
+        calls.append(value)
+        return "foo"
+
+    sanitizer = Sanitizer(
+        keys={"email"}, replacement=replacement_callable, replacement_cache_size=0
+    )
+    sanitizer.sanitize([{"email": "user@domain.xyz"}, {"email": "user@domain.xyz"}])
+
+    assert calls == ["user@domain.xyz", "user@domain.xyz"]
+    assert sanitizer.replacement_cache_info() is None
+
+
+def test_text_replacement_is_not_cached():
+    sanitizer = Sanitizer(keys={"email"})
+
+    assert sanitizer.sanitize({"email": "user@domain.xyz"}) == {"email": "********"}
+    assert sanitizer.replacement_cache_info() is None
+
+
+def test_changing_replacement_resets_the_cache():
+    sanitizer = Sanitizer(keys={"email"}, replacement=hashlib.sha256)
+    sanitizer.sanitize({"email": "user@domain.xyz"})
+
+    sanitizer.replacement = hashlib.sha512
+
+    cleaned_data = sanitizer.sanitize({"email": "user@domain.xyz"})
+    assert cleaned_data["email"] == hashlib.sha512(b"user@domain.xyz").hexdigest()
+    assert sanitizer.replacement_cache_info().currsize == 1
@@ -1,4 +1,6 @@
 from decimal import Decimal
+from enum import Enum
+from uuid import UUID
 
 from sanitary import Sanitizer
 
@@ -164,6 +166,26 @@ def test_generic_object_is_cleaned_correctly():
     }
 
 
+class Color(Enum):
+    RED = "red"
+
+
+def test_enum_member_is_cleaned_without_its_class_namespace():
+    sanitizer = Sanitizer(keys={"sensitive"})
+
+    cleaned_data = sanitizer.sanitize({"color": Color.RED, "type": Color})
+
+    assert cleaned_data["color"]["_value_"] == "red"
+    assert cleaned_data["color"]["__objclass__"] == str(Color)
+    assert cleaned_data["type"] == str(Color)
+
+
+def test_uuid_is_cleaned_as_text():
+    value = UUID(int=1234)
+
+    assert Sanitizer(keys={"sensitive"}).sanitize({"id": value}) == {"id": str(value)}
+
+
 class MyCustomClass:
     def __init__(self):
         self.foo = "this is not sensitive"
@@ -0,0 +1,169 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Optional, TypedDict
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.schema import ANY, SCALAR, TEXT, ArrayShape, ObjectShape, parse_schema
+
+REPLACEMENT = "********"
+
+
+class Address(TypedDict):
+    street: str
+    postcode: str
+
+
+class Customer(TypedDict):
+    id: int
+    name: str
+    password: str
+    address: Address
+    notes: list[str]
+
+
+@dataclass
+class Order:
+    id: int
+    customer: Customer
+    comment: Optional[str]  # noqa: UP045
+    total: float
+
+
+@dataclass
+class Node:
+    name: str
+    children: list["Node"]
+
+
+CUSTOMER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "integer"},
+        "name": {"type": "string"},
+        "password": {"type": "string"},
+        "address": {
+            "type": "object",
+            "properties": {"street": {"type": "string"}, "postcode": {"type": "string"}},
+        },
+        "notes": {"type": "array", "items": {"type": "string"}},
+    },
+}
+
+CUSTOMER = {
+    "id": 1,
+    "name": "jane",
+    "password": "secret",
+    "address": {"street": "Main Street 1234", "postcode": "12345"},
+    "notes": ["card 1234", '{"token": "abc"}', "nothing"],
+}
+
+
+@pytest.mark.parametrize(
+    "options",
+    (
+        {"keys": {"password"}},
+        {"keys": {"password", "address.postcode"}, "replacement": hashlib.sha256},
+        {"keys": {"token"}, "patterns": {r"\d{4}"}, "redaction": "spans"},
+        {"keys": {"re:^pass"}, "embedded_json": "off", "patterns": {"card"}},
+        {"keys": {"token"}, "reserialize_json": True},
+        {"keys": {"street"}, "max_depth": 2, "limit_action": "truncate"},
+        {"keys": {"password"}, "max_depth": 1},
+        {"keys": {"password"}, "max_string_length": 5},
+        {"keys": {"password"}, "collect_stats": True},
+        {"keys": {"password"}, "max_nodes": 5},
+    ),
+)
+@pytest.mark.parametrize("schema", (CUSTOMER_SCHEMA, Customer))
+def test_data_is_sanitized_like_by_the_generic_traversal(options, schema):
+    sanitizer = Sanitizer(**options)
+
+    assert sanitizer.compile_schema(schema)(CUSTOMER) == sanitizer.sanitize(CUSTOMER)
+
+
+@pytest.mark.parametrize(
+    "data",
+    (
+        {**CUSTOMER, "extra": {"password": "secret"}},
+        {key: value for key, value in CUSTOMER.items() if key != "notes"},
+        {**CUSTOMER, "id": {"password": "secret"}, "name": ["card 1234"]},
+        {**CUSTOMER, "address": "Main Street 1234"},
+        {**CUSTOMER, "notes": ("card 1234",)},
+        ["card 1234", {"password": "secret"}],
+        "card 1234",
+    ),
+)
+def test_data_not_matching_the_schema_is_sanitized_generically(data):
+    sanitizer = Sanitizer(keys={"password"}, patterns={r"\d{4}"})
+
+    assert sanitizer.compile_schema(CUSTOMER_SCHEMA)(data) == sanitizer.sanitize(data)
+
+
+def test_dataclasses_are_sanitized_into_dicts():
+    sanitizer = Sanitizer(keys={"password", "comment"})
+    order = Order(1, CUSTOMER, "leave at the door", 12.5)
+
+    cleaned = sanitizer.compile_schema(Order)(order)
+
+    assert cleaned == sanitizer.sanitize(order)
+    assert cleaned["customer"]["password"] == REPLACEMENT
+    assert cleaned["comment"] == REPLACEMENT
+
+
+def test_recursive_types_are_sanitized_generically_after_the_first_level():
+    sanitizer = Sanitizer(keys={"secret"})
+    tree = Node("root", [Node("child", [])])
+
+    assert sanitizer.compile_schema(Node)(tree) == sanitizer.sanitize(tree)
+
+
+def test_custom_handlers_are_respected():
+    sanitizer = Sanitizer()
+    sanitizer.register(str, str.upper)
+
+    assert sanitizer.compile_schema(Customer)(CUSTOMER) == sanitizer.sanitize(CUSTOMER)
+
+
+@pytest.mark.parametrize("copy_mode", ("on_write", "in_place"))
+def test_unchanged_containers_are_not_copied(copy_mode):
+    sanitizer = Sanitizer(keys={"email"}, copy_mode=copy_mode)
+    data = {"name": "jane", "tags": ["a", "b"]}
+    schema = {"properties": {"name": {"type": "string"}, "tags": {"items": {"type": "string"}}}}
+
+    cleaned = sanitizer.compile_schema(schema)(data)
+
+    assert cleaned is data
+    assert cleaned["tags"] is data["tags"]
+
+
+def test_containers_are_modified_in_place():
+    sanitizer = Sanitizer(keys={"password"}, copy_mode="in_place")
+    data = {"name": "jane", "password": "secret"}
+    schema = {"properties": {"name": {"type": "string"}, "password": {"type": "string"}}}
+
+    assert sanitizer.compile_schema(schema)(data) is data
+    assert data == {"name": "jane", "password": REPLACEMENT}
+
+
+def test_shape_of_type_hints():
+    shape = parse_schema(Order)
+
+    assert isinstance(shape, ObjectShape)
+    assert shape.record_type is Order
+    assert shape.fields["id"] == SCALAR
+    assert shape.fields["comment"] == TEXT
+    customer = shape.fields["customer"]
+    assert isinstance(customer, ObjectShape)
+    assert customer.record_type is None
+    assert isinstance(customer.fields["notes"], ArrayShape)
+    assert parse_schema(int | str) == ANY
+
+
+def test_shape_of_json_schema():
+    shape = parse_schema(
+        {"type": ["array", "null"], "items": {"type": ["string", "integer"]}},
+    )
+
+    assert isinstance(shape, ArrayShape)
+    assert shape.items == ANY
@@ -0,0 +1,94 @@
+import pickle
+import subprocess
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from sanitary import Sanitizer, StructlogSanitizer
+from sanitary.spec import SanitizerSpec
+
+MESSAGE = "#### WARNING: Message replaced due to sensitive information."
+REPLACEMENT = "********"
+
+
+@pytest.fixture
+def sanitizer():
+    return Sanitizer(
+        keys={"password", "headers.authorization"},
+        patterns={r"\d{4}": "<card>", "secret": None},
+        redaction="spans",
+    )
+
+
+def test_sanitizer_is_created_from_spec_without_recompiling(sanitizer):
+    spec = sanitizer.spec
+
+    created = Sanitizer.from_spec(spec)
+
+    assert created._keys is spec.keys
+    assert created._compiled_patterns is spec.patterns
+    assert created.config == sanitizer.config
+
+
+def test_spec_is_saved_and_loaded(tmp_path, sanitizer):
+    path = tmp_path / "sanitizer.spec"
+    sanitizer.spec.dump(path)
+
+    created = Sanitizer.from_spec(SanitizerSpec.load(path))
+
+    data = {"password": "x", "headers": {"authorization": "y"}, "note": "card 1234 secret"}
+    assert created.sanitize(data) == sanitizer.sanitize(data)
+    assert created.sanitize(b"1234") == b"<card>"
+
+
+def test_loading_other_data_fails(tmp_path):
+    path = tmp_path / "other.spec"
+    path.write_bytes(pickle.dumps({"keys": ()}))
+
+    with pytest.raises(TypeError):
+        SanitizerSpec.load(path)
+
+
+def test_spec_is_immutable(sanitizer):
+    with pytest.raises(AttributeError):
+        sanitizer.spec.keys = None
+
+
+def test_pickled_sanitizer_keeps_compiled_configuration(sanitizer):
+    copy = pickle.loads(pickle.dumps(sanitizer))  # noqa: S301
+
+    assert type(copy) is Sanitizer
+    assert copy.config == sanitizer.config
+    assert copy.sanitize({"note": "1234"}) == {"note": "<card>"}
+
+
+def test_subclasses_are_created_from_spec():
+    sanitizer = StructlogSanitizer(keys={"password"}, context_cache_size=8)
+
+    created = StructlogSanitizer.from_spec(sanitizer.spec)
+
+    assert created.context_cache_size == 8
+    assert created(None, "info", {"password": "x"}) == {"password": REPLACEMENT}
+
+
+def test_decimals_are_handled_without_importing_the_module_eagerly():
+    assert Sanitizer().sanitize({"amount": Decimal("1.5")}) == {"amount": 1.5}
+
+
+def test_optional_modules_are_not_imported():
+    code = (
+        "import sys, sanitary; sanitary.Sanitizer(keys={'a'}).sanitize({'a': 1}); "
+        "print(sorted({'json', 'hashlib', 'decimal', 'dataclasses', 'mmap'} & set(sys.modules)))"
+    )
+
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+    )
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import pickle
+
+from sanitary import Sanitizer
+from sanitary.matching import PatternMatcher
+from sanitary.stats import SanitizerStats
+
+
+def test_stats_are_not_collected_by_default():
+    sanitizer = Sanitizer(keys={"password"})
+
+    sanitizer.sanitize({"password": "a"})
+
+    assert sanitizer.stats is None
+    assert type(sanitizer._matcher) is PatternMatcher
+
+
+def test_visited_values_are_counted_by_type():
+    sanitizer = Sanitizer(keys={"password"}, collect_stats=True)
+
+    sanitizer.sanitize({"a": [1, 2.5, "x"], "b": None, "password": "secret"})
+    sanitizer.sanitize("text")
+
+    stats = sanitizer.stats
+    assert stats.calls == 2
+    assert stats.nodes == {"dict": 1, "list": 1, "int": 1, "float": 1, "str": 2, "NoneType": 1}
+
+
+def test_redacted_keys_are_counted_by_rule():
+    sanitizer = Sanitizer(keys={"*_token", "password"}, collect_stats=True)
+
+    sanitizer.sanitize({"access_token": "a", "refresh_token": "b", "Password": "c", "d": "e"})
+
+    assert sanitizer.stats.keys == {"*_token": 2, "password": 1}
+
+
+def test_pattern_hits_are_counted_by_pattern():
+    sanitizer = Sanitizer(patterns={r"\d{4}", "secret"}, collect_stats=True)
+
+    sanitizer.sanitize(["1234", "top secret", "nothing"])
+    spans = Sanitizer(patterns={r"\d{4}"}, redaction="spans", collect_stats=True)
+    spans.sanitize("1234 5678 90")
+
+    assert sanitizer.stats.patterns == {r"\d{4}": 1, "secret": 1}
+    assert spans.stats.patterns == {r"\d{4}": 2}
+    assert 0 < sanitizer.stats.scan_time <= sanitizer.stats.total_time
+
+
+def test_embedded_json_decoding_is_counted():
+    sanitizer = Sanitizer(collect_stats=True)
+
+    sanitizer.sanitize({"a": json.dumps({"b": 1}), "c": "{not json}", "d": "text"})
+
+    assert sanitizer.stats.json_decodes == 2
+    assert sanitizer.stats.json_failures == 1
+
+
+def test_replacement_cache_hits_are_counted():
+    sanitizer = Sanitizer(keys={"email"}, replacement=hashlib.sha256, collect_stats=True)
+
+    for _ in range(3):
+        sanitizer.sanitize({"email": "jane@example.com"})
+
+    assert sanitizer.stats.cache_hits == 2
+
+
+def test_callback_receives_stats_of_each_call():
+    received = []
+    sanitizer = Sanitizer(keys={"password"}, stats_callback=received.append)
+
+    sanitizer.sanitize({"password": "a"})
+    sanitizer.sanitize([1, 2])
+
+    assert [stats.calls for stats in received] == [1, 1]
+    assert received[0].keys == {"password": 1}
+    assert received[1].nodes == {"list": 1, "int": 2}
+    assert sanitizer.stats.calls == 2
+
+
+def test_stats_can_be_reset_and_exported():
+    sanitizer = Sanitizer(collect_stats=True)
+    sanitizer.sanitize([1])
+
+    sanitizer.reset_stats()
+    sanitizer.sanitize("x")
+
+    exported = sanitizer.stats.as_dict()
+    assert exported["calls"] == 1
+    assert exported["nodes"] == {"str": 1}
+    assert exported["traversal_time"] == exported["total_time"] - exported["scan_time"]
+
+
+def test_stats_configuration_survives_pickling():
+    sanitizer = Sanitizer(collect_stats=True)
+
+    restored = pickle.loads(pickle.dumps(sanitizer))  # noqa: S301
+
+    assert isinstance(restored.stats, SanitizerStats)
@@ -0,0 +1,164 @@
+import io
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.stdlib import SanitizingFilter, SanitizingFormatter, sanitize_record
+
+MESSAGE = "#### WARNING: Message replaced due to sensitive information."
+REPLACEMENT = "********"
+
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("sanitary.tests")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+
+
+def _stream_handler(level=logging.DEBUG, fmt="%(message)s"):
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter(fmt))
+    return handler, stream
+
+
+def test_message_is_sanitized_with_its_arguments(logger):
+    handler, stream = _stream_handler()
+    handler.addFilter(SanitizingFilter(patterns={r"\d{4}"}, redaction="spans"))
+    logger.addHandler(handler)
+
+    logger.info("card %s of %s", "1234", "jane")
+
+    assert stream.getvalue() == f"card {REPLACEMENT} of jane\n"
+
+
+def test_mapping_arguments_are_sanitized_by_keys(logger):
+    handler, stream = _stream_handler()
+    handler.addFilter(SanitizingFilter(keys={"password"}))
+    logger.addHandler(handler)
+
+    logger.info("login %(user)s with %(password)s", {"user": "jane", "password": "secret"})
+
+    assert stream.getvalue() == f"login jane with {REPLACEMENT}\n"
+
+
+def test_extra_attributes_are_sanitized(logger):
+    handler, stream = _stream_handler(fmt="%(message)s %(password)s %(user)s")
+    handler.addFilter(SanitizingFilter(keys={"password"}))
+    logger.addHandler(handler)
+
+    logger.info("login", extra={"password": "secret", "user": "jane"})
+
+    assert stream.getvalue() == f"login {REPLACEMENT} jane\n"
+
+
+def test_standard_attributes_are_not_sanitized():
+    record = logging.makeLogRecord({"msg": "login", "levelname": "password"})
+
+    sanitize_record(Sanitizer(keys={"levelname"}, patterns={"password"}), record)
+
+    assert record.levelname == "password"
+
+
+def test_records_below_handler_level_are_not_sanitized(logger):
+    sanitizer = SanitizingFilter(patterns={"secret"})
+    handler, stream = _stream_handler(level=logging.WARNING)
+    handler.addFilter(sanitizer)
+    logger.addHandler(handler)
+
+    with patch.object(sanitizer, "sanitize", wraps=sanitizer.sanitize) as sanitize:
+        logger.info("secret")
+        logger.warning("secret")
+
+    assert sanitize.call_count == 1
+    assert stream.getvalue() == f"{MESSAGE}\n"
+
+
+def test_records_are_sanitized_once_for_several_handlers(logger):
+    sanitizer = SanitizingFilter(
+        patterns={"secret"}, replacement=lambda value: value + "!", redaction="spans"
+    )
+    streams = []
+    for _ in range(2):
+        handler, stream = _stream_handler()
+        handler.addFilter(sanitizer)
+        logger.addHandler(handler)
+        streams.append(stream)
+
+    logger.info("secret")
+
+    assert [stream.getvalue() for stream in streams] == ["secret!\n"] * 2
+
+
+def test_formatter_sanitizes_only_formatted_records(logger):
+    sanitizer = Sanitizer(patterns={r"\d{4}"}, redaction="spans")
+    handler, stream = _stream_handler(level=logging.ERROR)
+    handler.setFormatter(SanitizingFormatter("%(levelname)s %(message)s", sanitizer=sanitizer))
+    logger.addHandler(handler)
+
+    with patch.object(sanitizer, "sanitize", wraps=sanitizer.sanitize) as sanitize:
+        logger.info("card %s", "1234")
+        logger.error("card %s", "5678")
+
+    assert sanitize.call_count == 1
+    assert stream.getvalue() == f"ERROR card {REPLACEMENT}\n"
+
+
+def test_sanitized_arguments_not_matching_the_format_are_appended():
+    record = logging.makeLogRecord({"msg": "count %d", "args": {"password": 1}})
+
+    sanitize_record(Sanitizer(keys={"password"}), record)
+
+    assert record.getMessage() == f"count %d {{'password': '{REPLACEMENT}'}}"
+
+
+def test_message_containers_are_sanitized_by_keys(logger):
+    handler, stream = _stream_handler()
+    handler.addFilter(SanitizingFilter(keys={"password"}))
+    logger.addHandler(handler)
+
+    logger.info({"user": "bob", "password": "hunter2"})
+    logger.info(ValueError("not a container"))
+
+    assert stream.getvalue() == (
+        f"{{'user': 'bob', 'password': '{REPLACEMENT}'}}\nnot a container\n"
+    )
+
+
+def test_extra_attributes_omitted_due_to_limits_are_removed():
+    record = logging.makeLogRecord(
+        {"msg": "login", "user": "jane", "password": "secret", "token": "abc"}
+    )
+
+    sanitize_record(Sanitizer(max_nodes=2, limit_action="truncate"), record)
+
+    assert record.user == "jane"
+    assert not hasattr(record, "password")
+    assert not hasattr(record, "token")
+
+
+def test_extra_attributes_over_max_depth_are_replaced_with_marker():
+    sanitizer = Sanitizer(max_depth=0, limit_marker="[omitted]")
+    record = logging.makeLogRecord({"msg": "login", "password": "secret"})
+
+    sanitize_record(sanitizer, record)
+
+    assert record.password == "[omitted]"
+
+
+def test_sanitized_records_are_not_marked_by_attributes():
+    sanitizer = SanitizingFilter(keys={"password"})
+    record = logging.makeLogRecord({"msg": "login", "password": "secret"})
+    attributes = set(vars(record))
+
+    assert sanitizer.filter(record)
+    assert sanitizer.filter(record)
+
+    assert set(vars(record)) == attributes
+    assert record.password == REPLACEMENT
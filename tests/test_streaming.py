@@ -0,0 +1,142 @@
+import io
+import json
+
+import pytest
+
+from sanitary import Sanitizer
+from sanitary.__main__ import main
+from sanitary.streaming import CHUNK_SIZE, iter_json_array, sanitize_ndjson, sanitize_stream
+
+SENSITIVE_KEYS = {"email", "password"}
+SENSITIVE_PATTERNS = {"Bearer "}
+
+
+def _sanitizer():
+    return Sanitizer(keys=SENSITIVE_KEYS, patterns=SENSITIVE_PATTERNS)
+
+
+def test_ndjson_lines_are_sanitized():
+    lines = [
+        '{"email": "user@domain.xyz", "event": "login"}\n',
+        "\n",
+        "some text with Bearer token\n",
+        "[1, 2]\r\n",
+    ]
+
+    sanitized = list(sanitize_ndjson(_sanitizer(), lines))
+
+    assert sanitized == [
+        '{"email": "********", "event": "login"}',
+        "#### WARNING: Message replaced due to sensitive information.",
+        "[1, 2]",
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 7, 1024))
+def test_json_array_is_decoded_incrementally(chunk_size):
+    items = [{"a": 12345, "b": [1.5, "x, ]"]}, 678, "text", None, [], {"c": {}}]
+    stream = io.StringIO(" \n" + json.dumps(items, indent=2) + "\n")
+
+    assert list(iter_json_array(stream, chunk_size=chunk_size)) == items
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 4, 5))
+@pytest.mark.parametrize("document", ("[-1.5e+10, 2]", "[1E-3,12]", "[-0.25]"))
+def test_numbers_split_across_chunks_are_decoded(chunk_size, document):
+    stream = io.StringIO(document)
+
+    assert list(iter_json_array(stream, chunk_size=chunk_size)) == json.loads(document)
+
+
+def test_number_cut_off_at_the_default_chunk_size_is_decoded():
+    # the decimal point of the last number is the last character of the first chunk
+    padding = "0," * ((CHUNK_SIZE - 4) // 2)
+    document = f"[{padding}-1.5]"
+    assert document.index(".", len(padding)) == CHUNK_SIZE - 1
+
+    assert list(iter_json_array(io.StringIO(document)))[-1] == -1.5
+
+
+def test_empty_json_array_is_decoded():
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+
+@pytest.mark.parametrize("document", ('{"a": 1}', "[1 2]", "[1,", "[1,]"))
+def test_invalid_json_array_raises_error(document):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(document), chunk_size=2))
+
+
+def test_json_array_stream_is_sanitized():
+    source = io.StringIO(json.dumps([{"password": "secret"}, {"event": "Bearer abc"}, 3]))
+    target = io.StringIO()
+
+    sanitize_stream(_sanitizer(), source, target, "json")
+
+    assert json.loads(target.getvalue()) == [
+        {"password": "********"},
+        {"event": "#### WARNING: Message replaced due to sensitive information."},
+        3,
+    ]
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"), (('{"password": "x"}', {"password": "********"}), ("[]", []))
+)
+def test_single_json_document_is_sanitized(document, expected):
+    target = io.StringIO()
+
+    sanitize_stream(_sanitizer(), io.StringIO(document), target, "json")
+
+    assert json.loads(target.getvalue()) == expected
+
+
+def test_command_line_sanitizes_file(tmp_path, monkeypatch):
+    source = tmp_path / "input.ndjson"
+    target = tmp_path / "output.ndjson"
+    source.write_text('{"email": "user@domain.xyz", "note": "Bearer abc"}\n{"foo": 1}\n')
+    monkeypatch.setenv("HASH_KEY", "secret")
+
+    exit_code = main(
+        [
+            str(source),
+            "--output",
+            str(target),
+            "-k",
+            "email",
+            "-p",
+            "Bearer ",
+            "--message",
+            "[redacted]",
+            "--hash",
+            "sha256",
+            "--hash-key-env",
+            "HASH_KEY",
+        ]
+    )
+
+    assert exit_code == 0
+    first, second = map(json.loads, target.read_text().splitlines())
+    assert len(first["email"]) == 64
+    assert first["note"] == "[redacted]"
+    assert second == {"foo": 1}
+
+
+def test_command_line_requires_hash_for_hash_key(capsys):
+    with pytest.raises(SystemExit):
+        main(["--hash-key-env", "HASH_KEY"])
+
+    assert "--hash-key-env requires --hash" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("algorithm", ("shake_128", "shake_256"))
+def test_command_line_rejects_keyed_variable_length_hash(algorithm, monkeypatch, capsys):
+    monkeypatch.setenv("HASH_KEY", "secret")
+
+    with pytest.raises(SystemExit) as exit_info:
+        main(["--hash", algorithm, "--hash-key-env", "HASH_KEY"])
+
+    assert exit_info.value.code == 2
+    assert (
+        f"--hash-key-env doesn't support the algorithm {algorithm}" in capsys.readouterr().err
+    )
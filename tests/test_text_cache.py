@@ -0,0 +1,104 @@
+import json
+import pickle
+from unittest.mock import Mock, patch
+
+import pytest
+
+from sanitary import Sanitizer
+
+MESSAGE = "#### WARNING: Message replaced due to sensitive information."
+
+
+def test_repeated_texts_are_scanned_once():
+    sanitizer = Sanitizer(patterns={r"\d{4}"}, text_cache_size=16)
+    data = [{"event": "request started", "note": "card 1234"}] * 10
+
+    with patch.object(sanitizer, "_matcher", wraps=sanitizer._matcher) as matcher:
+        cleaned = sanitizer.sanitize(data)
+
+    assert cleaned == [{"event": "request started", "note": MESSAGE}] * 10
+    assert matcher.search.call_count == 2
+    assert sanitizer.text_cache_info().hits == 18
+
+
+def test_long_texts_are_not_cached():
+    sanitizer = Sanitizer(patterns={r"\d{4}"}, text_cache_size=16, text_cache_max_length=5)
+
+    assert sanitizer.sanitize(["card 1234", "1234", "card 1234"]) == [MESSAGE] * 3
+    assert sanitizer.text_cache_info().currsize == 1
+
+
+def test_least_recently_used_texts_are_discarded():
+    sanitizer = Sanitizer(text_cache_size=2)
+
+    sanitizer.sanitize(["a", "b", "c", "a"])
+
+    cache_info = sanitizer.text_cache_info()
+    assert (cache_info.hits, cache_info.misses, cache_info.currsize) == (0, 4, 2)
+
+
+def test_configuration_change_discards_the_cache():
+    sanitizer = Sanitizer(patterns={"secret"}, text_cache_size=16)
+    assert sanitizer.sanitize("secret") == MESSAGE
+
+    sanitizer.message = "[removed]"
+    assert sanitizer.sanitize("secret") == "[removed]"
+
+    sanitizer.patterns = {"other"}
+    assert sanitizer.sanitize("secret") == "secret"
+
+
+def test_changes_of_other_attributes_keep_the_cache():
+    sanitizer = Sanitizer(patterns={"secret"}, text_cache_size=16)
+    sanitizer.sanitize("secret")
+
+    sanitizer.stats_callback = None
+    sanitizer.counter = 1
+
+    assert sanitizer.text_cache_info().currsize == 1
+
+
+def test_embedded_json_is_sanitized_by_its_position():
+    sanitizer = Sanitizer(keys={"user.password"}, text_cache_size=16)
+    text = '{"password": "secret"}'
+
+    assert sanitizer.sanitize({"user": text}) == {"user": {"password": "********"}}
+    assert sanitizer.sanitize({"admin": text}) == {"admin": {"password": "secret"}}
+
+
+@pytest.mark.parametrize(
+    ("embedded_json", "text"), (("auto", '{"a": 1}'), ("always", '{"a": 1}'), ("always", "1"))
+)
+def test_embedded_json_is_decoded_once_for_each_value(embedded_json, text):
+    decoder = Mock(wraps=json.loads)
+    sanitizer = Sanitizer(embedded_json=embedded_json, json_decoder=decoder, text_cache_size=16)
+
+    assert sanitizer.sanitize(text) == json.loads(text)
+    assert decoder.call_count == 1
+    assert sanitizer.sanitize(text) == json.loads(text)
+    assert decoder.call_count == 2
+
+
+def test_cache_hits_are_counted_in_stats():
+    sanitizer = Sanitizer(text_cache_size=16, collect_stats=True)
+
+    sanitizer.sanitize(["info"] * 3)
+
+    assert sanitizer.stats.cache_hits == 2
+
+
+def test_cache_is_disabled_by_default():
+    sanitizer = Sanitizer()
+
+    assert sanitizer.sanitize("text") == "text"
+    assert sanitizer.text_cache_info() is None
+
+
+def test_sanitizer_with_cache_is_picklable():
+    sanitizer = Sanitizer(patterns={"secret"}, text_cache_size=16, text_cache_max_length=8)
+
+    restored = pickle.loads(pickle.dumps(sanitizer))  # noqa: S301
+
+    assert restored.text_cache_size == 16
+    assert restored.text_cache_max_length == 8
+    assert restored.sanitize(["secret", "secret"]) == [MESSAGE, MESSAGE]